@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import unittest
+
+from uxdrift.a11y import compact_aria_snapshot
+
+
+_SNAPSHOT = """- banner:
+  - heading "Shop" [level=1]
+  - link "Home":
+    - /url: /
+- generic:
+  - main:
+    - textbox "Search"
+    - button "Go" [disabled]
+    - list:
+      - listitem: One
+      - listitem: Two
+      - listitem: Three
+      - listitem: Four
+"""
+
+
+class TestA11y(unittest.TestCase):
+    def test_compact_drops_properties_and_generic_containers(self) -> None:
+        out = compact_aria_snapshot(_SNAPSHOT)
+        self.assertNotIn("/url", out)
+        self.assertNotIn("generic", out)
+        self.assertIn('heading "Shop" [level=1]', out)
+        self.assertIn('button "Go" [disabled]', out)
+        # `main` sits under a collapsed container, so it is promoted to the top level.
+        self.assertIn("\nmain\n", out)
+        self.assertLess(len(out), len(_SNAPSHOT))
+
+    def test_compact_depth_and_sibling_limits(self) -> None:
+        out = compact_aria_snapshot(_SNAPSHOT, max_depth=1)
+        self.assertNotIn("listitem", out)
+
+        out = compact_aria_snapshot(_SNAPSHOT, max_siblings=3)
+        self.assertIn("listitem Three", out)
+        self.assertNotIn("listitem Four", out)
+        self.assertIn("  … +1 more", out)
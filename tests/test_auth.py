@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import tempfile
+import time
+import unittest
+
+from uxdrift.auth import default_storage_state_path, storage_state_fresh
+
+
+class TestAuth(unittest.TestCase):
+    def test_default_path_is_per_base_url(self) -> None:
+        state_dir = Path("/tmp/.uxdrift")
+        a = default_storage_state_path(state_dir, "http://localhost:3000/")
+        b = default_storage_state_path(state_dir, "http://localhost:3000")
+        c = default_storage_state_path(state_dir, "http://localhost:4000")
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertEqual(a.parent, state_dir / "auth")
+
+    def test_storage_state_ttl(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "state.json"
+            self.assertFalse(storage_state_fresh(path, 3_600))
+
+            path.write_text("{}", encoding="utf-8")
+            self.assertTrue(storage_state_fresh(path, 3_600))
+
+            old = time.time() - 7_200
+            os.utime(path, (old, old))
+            self.assertFalse(storage_state_fresh(path, 3_600))
+            self.assertTrue(storage_state_fresh(path, 0))
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import contextlib
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+from uxdrift.auth import AuthConfig
+from uxdrift.playwright_runner import _capture_page, capture_pages
+from uxdrift.report import summarize_deterministic_findings
+from uxdrift.steps import Step
+
+
+class _FakePage:
+    def __init__(self, *, fail_goto: bool) -> None:
+        self.fail_goto = fail_goto
+        self.handlers: dict[str, object] = {}
+        self.closed = False
+
+    def set_default_timeout(self, ms: int) -> None:
+        pass
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    def goto(self, url: str, **kwargs) -> None:
+        self.handlers["pageerror"]("boom before timeout")
+        if self.fail_goto:
+            raise TimeoutError(f"Timeout exceeded navigating to {url}")
+
+    def add_style_tag(self, **kwargs) -> None:
+        pass
+
+    def screenshot(self, *, path: str, full_page: bool) -> None:
+        Path(path).write_bytes(b"png")
+
+    def title(self) -> str:
+        return "Fake"
+
+    def inner_text(self, selector: str) -> str:
+        return "Hello"
+
+    def evaluate(self, script: str):
+        return None
+
+    def locator(self, selector: str):
+        # Every page shows the logged-out marker (see `logged_out_selector`).
+        return mock.Mock(first=mock.Mock(is_visible=mock.Mock(return_value=True)))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self, page: _FakePage) -> None:
+        self.page = page
+
+    def new_page(self) -> _FakePage:
+        return self.page
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeBrowser:
+    def new_context(self, **kwargs) -> _FakeContext:
+        return _FakeContext(_FakePage(fail_goto=False))
+
+    def close(self) -> None:
+        pass
+
+
+def _capture(page: _FakePage, out_dir: Path):
+    return _capture_page(
+        _FakeContext(page),
+        idx=0,
+        path="/",
+        base_url="http://example.com",
+        out_dir=out_dir,
+        nav_timeout_ms=1_000,
+        wait_until="load",
+        steps=None,
+        aria_snapshot=False,
+        aria_max_depth=8,
+    )
+
+
+class TestCapturePage(unittest.TestCase):
+    def test_failure_is_recorded_not_raised(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            page = _FakePage(fail_goto=True)
+            ev = _capture(page, Path(td))
+
+            self.assertIsNotNone(ev.capture_error)
+            assert ev.capture_error is not None
+            self.assertEqual(ev.capture_error["type"], "TimeoutError")
+            self.assertEqual(ev.page_errors, ["boom before timeout"])
+            self.assertTrue(Path(ev.artifacts["error_screenshot"]).exists())
+            self.assertTrue(page.closed)
+
+            findings = summarize_deterministic_findings([ev])
+            self.assertEqual(findings[0]["severity"], "blocker")
+            self.assertIn("capture failed", findings[0]["summary"])
+
+    def test_success_has_no_capture_error(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            ev = _capture(_FakePage(fail_goto=False), Path(td))
+            self.assertIsNone(ev.capture_error)
+            self.assertEqual(ev.extracted["title"], "Fake")
+            self.assertIn("navigation", ev.timing_ms)
+
+
+class TestCaptureFlow(unittest.TestCase):
+    def test_failed_reauth_is_a_page_error(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            state = Path(td) / "state.json"
+            state.write_text("{}", encoding="utf-8")
+            auth = AuthConfig(
+                storage_state=state,
+                login_steps=[Step(action="goto", raw={"goto": "/login"})],
+                logged_out_selector="form#login",
+            )
+            login = mock.Mock(side_effect=RuntimeError("Login flow failed: bad password"))
+            with (
+                mock.patch("uxdrift.playwright_runner.sync_playwright", return_value=contextlib.nullcontext()),
+                mock.patch("uxdrift.playwright_runner._launch", return_value=(_FakeBrowser(), None)),
+                mock.patch("uxdrift.playwright_runner._login", login),
+            ):
+                evidence, meta = capture_pages(
+                    base_url="http://example.com",
+                    pages=["/", "/account"],
+                    out_dir=Path(td) / "run",
+                    headful=False,
+                    browser="chromium",
+                    browser_channel=None,
+                    nav_timeout_ms=1_000,
+                    wait_until="load",
+                    auth=auth,
+                )
+
+            # One re-login attempt for the flow; the failure is kept and the second page is still captured.
+            self.assertEqual(login.call_count, 1)
+            self.assertEqual(len(evidence), 2)
+            first, second = evidence
+            assert first.capture_error is not None and second.capture_error is not None
+            self.assertEqual(first.capture_error["message"], "Login flow failed: bad password")
+            self.assertEqual(
+                [a["type"] for a in first.artifacts["capture_attempts"]], ["SessionExpiredError", "RuntimeError"]
+            )
+            self.assertEqual(second.capture_error["type"], "SessionExpiredError")
+            self.assertEqual(meta["failed_pages"], ["root", "/account"])
+            self.assertEqual(summarize_deterministic_findings([first])[0]["severity"], "blocker")
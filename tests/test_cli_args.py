@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import unittest
+
+from uxdrift.cli import _parse_args
+
+
+class TestCliArgs(unittest.TestCase):
+    def test_run_and_wg_check_parse(self) -> None:
+        run = _parse_args(["run", "--url", "http://localhost:3000", "--phash", "--llm-http2"])
+        self.assertTrue(run.phash)
+        self.assertTrue(run.llm_http2)
+
+        check = _parse_args(["wg", "check", "--phash", "--llm-max-connections", "2"])
+        self.assertTrue(check.phash)
+        self.assertEqual(check.llm_max_connections, 2)
+        # Unset so the task spec's aria_max_depth can apply.
+        self.assertIsNone(check.aria_max_depth)
+        self.assertEqual(_parse_args(["wg", "check", "--aria-max-depth", "4"]).aria_max_depth, 4)
+
+    def test_batch_run_and_collect_parse(self) -> None:
+        run = _parse_args(["run", "--url", "http://x", "--llm-batch", "--pov", "a", "--pov", "b"])
+        self.assertTrue(run.llm_batch)
+        self.assertEqual(run.pov, ["a", "b"])
+
+        collect = _parse_args(["collect", "runs/123", "--wait", "60"])
+        self.assertEqual((collect.run_dir, collect.wait), ("runs/123", 60.0))
+
+        stats = _parse_args(["stats", "--by", "tier", "--since", "2026-10", "--budget-usd", "5"])
+        self.assertEqual((stats.by, stats.since, stats.budget_usd), ("tier", "2026-10", 5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from uxdrift.cli import _new_run_id
+from uxdrift.errors_index import ErrorIndex, index_errors, normalize_error, page_error_fingerprints
+from uxdrift.playwright_runner import PageEvidence
+from uxdrift.report import summarize_deterministic_findings
+
+
+def _page(*, console: list[str], page_errors: list[str] | None = None, http: list[tuple[int, str]] | None = None):
+    return PageEvidence(
+        name="/",
+        url="http://x/",
+        artifacts={},
+        timing_ms={},
+        console={"messages": [{"type": "error", "text": t} for t in console], "counts": {"error": len(console)}},
+        network={
+            "http_errors": [{"url": u, "status": s} for s, u in http or []],
+            "request_failures": [],
+            "counts": {"http_errors": len(http or []), "request_failures": 0},
+        },
+        page_errors=page_errors or [],
+        extracted={},
+    )
+
+
+class TestErrorIndex(unittest.TestCase):
+    def test_fingerprints_ignore_volatile_parts(self) -> None:
+        self.assertEqual(
+            normalize_error("GET http://x/api/users/42?ts=1700 failed at main.3f2a9c1b.js:12:7"),
+            normalize_error("GET http://x/api/users/7?ts=1800 failed at main.0badc0de.js:98:1"),
+        )
+        stack_a = "TypeError: x is undefined\n    at render (http://x/app.js?v=1:10:5)\n    at a (x.js:1:1)\n    at b\n    at c"
+        stack_b = "TypeError: x is undefined\n    at render (http://x/app.js?v=2:11:9)\n    at a (x.js:2:2)\n    at b\n    at z"
+        fa = page_error_fingerprints(_page(console=["boom 1"], page_errors=[stack_a], http=[(500, "http://x/a?q=1")]))
+        fb = page_error_fingerprints(_page(console=["boom 2"], page_errors=[stack_b], http=[(500, "http://x/a?q=2")]))
+        self.assertEqual([f["fp"] for f in fa], [f["fp"] for f in fb])
+        self.assertEqual([f["kind"] for f in fa], ["console", "page_error", "http"])
+
+    def test_selectors_are_not_stripped(self) -> None:
+        checkout = page_error_fingerprints(_page(console=["Cannot find '#checkout'"]))
+        signup = page_error_fingerprints(_page(console=["Cannot find '#signup'"]))
+        self.assertNotEqual(checkout[0]["fp"], signup[0]["fp"])
+        self.assertEqual(normalize_error("Is this it? yes"), "Is this it? yes")
+
+    def test_only_new_fingerprints_keep_severity(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            index = Path(td) / "error-index.jsonl"
+            first = _page(console=["Failed to load widget 12"], http=[(404, "http://x/favicon.ico")])
+            summary = index_errors([first], index_path=index, run_id="r1", scope="http://x")
+            self.assertEqual((summary["new"], summary["recurring"]), (2, 0))
+            self.assertEqual([f["severity"] for f in summarize_deterministic_findings([first])], ["high", "medium"])
+
+            known = _page(console=["Failed to load widget 13"], http=[(404, "http://x/favicon.ico")])
+            summary = index_errors([known], index_path=index, run_id="r2", scope="http://x")
+            self.assertEqual((summary["new"], summary["recurring"], summary["gone"]), (0, 2, []))
+            findings = summarize_deterministic_findings([known])
+            self.assertEqual([f["severity"] for f in findings], ["low", "low"])
+            self.assertIn("all seen in earlier runs", findings[0]["summary"])
+
+            fresh = _page(console=["Failed to load widget 14", "Checkout crashed"])
+            summary = index_errors([fresh], index_path=index, run_id="r3", scope="http://x")
+            self.assertEqual((summary["new"], summary["recurring"]), (1, 1))
+            self.assertEqual([g["kind"] for g in summary["gone"]], ["http"])
+            findings = summarize_deterministic_findings([fresh])
+            self.assertEqual(findings[0]["severity"], "high")
+            self.assertEqual(findings[0]["details"]["known_fingerprints"], 1)
+
+
+    def test_clean_runs_are_recorded(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            index = Path(td) / "error-index.jsonl"
+            index_errors([_page(console=["Checkout crashed"])], index_path=index, run_id="r1", scope="http://x")
+            summary = index_errors([_page(console=[])], index_path=index, run_id="r2", scope="http://x")
+            self.assertEqual([g["text"] for g in summary["gone"]], ["Checkout crashed"])
+
+            summary = index_errors([_page(console=[])], index_path=index, run_id="r3", scope="http://x")
+            self.assertEqual((summary["previous_run"], summary["gone"]), ("r2", []))
+            self.assertEqual(ErrorIndex.load(index).runs("http://x"), ["r1", "r2", "r3"])
+
+
+    def test_each_invocation_is_its_own_run(self) -> None:
+        # `--out` may be reused, so the run id must not come from the out dir.
+        with tempfile.TemporaryDirectory() as td:
+            index = Path(td) / "error-index.jsonl"
+            for _ in range(2):
+                page = _page(console=["Checkout crashed"])
+                summary = index_errors([page], index_path=index, run_id=_new_run_id(), scope="http://x")
+            self.assertEqual((summary["new"], summary["recurring"]), (0, 1))
+            self.assertEqual(page.artifacts["error_fingerprints"][0]["runs"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
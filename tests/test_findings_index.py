@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+from uxdrift.cli import _create_followup_issues, _track_llm_findings
+from uxdrift.findings_index import FindingsIndex, finding_features, minhash, similarity, track_findings
+
+
+def _finding(summary: str, *, tags: list[str] | None = None, evidence: list[str] | None = None) -> dict:
+    return {
+        "severity": "high",
+        "category": "visual",
+        "summary": summary,
+        "principle_tags": tags or ["visibility"],
+        "evidence": evidence or ["button.checkout-submit"],
+    }
+
+
+class TestFindingsIndex(unittest.TestCase):
+    def test_rephrased_findings_cluster_across_runs(self) -> None:
+        a = _finding("The checkout button has low contrast against the page background")
+        b = _finding("Low contrast: checkout button against its background on the page")
+        c = _finding("Signup form errors are not announced", tags=["feedback"], evidence=["form#signup"])
+        sig_a, sig_b, sig_c = (minhash(finding_features(f)) for f in (a, b, c))
+        self.assertGreaterEqual(similarity(sig_a, sig_b), 0.5)
+        self.assertLess(similarity(sig_a, sig_c), 0.5)
+
+        with tempfile.TemporaryDirectory() as td:
+            index = Path(td) / "findings-index.jsonl"
+            first = track_findings([a, c], index_path=index, run_id="r1", scope="http://x")
+            self.assertEqual((first["new"], first["recurring"], first["resolved"]), (2, 0, []))
+
+            second = track_findings([b], index_path=index, run_id="r2", scope="http://x")
+            self.assertEqual((second["new"], second["recurring"]), (0, 1))
+            self.assertEqual(b["history"]["cluster"], a["history"]["cluster"])
+            self.assertEqual(b["history"]["runs"], 2)
+            self.assertEqual([r["summary"] for r in second["resolved"]], [c["summary"]])
+
+            # Another scope has its own run sequence, so nothing is "resolved" there.
+            other = track_findings([dict(c)], index_path=index, run_id="r3", scope="http://y")
+            self.assertEqual((other["recurring"], other["resolved"]), (1, []))
+
+    def test_clean_runs_resolve_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            index = Path(td) / "findings-index.jsonl"
+            track_findings([_finding("Signup form errors are not announced")], index_path=index, run_id="A", scope="s")
+            b = track_findings([], index_path=index, run_id="B", scope="s")
+            self.assertEqual(len(b["resolved"]), 1)
+            c = track_findings([], index_path=index, run_id="C", scope="s")
+            self.assertEqual((c["previous_run"], c["resolved"]), ("B", []))
+
+    def test_failed_page_does_not_resolve_its_findings(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            state = Path(td)
+            checkout = _finding("The checkout button has low contrast against the page background")
+
+            def block(findings: list[dict], pages: list[dict]) -> dict:
+                return {"parsed": {"findings": findings}, "pages": pages}
+
+            first = block([dict(checkout)], [{"name": "/checkout"}])
+            _track_llm_findings(first, state_dir=state, run_id="r1", scope="s")
+            partial = block([], [{"name": "/checkout", "error": "HTTP 500"}])
+            _track_llm_findings(partial, state_dir=state, run_id="r2", scope="s")
+            self.assertEqual(partial["history"]["resolved"], [])
+
+            # The next complete run compares against r1, not the partial r2.
+            full = block([dict(checkout)], [{"name": "/checkout"}])
+            _track_llm_findings(full, state_dir=state, run_id="r3", scope="s")
+            self.assertEqual((full["history"]["previous_run"], full["history"]["recurring"]), ("r1", 1))
+
+    def test_issues_are_not_refiled_for_recurring_clusters(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            index = Path(td) / "findings-index.jsonl"
+            runs = [
+                [_finding("The checkout button has low contrast against the page background")],
+                [_finding("Low contrast: checkout button against its background on the page")],
+            ]
+            titles: list[str] = []
+            with mock.patch("uxdrift.cli.create_issue", side_effect=lambda **kw: titles.append(kw["title"])):
+                for i, findings in enumerate(runs):
+                    track_findings(findings, index_path=index, run_id=f"r{i}", scope="s")
+                    report = {"llm": {"parsed": {"findings": findings + [dict(findings[0])]}}}
+                    _create_followup_issues(repo="o/r", threshold="medium", report=report, index_path=index)
+
+            self.assertEqual(len(titles), 1)
+            self.assertTrue(FindingsIndex.load(index).has_issue(runs[0][0]["history"]["cluster"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+
+from uxdrift.llm.batch import batch_results, submit_batch, wait_for_batch, write_batch_file
+from uxdrift.llm.critique import batch_requests, critique_from_batch, prepare_inputs
+from uxdrift.llm.openai_compat import close_clients
+from uxdrift.llm.telemetry import aggregate, call_records
+
+
+class _BatchServer(BaseHTTPRequestHandler):
+    """Minimal stand-in for the files + batches API: the batch completes on its second poll."""
+
+    protocol_version = "HTTP/1.1"
+    lines: list[dict] = []
+    polls = 0
+
+    def _json(self, payload: object, status: int = 200) -> None:
+        data = (payload if isinstance(payload, str) else json.dumps(payload)).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:  # noqa: N802
+        raw = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        if self.path.endswith("/files"):
+            _BatchServer.lines = [json.loads(line) for line in raw.splitlines() if line.startswith('{"custom_id"')]
+            self._json({"id": "file-in"})
+        else:
+            self._json({"id": "batch-1", "status": "validating", "input_file_id": json.loads(raw)["input_file_id"]})
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.endswith("/batches/batch-1"):
+            _BatchServer.polls += 1
+            done = _BatchServer.polls >= 2
+            batch = {"id": "batch-1", "status": "completed" if done else "in_progress"}
+            if done:
+                batch.update({"output_file_id": "file-out", "error_file_id": "file-err"})
+            self._json(batch)
+        elif self.path.endswith("/files/file-out/content"):
+            out = []
+            for line in _BatchServer.lines[:-1]:
+                content = json.dumps({"findings": [{"severity": "high", "category": "flow", "summary": "Stuck"}]})
+                usage = {"prompt_tokens": 2, "completion_tokens": 1, "total_tokens": 3}
+                body = {"choices": [{"message": {"content": content}}], "usage": usage}
+                out.append({"custom_id": line["custom_id"], "response": {"status_code": 200, "body": body}})
+            self._json("".join(json.dumps(o) + "\n" for o in out))
+        elif self.path.endswith("/files/file-err/content"):
+            last = _BatchServer.lines[-1]["custom_id"]
+            self._json(json.dumps({"custom_id": last, "response": None, "error": {"message": "too long"}}) + "\n")
+        else:
+            self._json({"error": "not found"}, status=404)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class TestLlmBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        _BatchServer.polls = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _BatchServer)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def tearDown(self) -> None:
+        close_clients()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_round_trip_folds_results_per_page(self) -> None:
+        pages = [{"name": n, "url": f"http://x{n}"} for n in ("/", "/a", "/b")]
+        inputs = prepare_inputs(
+            evidence={"meta": {}, "pages": pages}, screenshot_paths=[], page_screenshots=[[], [], []]
+        )
+        lines, manifest = batch_requests(
+            inputs=inputs, base_url=self.base_url, model="m", goals=[], non_goals=[], povs=[]
+        )
+        self.assertEqual([line["custom_id"] for line in lines], ["pov0-call0", "pov0-call1", "pov0-call2"])
+        self.assertEqual(lines[0]["url"], "/v1/chat/completions")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "batch.jsonl"
+            write_batch_file(path, lines)
+            batch = submit_batch(base_url=self.base_url, api_key="k", input_path=path)
+        self.assertEqual(len(_BatchServer.lines), 3)
+
+        pending = wait_for_batch(base_url=self.base_url, api_key="k", batch_id=batch["id"], timeout_s=0)
+        self.assertEqual(pending["status"], "in_progress")
+        done = wait_for_batch(
+            base_url=self.base_url, api_key="k", batch_id=batch["id"], timeout_s=5, poll_s=0.01
+        )
+        self.assertEqual(done["status"], "completed")
+
+        results = batch_results(base_url=self.base_url, api_key="k", batch=done)
+        block = critique_from_batch(manifest, results)
+        self.assertEqual(block["strategy"], "map_reduce")
+        self.assertEqual(block["parsed"]["findings"][0]["pages"], ["/", "/a"])
+        self.assertEqual(block["pages"][2], {"name": "/b", "raw_text": "", "error": "too long"})
+        self.assertEqual(block["usage"], {"prompt_tokens": 4, "completion_tokens": 2, "total_tokens": 6})
+
+        records = call_records(block, run_id="r1", at="2026-10-19T00:00:00+00:00")
+        self.assertEqual([r["page"] for r in records], ["/", "/a", "/b"])
+        self.assertTrue(all(r["batch"] for r in records))
+        self.assertEqual(records[0]["prompt_tokens"], 2)
+        self.assertEqual(records[2]["error"], "too long")
+        total = aggregate(records, prices={"m": {"input": 1e6, "output": 1e6}}, by=None)[0]
+        self.assertEqual(total["cost_usd"], 3.0)  # (2 + 1) * 2 calls at half price
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import unittest
+
+from uxdrift.llm.budget import estimate_tokens, plan_evidence
+
+
+def _page(name: str, *, errors: int = 0, text: str = "") -> dict:
+    return {
+        "name": name,
+        "url": f"http://x/{name}",
+        "console_counts": {"error": errors, "warning": 0},
+        "network_counts": {"http_errors": 0, "request_failures": 0},
+        "page_error_count": 0,
+        "console_error_samples": [f"TypeError number {i} in bundle.js" for i in range(errors)],
+        "console_warning_samples": [],
+        "text": text,
+    }
+
+
+class TestTokenBudget(unittest.TestCase):
+    def test_everything_fits(self) -> None:
+        ev = {"meta": {"base_url": "http://x"}, "pages": [_page("a", errors=2, text="hello world")]}
+        planned, allowed, record = plan_evidence(ev, budget=10_000, page_images=[[("a.png", 0, 255)]])
+        self.assertEqual(planned["pages"][0]["console_error_samples"], ev["pages"][0]["console_error_samples"])
+        self.assertEqual(planned["pages"][0]["text"], "hello world")
+        self.assertEqual(allowed, {"a.png": [0]})
+        self.assertEqual(record["pages"][0]["dropped"], {})
+
+    def test_error_pages_win_and_text_is_truncated(self) -> None:
+        long_text = "word " * 4000
+        ev = {"meta": {}, "pages": [_page("calm", text=long_text), _page("broken", errors=5, text=long_text)]}
+        images = [[("calm.png", 0, 765)], [("broken.png", 0, 765)]]
+        core = estimate_tokens({"meta": {}}) + sum(
+            estimate_tokens({k: v for k, v in p.items() if k not in ("text", "console_error_samples", "console_warning_samples")})
+            for p in ev["pages"]
+        )
+        planned, allowed, record = plan_evidence(ev, budget=core + 2000, page_images=images)
+
+        calm, broken = record["pages"]
+        self.assertEqual(broken["weight"], 3)
+        self.assertGreater(broken["used"], calm["used"])
+        self.assertEqual(len(planned["pages"][1]["console_error_samples"]), 5)
+        self.assertIn("broken.png", allowed)
+        self.assertTrue(planned["pages"][1]["text"].endswith("[truncated to fit the token budget]"))
+        self.assertLessEqual(record["used_tokens"], record["budget"])
+        self.assertEqual(calm["dropped"].get("image"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
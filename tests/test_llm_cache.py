@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import tempfile
+import time
+import unittest
+
+from uxdrift.cli import _llm_evidence
+from uxdrift.llm.cache import LlmCache, cache_key
+from uxdrift.llm.openai_compat import chat_payload
+from uxdrift.llm.prompt import build_messages
+from uxdrift.playwright_runner import PageEvidence
+
+
+def _run(run_dir: str, total_ms: int) -> dict:
+    page = PageEvidence(
+        name="/",
+        url="http://localhost:3000/",
+        artifacts={"screenshot": f"{run_dir}/00-root.png"},
+        timing_ms={"goto": total_ms // 2, "total": total_ms},
+        console={"messages": [], "counts": {}},
+        network={"counts": {}},
+        page_errors=[],
+        extracted={"title": "Home", "text": "Welcome", "performance_navigation": {"duration": total_ms * 0.9}},
+    )
+    meta = {"base_url": "http://localhost:3000", "pages": ["/"], "timing_ms": {"total": total_ms}}
+    return _llm_evidence(ev_pages=[page], run_meta=meta)
+
+
+class TestLlmCache(unittest.TestCase):
+    def test_key_covers_payload_and_endpoint(self) -> None:
+        payload = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.2}
+        same = {"temperature": 0.2, "messages": [{"role": "user", "content": "hi"}], "model": "m"}
+        self.assertEqual(cache_key(payload, base_url="http://x/v1/"), cache_key(same, base_url="http://x/v1"))
+        self.assertNotEqual(cache_key(payload, base_url="http://x/v1"), cache_key(payload, base_url="http://y/v1"))
+        self.assertNotEqual(
+            cache_key(payload, base_url="http://x/v1"), cache_key({**payload, "temperature": 0.0}, base_url="http://x/v1")
+        )
+
+    def test_unchanged_site_hits_across_runs(self) -> None:
+        def key(evidence: dict) -> str:
+            messages = build_messages(goals=[], non_goals=[], evidence=evidence, images=[])
+            return cache_key(chat_payload(model="m", messages=messages), base_url="http://x/v1")
+
+        first = key(_run("/p/.uxdrift/runs/20260101-000000", 812))
+        second = key(_run("/p/.uxdrift/runs/20260102-000000", 1375))
+        self.assertEqual(first, second)
+        with tempfile.TemporaryDirectory() as td:
+            LlmCache(root=Path(td)).put(first, {"x": 1}, model="m")
+            self.assertEqual(LlmCache(root=Path(td)).get(second), {"x": 1})
+
+    def test_put_evicts_every_n_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = LlmCache(root=Path(td), max_bytes=0, evict_every=3)
+            for i in range(3):
+                cache.put(f"aa{i:02d}", {"x": i}, model="m")
+            # Only the first write evicted (itself, with max_bytes=0); the next two are kept.
+            self.assertEqual(sorted(p.stem for p in Path(td).glob("*/*.json")), ["aa01", "aa02"])
+            cache.put("aa03", {"x": 3}, model="m")
+            self.assertEqual(list(Path(td).glob("*/*.json")), [])
+
+    def test_modes_and_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            LlmCache(root=root, mode="read").put("ab12", {"x": 1}, model="m")
+            self.assertIsNone(LlmCache(root=root).get("ab12"))
+
+            LlmCache(root=root).put("ab12", {"x": 1}, model="m")
+            self.assertEqual(LlmCache(root=root, mode="read").get("ab12"), {"x": 1})
+            with self.assertRaises(ValueError):
+                LlmCache(root=root, mode="sometimes")
+
+    def test_evicts_expired_then_lru(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache = LlmCache(root=Path(td), max_bytes=10**9, max_age_s=3600)
+            for key in ("aa01", "bb02", "cc03"):
+                cache.put(key, {"text": "x" * 100}, model="m")
+            old = time.time() - 7200
+            os.utime(cache._path("aa01"), (old, old))
+            os.utime(cache._path("bb02"), (old + 3700, old + 3700))
+            size = cache._path("cc03").stat().st_size
+
+            cache.max_bytes = size
+            self.assertEqual(cache.evict(), {"expired": 1, "lru": 1})
+            self.assertIsNotNone(cache.get("cc03"))
+            self.assertIsNone(cache.get("bb02"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import unittest
+
+from uxdrift.llm.chrome import strip_shared_chrome
+from uxdrift.llm.critique import prepare_inputs
+
+
+_NAV = "Home\nProducts\nPricing\nSign in"
+_FOOTER = "© 2026 Acme Inc. All rights reserved."
+
+
+def _evidence() -> dict:
+    return {
+        "meta": {},
+        "pages": [
+            {"name": "/", "text": f"{_NAV}\nWelcome to Acme\nStart free trial\n\n{_FOOTER}"},
+            {"name": "/pricing", "text": f"{_NAV}\nPlans from $9\nHome\n{_FOOTER}"},
+            {"name": "/about", "text": f"{_NAV}\nOur story\n{_FOOTER}"},
+        ],
+    }
+
+
+class TestSharedChrome(unittest.TestCase):
+    def test_moves_repeated_blocks_to_shared_chrome(self) -> None:
+        evidence, record = strip_shared_chrome(_evidence())
+        texts = {p["name"]: p["text"] for p in evidence["pages"]}
+        self.assertEqual(texts["/"], "Welcome to Acme\nStart free trial")
+        # A lone shared line inside unique content ("Home") is not chrome.
+        self.assertEqual(texts["/pricing"], "Plans from $9\nHome")
+        self.assertEqual(evidence["shared_chrome"]["text"], f"{_NAV}\n{_FOOTER}")
+        self.assertEqual(record["pages"], 3)
+
+    def test_no_shared_text_is_a_no_op(self) -> None:
+        evidence = {"pages": [{"name": "/", "text": "alpha beta"}, {"name": "/b", "text": "gamma delta"}]}
+        self.assertEqual(strip_shared_chrome(evidence), (evidence, None))
+
+    def test_per_page_calls_carry_chrome_once(self) -> None:
+        inputs = prepare_inputs(evidence=_evidence(), screenshot_paths=[], page_screenshots=[[], [], []])
+        carrying = [c["name"] for c in inputs.calls if "shared_chrome" in c["evidence"]]
+        self.assertEqual(carrying, ["/"])
+        self.assertEqual(inputs.blocks["shared_chrome"]["pages"], 3)
+        self.assertIn("Welcome", inputs.calls[0]["source"]["text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest import mock
+
+from uxdrift.llm.critique import critique, critique_povs, merge_parsed
+
+
+def _fake_completion(**kw):
+    """Triage flags only the checkout page; the full model always reports one finding."""
+    text = kw["messages"][1]["content"][0]["text"]
+    if kw["model"] == "small":
+        sev = "high" if "/checkout" in text else "low"
+        body = {"findings": [{"severity": sev, "category": "copy", "summary": f"triage {sev}"}]}
+    else:
+        body = {"findings": [{"severity": "medium", "category": "usability", "summary": "full finding"}]}
+    return {"choices": [{"message": {"content": json.dumps(body)}}], "usage": {"total_tokens": 10}}
+
+
+class TestLlmCritiqueMerge(unittest.TestCase):
+    def test_merge_dedupes_and_ranks(self) -> None:
+        merged = merge_parsed(
+            [
+                (
+                    "root",
+                    {
+                        "findings": [
+                            {"severity": "low", "category": "copy", "summary": "Typo in footer", "confidence": 0.4},
+                            {
+                                "severity": "medium",
+                                "category": "usability",
+                                "summary": "Search button is hard to find.",
+                                "confidence": 0.6,
+                                "principle_tags": ["discoverability"],
+                            },
+                        ],
+                        "pov_scorecard": [{"principle": "feedback", "score": 4, "rationale": "ok"}],
+                        "novel_ideas": ["Inline search"],
+                    },
+                ),
+                (
+                    "/checkout",
+                    {
+                        "findings": [
+                            {
+                                "severity": "high",
+                                "category": "usability",
+                                "summary": "Search button is hard to find",
+                                "confidence": 0.8,
+                                "principle_tags": ["signifiers"],
+                            }
+                        ],
+                        "pov_scorecard": [{"principle": "feedback", "score": 2, "rationale": "no spinner"}],
+                        "novel_ideas": ["inline search!"],
+                    },
+                ),
+                ("/broken", None),
+            ]
+        )
+        findings = merged["findings"]
+        self.assertEqual(len(findings), 2)
+        top = findings[0]
+        self.assertEqual(top["severity"], "high")
+        self.assertEqual(top["confidence"], 0.8)
+        self.assertEqual(top["pages"], ["root", "/checkout"])
+        self.assertEqual(top["principle_tags"], ["discoverability", "signifiers"])
+        self.assertEqual(merged["pov_scorecard"][0]["score"], 3.0)
+        self.assertEqual(merged["pov_scorecard"][0]["rationale"], "/checkout: no spinner")
+        self.assertEqual(merged["novel_ideas"], ["Inline search"])
+
+
+class TestLlmCritiqueCascade(unittest.TestCase):
+    def test_escalates_flagged_and_erroring_pages_only(self) -> None:
+        def page(name: str, errors: int = 0) -> dict:
+            return {"name": name, "url": f"http://x{name}", "console_counts": {"error": errors}}
+
+        evidence = {"meta": {}, "pages": [page("/"), page("/checkout"), page("/broken", errors=2)]}
+        with mock.patch("uxdrift.llm.critique.chat_completions", side_effect=_fake_completion) as fake:
+            block = critique(
+                base_url="http://x/v1",
+                api_key="k",
+                model="big",
+                goals=[],
+                non_goals=[],
+                evidence=evidence,
+                screenshot_paths=[],
+                page_screenshots=[[], [], []],
+                triage_model="small",
+            )
+
+        models = sorted(c.kwargs["model"] for c in fake.call_args_list)
+        self.assertEqual(models, ["big", "big", "small", "small"])
+        tiers = {p["name"]: (p["tier"], p.get("escalation")) for p in block["pages"]}
+        self.assertEqual(
+            tiers,
+            {"/": ("triage", None), "/checkout": ("full", "triage_flagged"), "/broken": ("full", "deterministic_findings")},
+        )
+        cascade = block["cascade"]
+        self.assertEqual((cascade["pages_triage_only"], cascade["pages_escalated"]), (1, 2))
+        self.assertEqual(cascade["tiers"]["triage"]["calls"], 2)
+        self.assertEqual(cascade["tiers"]["full"]["usage"], {"total_tokens": 20})
+        by_summary = {f["summary"]: f for f in block["parsed"]["findings"]}
+        self.assertEqual(by_summary["triage low"]["tier"], "triage")
+        self.assertEqual(by_summary["full finding"]["tier"], "full")
+        self.assertEqual(by_summary["full finding"]["pages"], ["/checkout", "/broken"])
+
+
+class TestLlmCritiquePovs(unittest.TestCase):
+    def test_shares_inputs_and_keeps_per_pov_scorecards(self) -> None:
+        def fake(**kw):
+            system = kw["messages"][0]["content"]
+            pov = "alpha" if "alpha" in system else "beta"
+            body = {
+                "findings": [{"severity": "medium", "category": "usability", "summary": "Shared issue"}],
+                "pov_scorecard": [{"principle": f"{pov}-p", "score": 3}],
+            }
+            return {"choices": [{"message": {"content": json.dumps(body)}}], "usage": {"total_tokens": 5}}
+
+        evidence = {"meta": {}, "pages": [{"name": "/", "url": "http://x/"}]}
+        with mock.patch("uxdrift.llm.critique.chat_completions", side_effect=fake), mock.patch(
+            "uxdrift.llm.critique.prepare_images", return_value={}
+        ) as prep:
+            block = critique_povs(
+                povs=["alpha", "beta"],
+                base_url="http://x/v1",
+                api_key="k",
+                model="big",
+                goals=[],
+                non_goals=[],
+                evidence=evidence,
+                screenshot_paths=[],
+            )
+
+        self.assertEqual(prep.call_count, 1)
+        self.assertEqual(block["strategy"], "multi_pov")
+        self.assertEqual([b["pov"]["name"] for b in block["povs"]], ["alpha", "beta"])
+        self.assertEqual([b["parsed"]["pov_scorecard"][0]["principle"] for b in block["povs"]], ["alpha-p", "beta-p"])
+        self.assertEqual(block["parsed"]["findings"][0]["povs"], ["alpha", "beta"])
+        self.assertNotIn("pages", block["parsed"]["findings"][0])
+        self.assertEqual(block["usage"], {"total_tokens": 10})
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from uxdrift.cli import _llm_evidence
+from uxdrift.llm.critique import prepare_inputs
+from uxdrift.llm.encode import encode_evidence
+from uxdrift.llm.prompt import build_messages
+from uxdrift.playwright_runner import PageEvidence
+
+
+def _run(run_dir: str, goto_ms: int) -> dict:
+    pages = [
+        PageEvidence(
+            name=name,
+            url=f"http://localhost:3000{name}",
+            artifacts={"screenshot": f"{run_dir}/{i:02d}.png", "step_screenshots": [f"{run_dir}/{i:02d}-step-0.png"]},
+            timing_ms={"goto": goto_ms + i, "total": goto_ms * 2},
+            console={"messages": [{"type": "error", "text": "boom"}], "counts": {"error": 1}},
+            network={"counts": {}},
+            page_errors=[],
+            extracted={"title": name, "text": f"Shop nav\nPage {name}", "performance_navigation": {"duration": goto_ms}},
+        )
+        for i, name in enumerate(["/", "/checkout"])
+    ]
+    meta = {"base_url": "http://localhost:3000", "pages": ["/", "/checkout"], "timing_ms": {"total": goto_ms * 3}}
+    return _llm_evidence(ev_pages=pages, run_meta=meta)
+
+
+class TestEvidenceEncoding(unittest.TestCase):
+    def test_canonical_minified_and_pruned(self) -> None:
+        a = encode_evidence({"b": 1, "a": {"y": None, "x": [], "z": 0, "w": False}, "c": ""})
+        b = encode_evidence({"c": "", "a": {"w": False, "z": 0, "x": [], "y": None}, "b": 1})
+        self.assertEqual(a, b)
+        self.assertEqual(a, '{"a":{"w":false,"z":0},"b":1}')
+
+    def test_interns_repeated_prefixes(self) -> None:
+        run_dir = "/home/ci/project/.uxdrift/runs/20260101-000000"
+        ev = {
+            "meta": {"base_url": "http://localhost:3000"},
+            "pages": [
+                {"url": "http://localhost:3000/", "screenshot": f"{run_dir}/00-root.png"},
+                {"url": "http://localhost:3000/checkout?step=2", "screenshot": f"{run_dir}/01-checkout.png"},
+            ],
+        }
+        out = json.loads(encode_evidence(ev))
+        refs = out["refs"]
+        self.assertEqual(sorted(refs.values()), sorted([run_dir, "http://localhost:3000"]))
+        alias = {v: k for k, v in refs.items()}
+        self.assertEqual(out["pages"][1]["url"], alias["http://localhost:3000"] + "/checkout?step=2")
+        self.assertEqual(out["pages"][0]["screenshot"], alias[run_dir] + "/00-root.png")
+        self.assertEqual(out["meta"]["base_url"], alias["http://localhost:3000"])
+
+    def test_prompts_identical_across_runs(self) -> None:
+        def prompts(evidence: dict) -> list[str]:
+            inputs = prepare_inputs(evidence=evidence, screenshot_paths=[], page_screenshots=[[], []], token_budget=4_000)
+            return [
+                json.dumps(build_messages(goals=["Buy"], non_goals=[], evidence=c["encoded"], images=[]))
+                for c in inputs.calls
+            ]
+
+        first = prompts(_run("/p/.uxdrift/runs/20260101-000000", 420))
+        second = prompts(_run("/p/.uxdrift/runs/20260102-093000", 1730))
+        self.assertEqual(len(first), 2)
+        self.assertEqual(first, second)
+        self.assertNotIn("1730", "".join(second))
+        self.assertNotIn(".uxdrift/runs", "".join(second))
+
+    def test_prompt_uses_encoder(self) -> None:
+        messages = build_messages(goals=[], non_goals=[], evidence={"meta": {"x": None, "y": 1}}, images=[])
+        text = messages[1]["content"][0]["text"]
+        self.assertIn('{"meta":{"y":1}}', text)
+        self.assertNotIn("None", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import tempfile
+import time
+import unittest
+
+from uxdrift.llm.images import ImageOptions, estimate_image_tokens, evict_image_cache, image_stats, prepare_images
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional extras
+    Image = None
+
+
+class TestImageTokens(unittest.TestCase):
+    def test_estimate(self) -> None:
+        self.assertEqual(estimate_image_tokens(512, 512), 85 + 170)
+        self.assertEqual(estimate_image_tokens(1024, 1024), 85 + 170 * 4)
+        self.assertEqual(estimate_image_tokens(0, 10), 0)
+
+
+@unittest.skipIf(Image is None, "requires uxdrift[visual]")
+class TestPrepareImages(unittest.TestCase):
+    def test_tiles_downscales_and_caches(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            shot = Path(td) / "00-root.png"
+            Image.new("RGB", (1280, 4000), (240, 240, 240)).save(shot)
+            options = ImageOptions(max_width=640, tile_height=640, max_tiles=3)
+            cache_dir = Path(td) / "cache"
+
+            first = prepare_images([shot, shot], options=options, cache_dir=cache_dir)
+            rec = first[str(shot)]
+            self.assertEqual(len(rec["parts"]), 3)
+            self.assertTrue(rec["parts"][0]["image_url"]["url"].startswith("data:image/jpeg;base64,"))
+            self.assertEqual([(t["width"], t["height"]) for t in rec["tiles"]], [(640, 640)] * 3)
+            self.assertEqual(rec["dropped_tiles"], 1)  # 2000px scaled height -> 4 tiles, 3 kept
+            self.assertFalse(rec["cached"])
+
+            second = prepare_images([shot], options=options, cache_dir=cache_dir)[str(shot)]
+            self.assertTrue(second["cached"])
+            self.assertEqual(second["parts"], rec["parts"])
+
+            stats = image_stats(first)
+            self.assertNotIn("parts", stats["images"][0])
+            self.assertEqual(stats["est_tokens"], 3 * estimate_image_tokens(640, 640))
+
+    def test_evicts_tile_cache_by_age_then_size(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            cache_dir = Path(td) / "cache"
+            shots = []
+            for i in range(3):
+                shot = Path(td) / f"{i:02d}.png"
+                Image.new("RGB", (320, 320), (i * 80, 0, 0)).save(shot)
+                shots.append(shot)
+            prepare_images(shots, cache_dir=cache_dir)
+            entries = sorted(p.parent for p in cache_dir.glob("*/*/meta.json"))
+            self.assertEqual(len(entries), 3)
+
+            old = time.time() - 7200
+            os.utime(entries[0] / "meta.json", (old, old))
+            os.utime(entries[1] / "meta.json", (old + 3700, old + 3700))
+            newest = sum(f.stat().st_size for f in entries[2].iterdir())
+
+            removed = evict_image_cache(cache_dir, max_bytes=newest, max_age_s=3600)
+            self.assertEqual(removed, {"expired": 1, "lru": 1})
+            self.assertEqual([p.parent for p in cache_dir.glob("*/*/meta.json")], [entries[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+from uxdrift.llm.cache import LlmCache
+from uxdrift.llm.critique import critique
+from uxdrift.llm.incremental import page_fingerprint
+
+
+def _page(name: str, text: str, **extra: object) -> dict:
+    return {"name": name, "url": f"http://x{name}", "text": text, "timing_ms": {"total": 100}, **extra}
+
+
+def _fake_completion(**kw):
+    text = kw["messages"][1]["content"][0]["text"]
+    summary = "Checkout total unclear" if "/checkout" in text else "Hero copy vague"
+    body = {"findings": [{"severity": "medium", "category": "copy", "summary": summary}]}
+    return {"choices": [{"message": {"content": json.dumps(body)}}], "usage": {"total_tokens": 10}}
+
+
+class TestPageFingerprint(unittest.TestCase):
+    def fp(self, page: dict, **kw: object) -> str:
+        args = {
+            "screenshots": ["p:00ff"],
+            "model": "m",
+            "triage_model": None,
+            "escalate_at": "medium",
+            "pov": None,
+            "goals": [],
+            "non_goals": [],
+            **kw,
+        }
+        return page_fingerprint(page, **args)
+
+    def test_ignores_volatile_details(self) -> None:
+        a = _page("/", "Updated 12:01", console_error_samples=["chunk 3fa9c2d1e8 failed"])
+        b = {
+            **_page("/", "Updated  09:45", console_error_samples=["chunk 77be01aa42 failed"]),
+            "timing_ms": {"total": 999},
+        }
+        self.assertEqual(self.fp(a), self.fp(b))
+
+    def test_changes_with_content_screenshot_and_model(self) -> None:
+        base = self.fp(_page("/", "Welcome"))
+        self.assertNotEqual(base, self.fp(_page("/", "Welcome back")))
+        self.assertNotEqual(base, self.fp(_page("/", "Welcome"), screenshots=["p:ff00"]))
+        self.assertNotEqual(base, self.fp(_page("/", "Welcome"), model="other"))
+
+    def test_changes_with_triage_cascade(self) -> None:
+        page = _page("/", "Welcome")
+        base = self.fp(page)
+        triaged = self.fp(page, triage_model="small")
+        self.assertNotEqual(base, triaged)
+        self.assertNotEqual(triaged, self.fp(page, triage_model="small", escalate_at="high"))
+        # Without a triage tier the threshold is unused and does not split the cache.
+        self.assertEqual(base, self.fp(page, escalate_at="high"))
+
+
+class TestIncrementalCritique(unittest.TestCase):
+    def run_critique(self, pages: list[dict], page_cache: LlmCache) -> tuple[dict, mock.Mock]:
+        with mock.patch("uxdrift.llm.critique.chat_completions", side_effect=_fake_completion) as fake:
+            block = critique(
+                base_url="http://x/v1",
+                api_key="k",
+                model="m",
+                goals=[],
+                non_goals=[],
+                evidence={"meta": {}, "pages": pages},
+                screenshot_paths=[],
+                page_screenshots=[[] for _ in pages],
+                page_cache=page_cache,
+            )
+        return block, fake
+
+    def test_only_changed_pages_are_sent(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            page_cache = LlmCache(root=Path(tmp))
+            first, fake = self.run_critique([_page("/", "Home"), _page("/checkout", "Total: 10")], page_cache)
+            self.assertEqual(fake.call_count, 2)
+            self.assertEqual(first["incremental"]["pages_fresh"], 2)
+
+            second, fake = self.run_critique([_page("/", "Home"), _page("/checkout", "Total: 10 Pay")], page_cache)
+
+        self.assertEqual(fake.call_count, 1)
+        self.assertEqual((second["incremental"]["pages_reused"], second["incremental"]["pages_fresh"]), (1, 1))
+        by_page = {p["name"]: p for p in second["pages"]}
+        self.assertEqual(by_page["/"]["provenance"], "cached")
+        self.assertIn("cached_from", by_page["/"])
+        self.assertEqual(by_page["/checkout"]["provenance"], "fresh")
+        provenance = {f["summary"]: f["provenance"] for f in second["parsed"]["findings"]}
+        self.assertEqual(provenance, {"Hero copy vague": "cached", "Checkout total unclear": "fresh"})
+        self.assertEqual(second["usage"], {"total_tokens": 10})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from uxdrift.llm.bench import run_benchmark
+from uxdrift.llm.mockserver import MockLlmServer, MockOptions
+from uxdrift.llm.openai_compat import chat_completions, close_clients, extract_text
+
+
+class TestMockLlmServer(unittest.TestCase):
+    def tearDown(self) -> None:
+        close_clients()
+
+    def test_canned_responses_and_throttling(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            canned = Path(tmp) / "responses.json"
+            canned.write_text(json.dumps(["first", {"findings": []}]), encoding="utf-8")
+            options = MockOptions(latency_ms=0, throttle_rate=1.0, retry_after_s=0, responses=canned)
+            with MockLlmServer(options) as server:
+                stats: list[dict] = []
+                with self.assertRaises(Exception):
+                    chat_completions(
+                        base_url=server.base_url, api_key="k", model="m", messages=[], stats=stats, retry=None
+                    )
+                self.assertEqual(server.stats()["throttled"], 1)
+                self.assertEqual(stats[0]["status"], 429)
+
+            with MockLlmServer(MockOptions(latency_ms=0, responses=canned)) as server:
+                texts = [
+                    extract_text(chat_completions(base_url=server.base_url, api_key="k", model="m", messages=[]))
+                    for _ in range(3)
+                ]
+        self.assertEqual(texts, ["first", '{"findings": []}', "first"])
+
+    def test_benchmark_reports_latency_and_reuses_streamed_connections(self) -> None:
+        options = MockOptions(latency_ms=1, chunk_delay_ms=0, throttle_rate=0.3, retry_after_s=0, seed=7)
+        with MockLlmServer(options) as server:
+            result = run_benchmark(
+                base_url=server.base_url, api_key="k", model="m", pages=6, concurrencies=[1, 3], stream=True
+            )
+        rows = result["results"]
+        self.assertEqual([r["concurrency"] for r in rows], [1, 3])
+        for row in rows:
+            self.assertEqual(row["failed_pages"], 0)
+            self.assertGreaterEqual(row["calls"], 6)
+            self.assertGreater(row["bytes_sent"], 0)
+            self.assertLessEqual(row["p50_ms"], row["p95_ms"])
+            self.assertIn("ttft_p50_ms", row)
+        self.assertEqual(rows[0]["connections_opened"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+
+from uxdrift.llm.cache import LlmCache
+from uxdrift.llm.parse import FindingsStreamParser
+from uxdrift.llm.ratelimit import RateLimiter, RetryPolicy
+from uxdrift.llm.openai_compat import (
+    ClientSettings,
+    OpenAICompatError,
+    chat_completions,
+    chat_completions_stream,
+    close_clients,
+    configure_client,
+    summarize_calls,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    throttled = False
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if body.get("stream"):
+            chunks = ['{"findings": [{"summary": "a"}', ", ", '{"summary": "b"}]}']
+            events = [{"choices": [{"delta": {"content": c}}]} for c in chunks]
+            events.append({"choices": [], "usage": {"total_tokens": 7}})
+            data = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Content-Length", str(len(data.encode("utf-8"))))
+            self.end_headers()
+            self.wfile.write(data.encode("utf-8"))
+            return
+        if body["model"] == "flaky" and not _Handler.throttled:
+            _Handler.throttled = True
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if body["model"] == "broken":
+            status, payload = 500, {"error": "boom"}
+        else:
+            usage = {"prompt_tokens": 11, "completion_tokens": 2, "total_tokens": 13}
+            status, payload = 200, {"choices": [{"message": {"content": "ok"}}], "usage": usage}
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class TestOpenAICompatClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        configure_client(ClientSettings(max_connections=2, max_keepalive_connections=2))
+
+    def tearDown(self) -> None:
+        close_clients()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_reuses_keepalive_connection(self) -> None:
+        stats: list[dict] = []
+        for _ in range(3):
+            resp = chat_completions(base_url=self.base_url, api_key="k", model="m", messages=[], stats=stats)
+            self.assertEqual(resp["choices"][0]["message"]["content"], "ok")
+
+        self.assertEqual([s["new_connection"] for s in stats], [True, False, False])
+        self.assertEqual((stats[0]["prompt_tokens"], stats[0]["completion_tokens"], stats[0]["images"]), (11, 2, 0))
+        summary = summarize_calls(stats)
+        self.assertEqual(summary["calls"], 3)
+        self.assertEqual(summary["connections_opened"], 1)
+        self.assertEqual(summary["connections_reused"], 2)
+        self.assertGreater(summary["bytes_sent"], 0)
+
+    def test_cache_hit_skips_the_network(self) -> None:
+        stats: list[dict] = []
+        with tempfile.TemporaryDirectory() as td:
+            cache = LlmCache(root=Path(td))
+            kw = {"base_url": self.base_url, "api_key": "k", "model": "m", "messages": [], "stats": stats, "cache": cache}
+            first = chat_completions(**kw)
+            second = chat_completions(**kw)
+
+        self.assertEqual(first, second)
+        self.assertNotIn("cache_hit", stats[0])
+        self.assertTrue(stats[1]["cache_hit"])
+        self.assertEqual(summarize_calls(stats)["cache_hits"], 1)
+
+    def test_stream_delivers_findings_incrementally(self) -> None:
+        stats: list[dict] = []
+        parser = FindingsStreamParser()
+        seen: list[dict] = []
+        resp = chat_completions_stream(
+            base_url=self.base_url,
+            api_key="k",
+            model="m",
+            messages=[],
+            stats=stats,
+            on_delta=lambda d: seen.extend(parser.feed(d)),
+        )
+        self.assertEqual(seen, [{"summary": "a"}, {"summary": "b"}])
+        self.assertEqual(resp["choices"][0]["message"]["content"], '{"findings": [{"summary": "a"}, {"summary": "b"}]}')
+        self.assertEqual(resp["usage"], {"total_tokens": 7})
+        self.assertTrue(stats[0]["stream"])
+        self.assertIn("ttft_ms", stats[0])
+
+    def test_retries_429_and_adapts_concurrency(self) -> None:
+        _Handler.throttled = False
+        stats: list[dict] = []
+        limiter = RateLimiter(max_concurrency=4)
+        resp = chat_completions(
+            base_url=self.base_url,
+            api_key="k",
+            model="flaky",
+            messages=[],
+            stats=stats,
+            limiter=limiter,
+            retry=RetryPolicy(max_retries=2, base_delay_s=0.01),
+        )
+        self.assertEqual(resp["choices"][0]["message"]["content"], "ok")
+        self.assertEqual([s["status"] for s in stats], [429, 200])
+        self.assertEqual(stats[1]["attempt"], 1)
+        self.assertEqual(summarize_calls(stats)["retries"], 1)
+        rl = limiter.stats()
+        self.assertEqual((rl["throttled"], rl["retries"], rl["lowest_concurrency_limit"]), (1, 1, 2))
+
+    def test_error_status_is_recorded(self) -> None:
+        stats: list[dict] = []
+        with self.assertRaises(OpenAICompatError):
+            chat_completions(base_url=self.base_url, api_key="k", model="broken", messages=[], stats=stats)
+        self.assertEqual(stats[0]["status"], 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
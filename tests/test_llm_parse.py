@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import unittest
 
-from uxdrift.llm.parse import parse_json_object
+from uxdrift.llm.parse import FindingsStreamParser, parse_json_object
 
 
 class TestLLMParse(unittest.TestCase):
@@ -27,3 +27,18 @@ class TestLLMParse(unittest.TestCase):
         assert obj is not None
         self.assertEqual(obj["y"]["z"], 2)
 
+
+class TestFindingsStreamParser(unittest.TestCase):
+    TEXT = (
+        'Here it is:\n```json\n{"pov_scorecard": [{"principle": "x"}], "findings": ['
+        '{"summary": "brace } and \\" quote", "evidence": ["a"]}, {"summary": "second"}], '
+        '"novel_ideas": [{"not": "a finding"}]}\n```'
+    )
+
+    def test_yields_each_finding_once_complete(self) -> None:
+        parser = FindingsStreamParser()
+        got: list[list[dict]] = [parser.feed(self.TEXT[i : i + 5]) for i in range(0, len(self.TEXT), 5)]
+        flat = [f for batch in got for f in batch]
+        self.assertEqual([f["summary"] for f in flat], ['brace } and " quote', "second"])
+        # The first finding is delivered before the stream ends.
+        self.assertLess(next(i for i, b in enumerate(got) if b), len(got) - 1)
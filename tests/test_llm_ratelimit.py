@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import threading
+import time
+import unittest
+
+from uxdrift.llm.ratelimit import RateLimiter, RetryPolicy, retry_after_seconds
+
+
+class TestRetryAfter(unittest.TestCase):
+    def test_parses_seconds_ms_and_dates(self) -> None:
+        self.assertEqual(retry_after_seconds({"retry-after": "3"}), 3.0)
+        self.assertEqual(retry_after_seconds({"retry-after-ms": "250"}), 0.25)
+        when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        self.assertAlmostEqual(retry_after_seconds({"retry-after": when}) or 0, 30, delta=2)
+        self.assertIsNone(retry_after_seconds({"retry-after": "soon"}))
+        self.assertIsNone(retry_after_seconds({}))
+
+    def test_delay_bounds(self) -> None:
+        policy = RetryPolicy(base_delay_s=1.0, max_delay_s=5.0)
+        for attempt in range(6):
+            self.assertLessEqual(policy.delay(attempt), 5.0)
+        self.assertGreaterEqual(policy.delay(0, retry_after_s=2.0), 2.0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_throttle_halves_concurrency_and_successes_recover(self) -> None:
+        lim = RateLimiter(max_concurrency=8)
+        lim.acquire()
+        lim.release(status=429, retry_after_s=0)
+        self.assertEqual(lim.stats()["concurrency_limit"], 4)
+        for _ in range(4):
+            lim.acquire()
+            lim.release(status=200)
+        stats = lim.stats()
+        self.assertEqual(stats["concurrency_limit"], 5)
+        self.assertEqual(stats["lowest_concurrency_limit"], 4)
+        self.assertEqual(stats["throttled"], 1)
+
+    def test_concurrency_limit_blocks(self) -> None:
+        lim = RateLimiter(max_concurrency=1)
+        lim.acquire()
+        released = threading.Event()
+
+        def later() -> None:
+            time.sleep(0.05)
+            released.set()
+            lim.release(status=200)
+
+        threading.Thread(target=later).start()
+        lim.acquire()
+        self.assertTrue(released.is_set())
+        lim.release(status=200)
+
+    def test_request_bucket_paces(self) -> None:
+        lim = RateLimiter(requests_per_min=1200)  # one request per 50ms once the burst is spent
+        lim._req_level = 0
+        started = time.monotonic()
+        lim.acquire()
+        lim.release(status=200)
+        self.assertGreaterEqual(time.monotonic() - started, 0.03)
+        self.assertGreater(lim.stats()["waited_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import unittest
+
+from uxdrift.llm.select import ScreenshotCandidate, select_screenshots
+
+
+def _prepared(*paths: str, tiles: int = 1) -> dict:
+    return {p: {"tiles": [{"est_tokens": 100}] * tiles} for p in paths}
+
+
+class TestSelectScreenshots(unittest.TestCase):
+    def test_spreads_across_pages_and_skips_near_duplicates(self) -> None:
+        cands = [
+            ScreenshotCandidate(path="a-step0", page="/a", kind="step", order=0, step=0, phash=0x0),
+            ScreenshotCandidate(path="a-step1", page="/a", kind="step", order=1, step=1, phash=0x1),
+            ScreenshotCandidate(path="a-step2", page="/a", kind="step", order=2, step=2, final_step=True, phash=0xFF),
+            ScreenshotCandidate(path="a", page="/a", kind="page", order=3, phash=0xFFFF0000),
+            ScreenshotCandidate(path="b", page="/b", kind="page", order=4, phash=0xFFFFFFFF00000000),
+            ScreenshotCandidate(path="c", page="/c", kind="page", order=5, has_errors=True, phash=0xF0F0F0F0F0F0F0F0),
+        ]
+        prepared = _prepared("a-step0", "a-step1", "a-step2", "a", "b", "c")
+        picks, record = select_screenshots(cands, prepared=prepared, budget=4)
+
+        self.assertEqual([p for p, _ in picks], ["a-step2", "a", "b", "c"])
+        self.assertEqual(record["selected"][0]["path"], "c")
+        self.assertIn("page has errors", record["selected"][0]["reasons"])
+        reasons = {s["path"]: s["reason"] for s in record["skipped"]}
+        self.assertEqual(reasons, {"a-step0": "over_budget", "a-step1": "over_budget"})
+
+        dup = [ScreenshotCandidate(path="x", page="/x", kind="page", order=0, phash=0x0),
+               ScreenshotCandidate(path="x-step", page="/x", kind="step", order=1, step=0, phash=0x3)]
+        picks, record = select_screenshots(dup, prepared=_prepared("x", "x-step", tiles=3), budget=4)
+        # The near-duplicate step is dropped; its budget goes to lower tiles of the page screenshot.
+        self.assertEqual(picks, [("x", 0), ("x", 1), ("x", 2)])
+        self.assertEqual(record["skipped"][0]["reason"], "near_duplicate")
+        self.assertEqual(record["skipped"][0]["duplicate_of"], "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
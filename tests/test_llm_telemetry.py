@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+
+from uxdrift.llm.telemetry import aggregate, call_cost, load_history, load_prices, percentile, price_for, record_run
+
+
+_PRICES = {"big": {"input": 10.0, "output": 30.0}, "small": {"input": 1.0, "output": 2.0}}
+
+
+class TestTelemetry(unittest.TestCase):
+    def test_percentile_nearest_rank(self) -> None:
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 50), 3.0)
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 95), 5.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_costs_and_cascade_tiers(self) -> None:
+        self.assertEqual(price_for("small-2026-01-01", _PRICES), _PRICES["small"])
+        self.assertIsNone(price_for("other", _PRICES))
+        self.assertAlmostEqual(call_cost({"model": "big", "prompt_tokens": 1000, "completion_tokens": 100}, _PRICES), 0.013)
+        self.assertEqual(call_cost({"model": "big", "cache_hit": True}, _PRICES), 0.0)
+        self.assertEqual(call_cost({"model": "big", "status": 429}, _PRICES), 0.0)
+        self.assertIsNone(call_cost({"model": "other", "prompt_tokens": 5}, _PRICES))
+
+        records = [
+            {"model": "small", "tier": "triage", "prompt_tokens": 1000, "completion_tokens": 0, "latency_ms": 100},
+            {"model": "small", "tier": "triage", "prompt_tokens": 1000, "completion_tokens": 0, "latency_ms": 300},
+            {"model": "big", "tier": "full", "prompt_tokens": 1000, "completion_tokens": 0, "latency_ms": 900},
+            {"model": "big", "tier": "full", "cache_hit": True, "latency_ms": 1},
+        ]
+        rows = {r["key"]: r for r in aggregate(records, prices=_PRICES, by="tier")}
+        self.assertEqual(rows["triage"]["cost_usd"], 0.002)
+        self.assertEqual((rows["full"]["cost_usd"], rows["full"]["cache_hits"]), (0.01, 1))
+        self.assertEqual(rows["full"]["latency_ms_p95"], 900)
+        with self.assertRaises(ValueError):
+            aggregate(records, prices=_PRICES, by="color")
+
+    def test_run_log_history_and_price_file(self) -> None:
+        block = {
+            "povs": [
+                {"calls": [{"model": "small", "pov": "a", "prompt_tokens": 10, "cache_key": "x", "latency_ms": 5}]},
+                {"calls": [{"model": "small", "pov": "b", "prompt_tokens": 20, "latency_ms": 5}]},
+            ]
+        }
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            summary = record_run(block, run_dir=root / "run-1", run_id="run-1", history_dir=root / "hist", prices=_PRICES)
+            self.assertEqual((summary["calls"], summary["prompt_tokens"]), (2, 30))
+            logged = [json.loads(line) for line in (root / "run-1" / "llm-calls.jsonl").read_text().splitlines()]
+            self.assertEqual([r["pov"] for r in logged], ["a", "b"])
+            self.assertNotIn("cache_key", logged[0])
+
+            (root / "hist" / "2020-01.jsonl").write_text(json.dumps({"at": "2020-01-05T00:00:00", "model": "x"}) + "\n")
+            self.assertEqual(len(load_history(root / "hist")), 3)
+            self.assertEqual(len(load_history(root / "hist", until="2020-02")), 1)
+            self.assertEqual(len(load_history(root / "hist", since="2021")), 2)
+
+            (root / "prices.json").write_text(json.dumps({"x": {"input": 1, "output": 1}}))
+            self.assertIn("x", load_prices(root / "prices.json"))
+            (root / "prices.json").write_text(json.dumps({"x": {"input": 1}}))
+            with self.assertRaises(ValueError):
+                load_prices(root / "prices.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
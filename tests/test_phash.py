@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from uxdrift.phash import PhashIndex, hamming
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional extras
+    np = None
+    Image = None
+
+
+class TestPhashIndex(unittest.TestCase):
+    def test_find_similar_and_last_different(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "index.jsonl"
+            idx = PhashIndex.load(path)
+            idx.append({"key": "00-root", "run": "r1", "phash": f"{0xFFFF0000FFFF0000:016x}"})
+            idx.append({"key": "00-root", "run": "r2", "phash": f"{0x0000000000000000:016x}"})
+            idx.append({"key": "00-root", "run": "r3", "phash": f"{0x0000000000000003:016x}"})
+
+            reloaded = PhashIndex.load(path)
+            self.assertEqual(len(reloaded.history("00-root")), 3)
+
+            near = reloaded.find_similar(0x1, max_distance=2)
+            self.assertEqual([e["run"] for _, e in near], ["r2", "r3"])
+
+            last = reloaded.last_different("00-root", 0x3)
+            assert last is not None
+            self.assertEqual(last["run"], "r1")
+
+    def test_hamming(self) -> None:
+        self.assertEqual(hamming(0b1011, 0b0001), 2)
+
+
+@unittest.skipIf(np is None, "requires uxdrift[visual]")
+class TestPerceptualHashes(unittest.TestCase):
+    def test_hashes_stable_under_small_noise(self) -> None:
+        from uxdrift.phash import dhash, phash
+
+        with tempfile.TemporaryDirectory() as td:
+            grad = np.tile(np.linspace(0, 255, 128), (96, 1))
+            img = np.stack([grad, grad.T[:96, :96].repeat(2, axis=1)[:, :128], grad], axis=2)
+            noisy = img.copy()
+            noisy[5, 5] = 0
+            flipped = img[:, ::-1]
+            for name, arr in (("a", img), ("b", noisy), ("c", flipped)):
+                Image.fromarray(arr.astype("uint8")).save(Path(td) / f"{name}.png")
+
+            a, b, c = (Path(td) / f"{n}.png" for n in "abc")
+            self.assertLessEqual(hamming(phash(a), phash(b)), 4)
+            self.assertLessEqual(hamming(dhash(a), dhash(b)), 4)
+            self.assertGreater(hamming(phash(a), phash(c)), 4)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import unittest
+
+from uxdrift.steps import StepPlanError, compile_flows, compile_steps
+
+
+class TestSteps(unittest.TestCase):
+    def test_legacy_array_compiles(self) -> None:
+        raw = json.loads((Path(__file__).parent.parent / "examples" / "paia-os-steps.json").read_text(encoding="utf-8"))
+        plan = compile_steps(raw)
+        steps = plan.steps_for("/anything")
+        self.assertEqual(len(steps), len(raw))
+        click = next(s for s in steps if s.action == "click" and s.locator and s.locator.kind == "role")
+        self.assertEqual((click.locator.value, click.locator.name), ("tab", "Workboard"))
+
+    def test_scoped_steps_by_route_pattern(self) -> None:
+        plan = compile_steps(
+            {
+                "steps": [{"action": "sleep", "ms": 10}],
+                "pages": {
+                    "/checkout": [{"action": "click", "selector": "#pay"}],
+                    "/admin/*": [{"action": "screenshot", "name": "admin"}],
+                },
+            }
+        )
+        self.assertEqual([s.action for s in plan.steps_for("/checkout")], ["sleep", "click"])
+        self.assertEqual([s.action for s in plan.steps_for("/admin/users")], ["sleep", "screenshot"])
+        self.assertEqual([s.action for s in plan.steps_for("/")], ["sleep"])
+
+        plan.check_pages(["/", "/checkout", "/admin/users"])
+        with self.assertRaises(StepPlanError):
+            plan.check_pages(["/", "/checkout"])
+
+    def test_reports_every_problem(self) -> None:
+        with self.assertRaises(StepPlanError) as ctx:
+            compile_steps(
+                [
+                    {"action": "click"},
+                    {"action": "clik", "selector": "#a"},
+                    {"action": "wait_for", "selector": "#b", "state": "shown"},
+                    {"action": "sleep", "ms": "soon"},
+                ]
+            )
+        problems = ctx.exception.problems
+        self.assertEqual(len(problems), 4)
+        self.assertTrue(problems[0].startswith("steps[0]"))
+        self.assertIn("unknown action 'clik'", problems[1])
+
+    def test_params_bind_into_one_flow_per_set(self) -> None:
+        flows = compile_flows(
+            {
+                "params": {"shoes": {"q": "red shoes"}, "hats": {"q": "hats"}},
+                "steps": [
+                    {"action": "fill", "selector": "input[name=q]", "value": "{{q}}"},
+                    {"action": "wait_for", "text": "Results for {{ q }}"},
+                ],
+            }
+        )
+        self.assertEqual([f.label for f in flows], ["shoes", "hats"])
+        fill, wait = flows[0].plan.common
+        self.assertEqual(fill.value, "red shoes")
+        assert wait.locator is not None
+        self.assertEqual(wait.locator.value, "Results for red shoes")
+
+        with self.assertRaises(StepPlanError) as ctx:
+            compile_flows({"params": [{"x": "1"}], "steps": [{"action": "fill", "selector": "#q", "value": "{{q}}"}]})
+        self.assertIn("no value for `{{q}}`", ctx.exception.problems[0])
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from uxdrift.playwright_runner import PageEvidence
+from uxdrift.report import summarize_deterministic_findings
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional extras
+    np = None
+    Image = None
+
+
+def _page(artifacts: dict) -> PageEvidence:
+    return PageEvidence(
+        name="root",
+        url="http://example.com/",
+        artifacts=artifacts,
+        timing_ms={"navigation": 1},
+        console={"messages": [], "counts": {"error": 0, "warning": 0}},
+        network={"request_failures": [], "http_errors": [], "counts": {"request_failures": 0, "http_errors": 0}},
+        page_errors=[],
+        extracted={"title": "", "text": ""},
+    )
+
+
+@unittest.skipIf(np is None, "requires uxdrift[visual]")
+class TestVisualDiff(unittest.TestCase):
+    def _write(self, path: Path, arr) -> None:
+        Image.fromarray(arr.astype("uint8")).save(path)
+
+    def test_diff_boxes_and_overlay(self) -> None:
+        from uxdrift.visual import diff_screenshots
+
+        with tempfile.TemporaryDirectory() as td:
+            base = np.full((64, 64, 3), 255)
+            cur = base.copy()
+            cur[10:20, 30:40] = 0
+            cur[2, 2] = 250  # within tolerance
+            self._write(Path(td) / "b.png", base)
+            self._write(Path(td) / "c.png", cur)
+
+            res = diff_screenshots(Path(td) / "c.png", Path(td) / "b.png", block=8, overlay_path=Path(td) / "d.png")
+
+            self.assertEqual(res["changed_pixels"], 100)
+            self.assertEqual(res["boxes"], [[24, 8, 16, 16]])
+            self.assertTrue((Path(td) / "d.png").exists())
+
+    def test_compare_to_baseline_marks_changed(self) -> None:
+        from uxdrift.visual import compare_to_baseline
+
+        with tempfile.TemporaryDirectory() as td:
+            run_dir = Path(td) / "run"
+            base_dir = Path(td) / "base"
+            run_dir.mkdir()
+            base_dir.mkdir()
+            self._write(base_dir / "00-root.png", np.zeros((32, 32, 3)))
+            self._write(run_dir / "00-root.png", np.full((40, 32, 3), 255))
+            page = _page({"screenshot": str(run_dir / "00-root.png")})
+
+            compare_to_baseline([page], baseline_dir=base_dir)
+
+            diff = page.artifacts["visual_diff"][0]
+            self.assertTrue(diff["changed"])
+            self.assertEqual(diff["diff_ratio"], 1.0)
+
+
+class TestVisualFindings(unittest.TestCase):
+    def test_changed_diff_becomes_visual_finding(self) -> None:
+        page = _page(
+            {
+                "screenshot": "/tmp/x.png",
+                "visual_diff": [
+                    {"screenshot": "/tmp/x.png", "baseline": "/b/x.png", "diff_ratio": 0.2, "changed": True},
+                    {"screenshot": "/tmp/y.png", "baseline": "/b/y.png", "diff_ratio": 0.0, "changed": False},
+                ],
+            }
+        )
+        findings = summarize_deterministic_findings([page])
+        self.assertEqual(len(findings), 1)
+        self.assertEqual(findings[0]["category"], "visual")
+        self.assertIn("20.0%", findings[0]["summary"])
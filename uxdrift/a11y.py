@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import re
+
+
+# Playwright ARIA snapshot lines look like:
+#   - heading "Checkout" [level=1]
+#   - button "Pay now" [disabled]:
+#   - /url: /checkout
+#   - text: Some paragraph
+_LINE_RE = re.compile(r"^(?P<indent>\s*)-\s+(?P<body>.*?)\s*$")
+_NODE_RE = re.compile(r'^(?P<role>[A-Za-z/][\w/-]*)(?:\s+"(?P<name>(?:[^"\\]|\\.)*)")?(?P<rest>.*)$')
+
+# Container roles that carry no name are mostly noise for a UX reviewer.
+_TRANSPARENT_ROLES = {"generic", "group", "none", "presentation"}
+
+
+def _truncate(s: str, max_chars: int) -> str:
+    if len(s) <= max_chars:
+        return s
+    return s[: max_chars - 1] + "…"
+
+
+def _parse(snapshot: str) -> list[tuple[int, str]]:
+    nodes: list[tuple[int, str]] = []
+    for raw in snapshot.splitlines():
+        m = _LINE_RE.match(raw)
+        if not m:
+            continue
+        depth = len(m.group("indent").expandtabs(2)) // 2
+        nodes.append((depth, m.group("body")))
+    return nodes
+
+
+def _compact_node(body: str, *, max_name_chars: int) -> str | None:
+    body = body.rstrip(":").rstrip()
+    if body.startswith("/"):
+        # Properties such as `/url: ...` are rarely useful and cost tokens.
+        return None
+
+    m = _NODE_RE.match(body)
+    if not m:
+        return _truncate(body, max_name_chars)
+
+    role = m.group("role")
+    name = m.group("name")
+    rest = (m.group("rest") or "").strip()
+
+    # `text: foo` / `listitem: foo` inline content.
+    inline = ""
+    if rest.startswith(":"):
+        inline = rest[1:].strip()
+        rest = ""
+    states = " ".join(re.findall(r"\[[^\]]+\]", rest))
+
+    parts = [role]
+    if name:
+        parts.append(f'"{_truncate(name, max_name_chars)}"')
+    if states:
+        parts.append(states)
+    if inline:
+        parts.append(_truncate(inline, max_name_chars))
+    return " ".join(parts)
+
+
+def compact_aria_snapshot(
+    snapshot: str,
+    *,
+    max_depth: int = 8,
+    max_siblings: int = 12,
+    max_name_chars: int = 80,
+    max_chars: int = 6_000,
+) -> str:
+    """
+    Prune a Playwright ARIA snapshot into a compact outline for LLM evidence.
+
+    - One node per line; one leading space per depth level
+    - `role "name" [states] inline-text` (property lines such as `/url:` dropped)
+    - Unnamed generic/group containers are collapsed into their children
+    - Nodes deeper than `max_depth` are dropped; long sibling runs are elided
+    """
+    out: list[str] = []
+    # Depth remapping for collapsed containers: original depth -> emitted depth.
+    collapsed_at: list[int] = []
+    sibling_counts: dict[tuple[int, int], int] = {}
+    elided: dict[tuple[int, int], int] = {}
+    parent_index: list[int] = []  # index in `out` of the latest node at each emitted depth
+    skip_below: int | None = None  # original depth of an elided node whose subtree is skipped
+
+    for depth, body in _parse(snapshot):
+        if skip_below is not None:
+            if depth > skip_below:
+                continue
+            skip_below = None
+        while collapsed_at and collapsed_at[-1] >= depth:
+            collapsed_at.pop()
+
+        compact = _compact_node(body, max_name_chars=max_name_chars)
+        if compact is None:
+            continue
+        role = compact.split(" ", 1)[0]
+        if role in _TRANSPARENT_ROLES and " " not in compact:
+            collapsed_at.append(depth)
+            continue
+
+        eff = depth - len(collapsed_at)
+        if eff > max_depth:
+            skip_below = depth
+            continue
+
+        del parent_index[eff:]
+        parent = parent_index[-1] if parent_index else -1
+        key = (parent, eff)
+        seen = sibling_counts.get(key, 0)
+        sibling_counts[key] = seen + 1
+        if seen >= max_siblings:
+            elided[key] = elided.get(key, 0) + 1
+            skip_below = depth
+            continue
+
+        parent_index.append(len(out))
+        out.append(" " * eff + compact)
+
+    if elided:
+        # Insert "… +N more" markers after the last emitted child of each elided run.
+        markers: dict[int, list[str]] = {}
+        for (parent, eff), n in elided.items():
+            last = parent
+            for i in range(parent + 1, len(out)):
+                line = out[i]
+                d = len(line) - len(line.lstrip(" "))
+                if d < eff:
+                    break
+                last = i
+            markers.setdefault(last, []).append(" " * eff + f"… +{n} more")
+        merged: list[str] = []
+        if -1 in markers:
+            merged.extend(markers.pop(-1))
+        for i, line in enumerate(out):
+            merged.append(line)
+            merged.extend(markers.get(i, []))
+        out = merged
+
+    return _truncate("\n".join(out), max_chars)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import os
+from pathlib import Path
+import time
+
+from uxdrift.steps import Step
+
+
+class SessionExpiredError(RuntimeError):
+    """Raised when the configured logged-out selector shows up on a captured page."""
+
+
+@dataclass(frozen=True)
+class AuthConfig:
+    """
+    Authenticated-session settings for a capture run.
+
+    - `storage_state`: Playwright storage-state JSON (cookies + localStorage) reused by every context
+    - `login_steps`: optional flow that (re)creates `storage_state`; without it the file is used as-is
+    - `ttl_s`: max age of a cached state before logging in again (<= 0 means never expire)
+    - `logged_out_selector`: if visible after navigation, the session is treated as expired
+    """
+
+    storage_state: Path
+    login_steps: list[Step] = field(default_factory=list)
+    login_page: str = "/"
+    ttl_s: int = 3_600
+    logged_out_selector: str | None = None
+
+
+def default_storage_state_path(state_dir: Path, base_url: str) -> Path:
+    digest = hashlib.sha256(base_url.rstrip("/").encode("utf-8")).hexdigest()[:12]
+    return state_dir / "auth" / f"storage-state-{digest}.json"
+
+
+def storage_state_fresh(path: Path, ttl_s: int) -> bool:
+    if not path.exists():
+        return False
+    if ttl_s <= 0:
+        return True
+    return (time.time() - path.stat().st_mtime) < ttl_s
+
+
+def protect_file(path: Path) -> None:
+    # Storage state carries session cookies; keep it private to the current user.
+    try:
+        os.chmod(path, 0o600)
+    except OSError:
+        pass
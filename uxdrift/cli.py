@@ -6,14 +6,43 @@ import os
 from pathlib import Path
 import subprocess
 import sys
+import threading
 import time
 from typing import Any, Literal
+import uuid
 
+from uxdrift.auth import AuthConfig, default_storage_state_path
 from uxdrift.env import load_default_dotenv
+from uxdrift.errors_index import index_errors
+from uxdrift.findings_index import FindingsIndex, record_issue, track_findings
 from uxdrift.github import create_issue
-from uxdrift.llm.critique import critique as llm_critique
+from uxdrift.llm.bench import run_benchmark
+from uxdrift.llm.batch import (
+    TERMINAL_STATUSES,
+    batch_results,
+    batch_summary,
+    submit_batch,
+    wait_for_batch,
+    write_batch_file,
+)
+from uxdrift.llm.critique import (
+    batch_requests,
+    critique as llm_critique,
+    critique_from_batch,
+    critique_povs,
+    prepare_inputs,
+)
+from uxdrift.llm.cache import CACHE_MODES, LlmCache
+from uxdrift.llm.images import ImageOptions, evict_image_cache
+from uxdrift.llm.mockserver import MockLlmServer, MockOptions
+from uxdrift.llm.openai_compat import ClientSettings, configure_client
+from uxdrift.llm.ratelimit import RateLimiter, RetryPolicy
+from uxdrift.llm.telemetry import GROUP_BY, aggregate, load_history, load_prices, record_run
+from uxdrift.phash import PhashIndex, index_screenshots
 from uxdrift.playwright_runner import capture_pages
 from uxdrift.report import build_report, render_markdown, write_json, write_text
+from uxdrift.steps import Flow, StepPlan, StepPlanError, compile_flows, compile_steps
+from uxdrift.visual import compare_to_baseline
 from uxdrift.workgraph import choose_task_id, find_workgraph_dir, load_workgraph
 from uxdrift.wg_spec import load_uxdrift_spec_from_description
 
@@ -27,6 +56,33 @@ class ExitCode:
 
 _SEV_ORDER: dict[str, int] = {"info": 0, "low": 1, "medium": 2, "high": 3, "blocker": 4}
 
+# Upper bound per sample list; the token-budget planner decides how many are actually sent.
+_MAX_LLM_SAMPLES = 50
+# Run meta the LLM sees; the rest (timings, baseline/index paths, auth state) varies per run.
+_LLM_META_KEYS = ("base_url", "pages", "browser", "wait_until", "aria_snapshot", "failed_pages", "flows")
+
+
+def _add_mock_llm_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--latency-ms", type=float, default=200.0, help="Mock delay before responding (default: 200)")
+    p.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random mock delay (default: 0)")
+    p.add_argument("--chunk-delay-ms", type=float, default=5.0, help="Mock delay between streamed chunks")
+    p.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of mock requests answered 429")
+    p.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on mock 429s (default: 1)")
+    p.add_argument("--responses", help="JSON file of canned mock response(s): an object, string, or list of them")
+    p.add_argument("--seed", type=int, help="Random seed for mock jitter/throttling")
+
+
+def _mock_options(args: argparse.Namespace) -> MockOptions:
+    return MockOptions(
+        latency_ms=float(args.latency_ms),
+        jitter_ms=float(args.jitter_ms),
+        chunk_delay_ms=float(args.chunk_delay_ms),
+        throttle_rate=float(args.throttle_rate),
+        retry_after_s=float(args.retry_after),
+        responses=Path(args.responses) if args.responses else None,
+        seed=args.seed,
+    )
+
 
 def _parse_args(argv: list[str]) -> argparse.Namespace:
     p = argparse.ArgumentParser(prog="uxdrift", add_help=True)
@@ -41,15 +97,148 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
     run.add_argument("--channel", help='Browser channel (e.g. "chrome"). If unavailable, falls back.')
     run.add_argument("--nav-timeout-ms", type=int, default=15_000)
     run.add_argument("--wait-until", default="domcontentloaded", choices=["load", "domcontentloaded", "networkidle"])
+    run.add_argument(
+        "--page-retries", type=int, default=1, help="Retries per page after a capture failure (default: 1)"
+    )
+    run.add_argument(
+        "--retry-backoff-ms", type=int, default=1_000, help="Initial backoff between page retries; doubles each retry"
+    )
     run.add_argument("--steps", help="JSON file with Playwright interaction steps to run after load")
+    run.add_argument(
+        "--flow-concurrency",
+        type=int,
+        default=4,
+        help="Parametrized flows (steps `params`) to run at once, each in its own browser context (default: 4)",
+    )
+    run.add_argument("--login-steps", help="JSON steps file for a login flow run once per session")
+    run.add_argument("--login-page", help="Path the login flow starts from (default: /)")
+    run.add_argument(
+        "--storage-state",
+        help="Playwright storage-state file to start every context from (default with --login-steps: .uxdrift/auth/)",
+    )
+    run.add_argument(
+        "--storage-state-ttl-s",
+        type=int,
+        help="Re-run the login flow when the cached storage state is older than this (default: 3600; <=0 never)",
+    )
+    run.add_argument(
+        "--logged-out-selector",
+        help="Selector that indicates a logged-out page; triggers one re-login + retry for that page",
+    )
+    run.add_argument(
+        "--aria-snapshot",
+        action="store_true",
+        help="Capture a compact accessibility-tree outline per page (preferred over body text for the LLM)",
+    )
+    run.add_argument("--aria-max-depth", type=int, default=8, help="Max accessibility-tree depth to keep (default: 8)")
+    run.add_argument("--baseline", help="Previous run dir to visually diff screenshots against (needs uxdrift[visual])")
+    run.add_argument(
+        "--diff-tolerance", type=int, default=16, help="Per-channel pixel tolerance for --baseline (0-255, default: 16)"
+    )
+    run.add_argument(
+        "--diff-threshold",
+        type=float,
+        default=0.01,
+        help="Changed-pixel ratio above which a screenshot becomes a visual finding (default: 0.01)",
+    )
+    run.add_argument(
+        "--phash",
+        action="store_true",
+        help="Record perceptual hashes of screenshots in the persistent history index (needs uxdrift[visual])",
+    )
+    run.add_argument(
+        "--phash-distance", type=int, default=4, help="Max Hamming distance (of 64 bits) for 'visually the same'"
+    )
+    run.add_argument(
+        "--error-index",
+        action="store_true",
+        help="Fingerprint console/page/HTTP errors across runs; only new ones raise deterministic severity",
+    )
     run.add_argument("--goal", action="append", default=[], help="Goal text (repeatable)")
     run.add_argument("--goals-file", action="append", default=[], help="File with goals/spec (repeatable)")
     run.add_argument("--non-goal", action="append", default=[], help="Non-goal text (repeatable)")
-    run.add_argument("--pov", help="Reasoning POV pack (e.g. doet-norman-v1)")
+    run.add_argument(
+        "--pov",
+        action="append",
+        default=[],
+        help="Reasoning POV pack (e.g. doet-norman-v1); repeat to critique one capture under several POVs",
+    )
     run.add_argument("--pov-focus", action="append", default=[], help="POV principle id to emphasize (repeatable)")
     run.add_argument("--llm", action="store_true", help="Enable LLM critique (OpenAI-compatible)")
     run.add_argument("--llm-base-url", default=os.environ.get("UXDRIFT_LLM_BASE_URL", "https://api.openai.com/v1"))
     run.add_argument("--llm-model", default=os.environ.get("UXDRIFT_LLM_MODEL", "gpt-4o-mini"))
+    run.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=4,
+        help="Pages critiqued at once; each page gets its own call, then findings are merged (default: 4)",
+    )
+    run.add_argument(
+        "--llm-max-connections", type=int, default=10, help="Pooled keep-alive connections to the LLM endpoint"
+    )
+    run.add_argument("--llm-http2", action="store_true", help="Use HTTP/2 to the LLM endpoint (needs httpx[http2])")
+    run.add_argument(
+        "--llm-cache",
+        default="readwrite",
+        choices=list(CACHE_MODES),
+        help="On-disk cache of LLM responses keyed on the exact request (default: readwrite)",
+    )
+    run.add_argument(
+        "--llm-cache-max-mb", type=int, default=200, help="LRU size cap (MB) per LLM cache, image tiles included"
+    )
+    run.add_argument(
+        "--llm-page-cache",
+        default="readwrite",
+        choices=list(CACHE_MODES),
+        help="Reuse per-page critiques while a page's evidence fingerprint is unchanged (default: readwrite)",
+    )
+    run.add_argument(
+        "--llm-cache-max-age-days", type=float, default=30, help="Cached responses older than this are refetched"
+    )
+    run.add_argument(
+        "--llm-image-format", default="jpeg", choices=["jpeg", "webp", "png"], help="Re-encode screenshots before upload"
+    )
+    run.add_argument("--llm-image-max-width", type=int, default=1024, help="Downscale screenshots to this width")
+    run.add_argument(
+        "--llm-image-max-tiles", type=int, default=4, help="Viewport-height tiles kept per tall screenshot (default: 4)"
+    )
+    run.add_argument(
+        "--llm-token-budget",
+        type=int,
+        default=48_000,
+        help="Estimated input tokens for evidence + images across all LLM calls; 0 disables trimming (default: 48000)",
+    )
+    run.add_argument(
+        "--llm-stream", action="store_true", help="Stream LLM responses and print each finding to stderr as it arrives"
+    )
+    run.add_argument("--llm-rpm", type=int, default=0, help="Max LLM requests per minute (0 = unlimited)")
+    run.add_argument("--llm-tpm", type=int, default=0, help="Max estimated LLM tokens per minute (0 = unlimited)")
+    run.add_argument(
+        "--llm-max-retries", type=int, default=3, help="Retries for 429/5xx/transport errors, with backoff (default: 3)"
+    )
+    run.add_argument(
+        "--llm-triage-model",
+        default=os.environ.get("UXDRIFT_LLM_TRIAGE_MODEL"),
+        help="Cheap model that screens each page first; --llm-model only runs on flagged/erroring pages",
+    )
+    run.add_argument(
+        "--llm-escalate-at",
+        default="medium",
+        choices=["blocker", "high", "medium", "low", "info"],
+        help="Lowest triage finding severity that escalates a page to --llm-model (default: medium)",
+    )
+    run.add_argument(
+        "--llm-batch",
+        action="store_true",
+        help="Submit critique requests as one batch job (cheaper, slow); finish later with `uxdrift collect`",
+    )
+    run.add_argument(
+        "--llm-batch-wait",
+        type=float,
+        default=0.0,
+        help="Seconds to poll for the batch to finish before writing a pending report (default: 0)",
+    )
+    run.add_argument("--llm-batch-poll", type=float, default=30.0, help="Batch status poll interval in seconds")
     run.add_argument("--github-repo", help="Target repo for follow-up issues (e.g. dbmcco/paia-os)")
     run.add_argument("--create-issues", action="store_true", help="Create GitHub issues for notable findings")
     run.add_argument(
@@ -59,6 +248,51 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         help="Minimum severity to create an issue (default: high)",
     )
 
+    collect = sub.add_parser("collect", help="Fold finished LLM batch results into a run's report")
+    collect.add_argument("run_dir", help="Run directory written by `uxdrift run --llm-batch`")
+    collect.add_argument("--wait", type=float, default=0.0, help="Seconds to poll for the batch to finish (default: 0)")
+    collect.add_argument("--poll", type=float, default=30.0, help="Poll interval in seconds")
+
+    mock = sub.add_parser("mock-llm", help="Serve a local stand-in OpenAI-compatible chat endpoint")
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8089)
+    _add_mock_llm_args(mock)
+
+    bench = sub.add_parser("bench-llm", help="Benchmark LLM critique throughput/latency (bundled mock by default)")
+    bench.add_argument("--base-url", help="Benchmark this endpoint instead of the bundled mock server")
+    bench.add_argument("--model", default="mock", help="Model name sent to the endpoint (default: mock)")
+    bench.add_argument("--pages", type=int, default=20, help="Synthetic pages per round (default: 20)")
+    bench.add_argument(
+        "--concurrency", type=int, action="append", default=[], help="Concurrency to test (repeatable; default: 1, 4, 8)"
+    )
+    bench.add_argument("--repeats", type=int, default=1, help="Rounds per concurrency (default: 1)")
+    bench.add_argument("--stream", action="store_true", help="Stream responses")
+    bench.add_argument("--cache", action="store_true", help="Use a fresh response cache per concurrency (see repeats)")
+    bench.add_argument("--screenshot", action="append", default=[], help="Screenshot to attach to pages (repeatable)")
+    bench.add_argument("--rpm", type=int, default=0, help="Client-side requests/min limit (default: off)")
+    bench.add_argument("--max-retries", type=int, default=3)
+    _add_mock_llm_args(bench)
+
+    stats = sub.add_parser("stats", help="LLM usage, latency and estimated cost across past runs")
+    stats.add_argument(
+        "--history", help="Telemetry history dir (default: .uxdrift/telemetry; wg check uses .workgraph/.uxdrift/telemetry)"
+    )
+    stats.add_argument("--since", help="Only calls at/after this ISO date or month (e.g. 2026-10 or 2026-10-01)")
+    stats.add_argument("--until", help="Only calls before this ISO date or month")
+    stats.add_argument("--by", choices=GROUP_BY, default="model", help="Group rows by (default: model)")
+    stats.add_argument(
+        "--prices",
+        help='Price table JSON in USD per 1M tokens, {"model": {"input": .., "output": ..}}, '
+        "on top of built-in list prices (default: .uxdrift/prices.json if present)",
+    )
+    stats.add_argument("--budget-usd", type=float, help="Exit 3 when the estimated cost exceeds this")
+    stats.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    ph = sub.add_parser("phash-history", help="Query the screenshot perceptual-hash index")
+    ph.add_argument("--key", required=True, help='Screenshot key (file stem, e.g. "00-root" or "00-root-home")')
+    ph.add_argument("--index", help="Index file (default: .uxdrift/phash-index.jsonl)")
+    ph.add_argument("--max-distance", type=int, default=4, help="Max Hamming distance for 'visually the same'")
+
     install = sub.add_parser("install-browsers", help="Install Playwright browsers (chromium)")
     install.add_argument("--with-deps", action="store_true", help="Install OS deps too (recommended on Linux CI)")
     install.add_argument("--browser", default="chromium", choices=["chromium", "firefox", "webkit"])
@@ -77,11 +311,78 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
     wg_check.add_argument("--channel", help='Browser channel (e.g. "chrome"). If unavailable, falls back.')
     wg_check.add_argument("--nav-timeout-ms", type=int, default=15_000)
     wg_check.add_argument("--wait-until", default="domcontentloaded", choices=["load", "domcontentloaded", "networkidle"])
+    wg_check.add_argument(
+        "--page-retries", type=int, default=1, help="Retries per page after a capture failure (default: 1)"
+    )
+    wg_check.add_argument(
+        "--retry-backoff-ms", type=int, default=1_000, help="Initial backoff between page retries; doubles each retry"
+    )
     wg_check.add_argument("--steps", help="JSON file with Playwright interaction steps (overrides task spec)")
+    wg_check.add_argument(
+        "--flow-concurrency",
+        type=int,
+        default=4,
+        help="Parametrized flows (steps `params`) to run at once, each in its own browser context (default: 4)",
+    )
+    wg_check.add_argument("--login-steps", help="JSON steps file for a login flow run once per session (overrides task spec)")
+    wg_check.add_argument("--login-page", help="Path the login flow starts from (default: /)")
+    wg_check.add_argument(
+        "--storage-state",
+        help="Playwright storage-state file to start every context from (default with --login-steps: .uxdrift/auth/)",
+    )
+    wg_check.add_argument(
+        "--storage-state-ttl-s",
+        type=int,
+        help="Re-run the login flow when the cached storage state is older than this (default: 3600; <=0 never)",
+    )
+    wg_check.add_argument(
+        "--logged-out-selector",
+        help="Selector that indicates a logged-out page; triggers one re-login + retry for that page",
+    )
+    wg_check.add_argument(
+        "--aria-snapshot",
+        action="store_true",
+        default=None,
+        help="Capture a compact accessibility-tree outline per page (overrides task spec if present)",
+    )
+    wg_check.add_argument(
+        "--aria-max-depth",
+        type=int,
+        default=None,
+        help="Max accessibility-tree depth to keep (overrides task spec if present; default: 8)",
+    )
+    wg_check.add_argument("--baseline", help="Previous run dir to visually diff screenshots against (needs uxdrift[visual])")
+    wg_check.add_argument(
+        "--diff-tolerance", type=int, default=16, help="Per-channel pixel tolerance for --baseline (0-255, default: 16)"
+    )
+    wg_check.add_argument(
+        "--diff-threshold",
+        type=float,
+        default=0.01,
+        help="Changed-pixel ratio above which a screenshot becomes a visual finding (default: 0.01)",
+    )
+    wg_check.add_argument(
+        "--phash",
+        action="store_true",
+        help="Record perceptual hashes of screenshots in the persistent history index (needs uxdrift[visual])",
+    )
+    wg_check.add_argument(
+        "--phash-distance", type=int, default=4, help="Max Hamming distance (of 64 bits) for 'visually the same'"
+    )
+    wg_check.add_argument(
+        "--error-index",
+        action="store_true",
+        help="Fingerprint console/page/HTTP errors across runs; only new ones raise deterministic severity",
+    )
     wg_check.add_argument("--goal", action="append", default=[], help="Goal text (repeatable)")
     wg_check.add_argument("--goals-file", action="append", default=[], help="File with goals/spec (repeatable)")
     wg_check.add_argument("--non-goal", action="append", default=[], help="Non-goal text (repeatable)")
-    wg_check.add_argument("--pov", help="Reasoning POV pack (overrides task spec if present)")
+    wg_check.add_argument(
+        "--pov",
+        action="append",
+        default=[],
+        help="Reasoning POV pack (overrides task spec if present); repeatable",
+    )
     wg_check.add_argument("--pov-focus", action="append", default=[], help="POV principle id to emphasize (repeatable)")
     wg_check.add_argument(
         "--llm",
@@ -91,6 +392,66 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
     )
     wg_check.add_argument("--llm-base-url", default=os.environ.get("UXDRIFT_LLM_BASE_URL", "https://api.openai.com/v1"))
     wg_check.add_argument("--llm-model", default=os.environ.get("UXDRIFT_LLM_MODEL", "gpt-4o-mini"))
+    wg_check.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=4,
+        help="Pages critiqued at once; each page gets its own call, then findings are merged (default: 4)",
+    )
+    wg_check.add_argument(
+        "--llm-max-connections", type=int, default=10, help="Pooled keep-alive connections to the LLM endpoint"
+    )
+    wg_check.add_argument("--llm-http2", action="store_true", help="Use HTTP/2 to the LLM endpoint (needs httpx[http2])")
+    wg_check.add_argument(
+        "--llm-cache",
+        default="readwrite",
+        choices=list(CACHE_MODES),
+        help="On-disk cache of LLM responses keyed on the exact request (default: readwrite)",
+    )
+    wg_check.add_argument(
+        "--llm-cache-max-mb", type=int, default=200, help="LRU size cap (MB) per LLM cache, image tiles included"
+    )
+    wg_check.add_argument(
+        "--llm-page-cache",
+        default="readwrite",
+        choices=list(CACHE_MODES),
+        help="Reuse per-page critiques while a page's evidence fingerprint is unchanged (default: readwrite)",
+    )
+    wg_check.add_argument(
+        "--llm-cache-max-age-days", type=float, default=30, help="Cached responses older than this are refetched"
+    )
+    wg_check.add_argument(
+        "--llm-image-format", default="jpeg", choices=["jpeg", "webp", "png"], help="Re-encode screenshots before upload"
+    )
+    wg_check.add_argument("--llm-image-max-width", type=int, default=1024, help="Downscale screenshots to this width")
+    wg_check.add_argument(
+        "--llm-image-max-tiles", type=int, default=4, help="Viewport-height tiles kept per tall screenshot (default: 4)"
+    )
+    wg_check.add_argument(
+        "--llm-token-budget",
+        type=int,
+        default=48_000,
+        help="Estimated input tokens for evidence + images across all LLM calls; 0 disables trimming (default: 48000)",
+    )
+    wg_check.add_argument(
+        "--llm-stream", action="store_true", help="Stream LLM responses and print each finding to stderr as it arrives"
+    )
+    wg_check.add_argument("--llm-rpm", type=int, default=0, help="Max LLM requests per minute (0 = unlimited)")
+    wg_check.add_argument("--llm-tpm", type=int, default=0, help="Max estimated LLM tokens per minute (0 = unlimited)")
+    wg_check.add_argument(
+        "--llm-max-retries", type=int, default=3, help="Retries for 429/5xx/transport errors, with backoff (default: 3)"
+    )
+    wg_check.add_argument(
+        "--llm-triage-model",
+        default=os.environ.get("UXDRIFT_LLM_TRIAGE_MODEL"),
+        help="Cheap model that screens each page first; --llm-model only runs on flagged/erroring pages",
+    )
+    wg_check.add_argument(
+        "--llm-escalate-at",
+        default="medium",
+        choices=["blocker", "high", "medium", "low", "info"],
+        help="Lowest triage finding severity that escalates a page to --llm-model (default: medium)",
+    )
     wg_check.add_argument("--write-log", action="store_true", help="Write a one-line summary to wg log")
     wg_check.add_argument("--create-followups", action="store_true", help="Create a deterministic ux follow-up task")
     wg_check.add_argument(
@@ -113,6 +474,12 @@ def _default_wg_out_dir(wg_dir: Path, task_id: str) -> Path:
     return wg_dir / ".uxdrift" / "runs" / ts / task_id
 
 
+def _new_run_id() -> str:
+    # Unique per invocation (unlike the out dir, which `--out` can reuse), so the
+    # phash/error/telemetry/findings indexes see every run as a separate run.
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
 def _read_text_file(path: Path) -> str:
     try:
         return path.read_text(encoding="utf-8").strip()
@@ -139,6 +506,74 @@ def _truncate(s: str, max_chars: int) -> str:
     return s[: max_chars - 1] + "…"
 
 
+def _screenshot_paths(ev_pages: list[Any]) -> list[Path]:
+    out: list[Path] = []
+    for p in ev_pages:
+        step_shots = p.artifacts.get("step_screenshots")
+        if isinstance(step_shots, list):
+            for s in step_shots:
+                if isinstance(s, str) and s:
+                    out.append(Path(s))
+        shot = p.artifacts.get("screenshot")
+        if isinstance(shot, str) and shot:
+            out.append(Path(shot))
+    return out
+
+
+def _llm_page_evidence(p: Any) -> dict[str, Any]:
+    shot = p.artifacts.get("screenshot")
+    page: dict[str, Any] = {
+        "name": p.name,
+        "url": p.url,
+        "console_counts": p.console.get("counts"),
+        "console_error_samples": [
+            _truncate(str(m.get("text") or ""), 400)
+            for m in (p.console.get("messages") or [])
+            if m.get("type") == "error"
+        ][:_MAX_LLM_SAMPLES],
+        "console_warning_samples": [
+            _truncate(str(m.get("text") or ""), 400)
+            for m in (p.console.get("messages") or [])
+            if m.get("type") == "warning"
+        ][:_MAX_LLM_SAMPLES],
+        "network_counts": p.network.get("counts"),
+        "http_error_samples": (p.network.get("http_errors") or [])[:_MAX_LLM_SAMPLES],
+        "request_failure_samples": (p.network.get("request_failures") or [])[:_MAX_LLM_SAMPLES],
+        "page_error_count": len(p.page_errors),
+        "page_error_samples": [_truncate(e, 400) for e in p.page_errors][:_MAX_LLM_SAMPLES],
+        "title": p.extracted.get("title"),
+        # File name only: the run dir changes every run and would defeat the LLM caches.
+        "screenshot": Path(shot).name if shot else None,
+    }
+    if p.capture_error:
+        page["capture_error"] = p.capture_error
+    # Prefer the compact accessibility outline over raw body text when captured.
+    aria = p.extracted.get("aria")
+    if aria:
+        page["aria"] = aria
+    else:
+        page["text"] = p.extracted.get("text")
+    return page
+
+
+def _llm_evidence(*, ev_pages: list[Any], run_meta: dict[str, Any]) -> dict[str, Any]:
+    """
+    Evidence for the LLM prompt. Timings, run-dir paths and other per-run values are
+    left out so an unchanged site produces the same request (and LLM cache key).
+    """
+    return {
+        "meta": {k: run_meta[k] for k in _LLM_META_KEYS if k in run_meta},
+        "deterministic_counts": {
+            "console_errors": sum(int(p.console.get("counts", {}).get("error", 0)) for p in ev_pages),
+            "console_warnings": sum(int(p.console.get("counts", {}).get("warning", 0)) for p in ev_pages),
+            "request_failures": sum(int(p.network.get("counts", {}).get("request_failures", 0)) for p in ev_pages),
+            "http_errors": sum(int(p.network.get("counts", {}).get("http_errors", 0)) for p in ev_pages),
+            "page_errors": sum(len(p.page_errors) for p in ev_pages),
+        },
+        "pages": [_llm_page_evidence(p) for p in ev_pages],
+    }
+
+
 def _install_browsers(args: argparse.Namespace) -> int:
     cmd = [sys.executable, "-m", "playwright", "install"]
     if args.with_deps:
@@ -148,11 +583,276 @@ def _install_browsers(args: argparse.Namespace) -> int:
     return ExitCode.ok
 
 
+def _load_step_plan(path: Path) -> StepPlan:
+    try:
+        return compile_steps(json.loads(path.read_text(encoding="utf-8")))
+    except StepPlanError as e:
+        raise StepPlanError([f"{path}: {p}" for p in e.problems]) from None
+
+
+def _load_flows(path: Path, pages: list[str]) -> list[Flow]:
+    try:
+        flows = compile_flows(json.loads(path.read_text(encoding="utf-8")))
+        for flow in flows:
+            flow.plan.check_pages(pages)
+    except StepPlanError as e:
+        raise StepPlanError([f"{path}: {p}" for p in e.problems]) from None
+    return flows
+
+
+def _project_path(project_dir: Path, value: Any) -> Path | None:
+    if not value:
+        return None
+    path = Path(str(value))
+    return path if path.is_absolute() else project_dir / path
+
+
+def _auth_config(
+    *,
+    base_url: str,
+    state_dir: Path,
+    login_steps: Path | None,
+    login_page: str | None,
+    storage_state: Path | None,
+    ttl_s: int | None,
+    logged_out_selector: str | None,
+) -> AuthConfig | None:
+    if login_steps is None and storage_state is None:
+        return None
+    return AuthConfig(
+        storage_state=storage_state or default_storage_state_path(state_dir, base_url),
+        login_steps=_load_step_plan(login_steps).steps_for(login_page or "/") if login_steps else [],
+        login_page=login_page or "/",
+        ttl_s=3_600 if ttl_s is None else int(ttl_s),
+        logged_out_selector=logged_out_selector or None,
+    )
+
+
+def _maybe_compare_to_baseline(*, args: argparse.Namespace, ev_pages: list[Any], run_meta: dict[str, Any]) -> None:
+    if not args.baseline:
+        return
+    baseline_dir = Path(args.baseline)
+    compare_to_baseline(
+        ev_pages,
+        baseline_dir=baseline_dir,
+        tolerance=int(args.diff_tolerance),
+        threshold=float(args.diff_threshold),
+    )
+    run_meta["baseline"] = {
+        "dir": str(baseline_dir),
+        "tolerance": int(args.diff_tolerance),
+        "threshold": float(args.diff_threshold),
+    }
+
+
+def _maybe_index_screenshots(
+    *, args: argparse.Namespace, ev_pages: list[Any], run_meta: dict[str, Any], state_dir: Path, run_id: str
+) -> None:
+    if not args.phash:
+        return
+    index_path = state_dir / "phash-index.jsonl"
+    index_screenshots(ev_pages, index_path=index_path, run_id=run_id, max_distance=int(args.phash_distance))
+    run_meta["phash_index"] = str(index_path)
+
+
+def _maybe_index_errors(
+    *, args: argparse.Namespace, ev_pages: list[Any], run_meta: dict[str, Any], state_dir: Path, run_id: str, scope: str
+) -> None:
+    if not args.error_index:
+        return
+    run_meta["error_index"] = index_errors(
+        ev_pages, index_path=state_dir / "error-index.jsonl", run_id=run_id, scope=scope
+    )
+
+
+def _llm_options(args: argparse.Namespace, *, state_dir: Path) -> dict[str, Any]:
+    """
+    Shared `llm_critique` keyword arguments for `run` and `wg check` (also configures
+    the HTTP pool and trims the image tile cache once per run).
+    """
+    configure_client(
+        ClientSettings(
+            max_connections=int(args.llm_max_connections),
+            max_keepalive_connections=int(args.llm_max_connections),
+            http2=bool(args.llm_http2),
+        )
+    )
+    cache = None
+    if args.llm_cache != "off":
+        cache = LlmCache(
+            root=state_dir / "cache" / "llm",
+            mode=str(args.llm_cache),
+            max_bytes=int(args.llm_cache_max_mb) * 1024 * 1024,
+            max_age_s=int(float(args.llm_cache_max_age_days) * 86_400),
+        )
+    page_cache = None
+    if args.llm_page_cache != "off":
+        page_cache = LlmCache(
+            root=state_dir / "cache" / "pages",
+            mode=str(args.llm_page_cache),
+            max_bytes=int(args.llm_cache_max_mb) * 1024 * 1024,
+            max_age_s=int(float(args.llm_cache_max_age_days) * 86_400),
+        )
+    image_cache_dir = state_dir / "cache" / "images"
+    evict_image_cache(
+        image_cache_dir,
+        max_bytes=int(args.llm_cache_max_mb) * 1024 * 1024,
+        max_age_s=int(float(args.llm_cache_max_age_days) * 86_400),
+    )
+    return {
+        "concurrency": int(args.llm_concurrency),
+        "cache": cache,
+        "page_cache": page_cache,
+        "image_options": _image_options(args),
+        "image_cache_dir": image_cache_dir,
+        "token_budget": int(args.llm_token_budget) or None,
+        "on_finding": _finding_printer() if args.llm_stream else None,
+        "limiter": RateLimiter(
+            requests_per_min=int(args.llm_rpm),
+            tokens_per_min=int(args.llm_tpm),
+            max_concurrency=int(args.llm_concurrency),
+        ),
+        "retry": RetryPolicy(max_retries=int(args.llm_max_retries)),
+        "triage_model": args.llm_triage_model or None,
+        "escalate_at": str(args.llm_escalate_at),
+    }
+
+
+def _llm_critique_povs(*, povs: list[str], pov_focus: list[str], **kw: Any) -> dict[str, Any]:
+    """One critique, or (with several POVs) one per POV over the same prepared inputs."""
+    if len(povs) > 1:
+        return critique_povs(povs=povs, pov_focus=pov_focus, **kw)
+    return llm_critique(pov=povs[0] if povs else None, pov_focus=pov_focus, **kw)
+
+
+def _pov_meta(povs: list[str], pov_focus: list[str], llm_block: dict[str, Any] | None) -> dict[str, Any] | None:
+    if llm_block is not None and llm_block.get("povs"):
+        resolved = [b.get("pov") for b in llm_block["povs"] if isinstance(b.get("pov"), dict)]
+        return {"name": ", ".join(str(r.get("name")) for r in resolved), "focus": pov_focus, "povs": resolved}
+    if llm_block is not None and isinstance(llm_block.get("pov"), dict) and llm_block["pov"]:
+        return llm_block["pov"]
+    if not povs:
+        return None
+    return {"name": ", ".join(povs), "focus": pov_focus}
+
+
+def _finding_printer() -> Any:
+    lock = threading.Lock()
+
+    def on_finding(f: dict[str, Any]) -> None:
+        pages = ", ".join(str(x) for x in f.get("pages") or [])
+        line = f"[{f.get('severity', 'unknown')}] {f.get('category', 'unknown')}: {f.get('summary', '')}"
+        with lock:
+            print(line + (f" ({pages})" if pages else ""), file=sys.stderr, flush=True)
+
+    return on_finding
+
+
+def _image_options(args: argparse.Namespace) -> ImageOptions:
+    width = int(args.llm_image_max_width)
+    # Tiles are roughly one desktop viewport tall at the scaled width.
+    return ImageOptions(
+        max_width=width,
+        tile_height=width,
+        max_tiles=int(args.llm_image_max_tiles),
+        format=str(args.llm_image_format),
+    )
+
+
+def _phash_history(args: argparse.Namespace) -> int:
+    project_dir = Path(__file__).resolve().parent.parent
+    index_path = Path(args.index) if args.index else project_dir / ".uxdrift" / "phash-index.jsonl"
+    idx = PhashIndex.load(index_path)
+    history = idx.history(str(args.key))
+    if not history:
+        print(json.dumps({"key": args.key, "latest": None, "last_different": None}, indent=2))
+        return ExitCode.ok
+    latest = history[-1]
+    last_diff = idx.last_different(str(args.key), int(latest["phash"], 16), max_distance=int(args.max_distance))
+    print(
+        json.dumps(
+            {"key": args.key, "runs": len(history), "latest": latest, "last_different": last_diff},
+            indent=2,
+        )
+    )
+    return ExitCode.ok
+
+
+def _record_llm_telemetry(llm_block: dict[str, Any] | None, *, out_dir: Path, state_dir: Path, run_id: str) -> None:
+    """Per-call records to the run dir and the local history; totals land in `llm.telemetry`."""
+    if llm_block is None:
+        return
+    summary = record_run(
+        llm_block,
+        run_dir=out_dir,
+        run_id=run_id,
+        history_dir=state_dir / "telemetry",
+        prices=load_prices(state_dir / "prices.json"),
+    )
+    if summary is not None:
+        llm_block["telemetry"] = summary
+
+
+def _track_llm_findings(llm_block: dict[str, Any] | None, *, state_dir: Path, run_id: str, scope: str) -> None:
+    """Mark LLM findings new/recurring against the cross-run findings index; summary lands in `llm.history`."""
+    if llm_block is None or not isinstance(llm_block.get("parsed"), dict):
+        return
+    llm_block["history"] = track_findings(
+        llm_block["parsed"].get("findings") or [],
+        index_path=state_dir / "findings-index.jsonl",
+        run_id=run_id,
+        scope=scope,
+        complete=not _llm_partly_failed(llm_block),
+    )
+
+
+def _llm_partly_failed(llm_block: dict[str, Any]) -> bool:
+    """True if any POV or per-page call of the critique failed (its findings are missing, not resolved)."""
+    blocks = [llm_block, *(b for b in llm_block.get("povs") or [] if isinstance(b, dict))]
+    for block in blocks:
+        if block.get("error"):
+            return True
+        if any(isinstance(p, dict) and p.get("error") for p in block.get("pages") or []):
+            return True
+    return False
+
+
+def _stats(args: argparse.Namespace) -> int:
+    project_dir = Path(__file__).resolve().parent.parent
+    state_dir = project_dir / ".uxdrift"
+    history = Path(args.history) if args.history else state_dir / "telemetry"
+    prices = load_prices(Path(args.prices) if args.prices else state_dir / "prices.json")
+    records = load_history(history, since=args.since, until=args.until)
+    rows = aggregate(records, prices=prices, by=str(args.by))
+    total = aggregate(records, prices=prices, by=None)
+    if args.json:
+        print(json.dumps({"by": args.by, "rows": rows, "total": total[0] if total else None}, indent=2))
+    else:
+        header = f"{args.by:<24} {'calls':>6} {'cached':>6} {'retry':>5} {'err':>4} {'prompt':>9} {'compl':>8} "
+        header += f"{'images':>6} {'p50 ms':>7} {'p95 ms':>7} {'cost $':>9}"
+        print(header)
+        for r in rows + [{**t, "key": "total"} for t in total]:
+            cost = f"{r['cost_usd']:.4f}" + ("*" if r["unpriced"] else "")
+            print(
+                f"{r['key'][:24]:<24} {r['calls']:>6} {r['cache_hits']:>6} {r['retries']:>5} {r['errors']:>4} "
+                f"{r['prompt_tokens']:>9} {r['completion_tokens']:>8} {r['images']:>6} "
+                f"{r['latency_ms_p50']:>7.0f} {r['latency_ms_p95']:>7.0f} {cost:>9}"
+            )
+        if any(r["unpriced"] for r in total):
+            print("* some calls have no price (unknown model or no usage); add them with --prices")
+    if args.budget_usd is not None and total and total[0]["cost_usd"] > float(args.budget_usd):
+        print(f"Estimated LLM cost ${total[0]['cost_usd']:.2f} exceeds budget ${args.budget_usd:.2f}", file=sys.stderr)
+        return ExitCode.findings
+    return ExitCode.ok
+
+
 def _sev_at_least(sev: str, threshold: str) -> bool:
     return _SEV_ORDER.get(str(sev), 0) >= _SEV_ORDER.get(str(threshold), 0)
 
 
-def _create_followup_issues(*, repo: str, threshold: str, report: dict[str, Any]) -> None:
+def _create_followup_issues(
+    *, repo: str, threshold: str, report: dict[str, Any], index_path: Path | None = None
+) -> None:
     run_meta = report.get("meta") or {}
     base_url = str(run_meta.get("base_url") or "")
     generated_at = str(report.get("generated_at") or "")
@@ -186,14 +886,17 @@ def _create_followup_issues(*, repo: str, threshold: str, report: dict[str, Any]
                 "summary": str(f.get("summary") or "finding"),
                 "evidence": f.get("evidence") or [],
                 "fix": str(f.get("fix") or ""),
+                "cluster": str((f.get("history") or {}).get("cluster") or ""),
             }
         )
 
-    # Best-effort dedupe by (severity, category, summary).
-    seen: set[tuple[str, str, str]] = set()
+    # LLM findings dedupe by near-duplicate cluster (also across runs, when the cluster
+    # was filed before); everything else by (severity, category, summary).
+    index = FindingsIndex.load(index_path) if index_path is not None else None
+    seen: set[Any] = set()
     for it in issues:
-        key = (it["severity"], it["category"], it["summary"])
-        if key in seen:
+        key = it.get("cluster") or (it["severity"], it["category"], it["summary"])
+        if key in seen or (index is not None and it.get("cluster") and index.has_issue(it["cluster"])):
             continue
         seen.add(key)
 
@@ -220,6 +923,8 @@ def _create_followup_issues(*, repo: str, threshold: str, report: dict[str, Any]
                 body_lines.append(f"- {ev}")
 
         create_issue(repo=repo, title=title, body="\n".join(body_lines) + "\n", labels=["uxdrift"])
+        if index_path is not None and it.get("cluster"):
+            record_issue(index_path, cluster_id=it["cluster"], repo=repo)
 
 
 def _run(args: argparse.Namespace) -> int:
@@ -230,13 +935,16 @@ def _run(args: argparse.Namespace) -> int:
     out_dir.mkdir(parents=True, exist_ok=True)
 
     pages = args.page or ["/"]
-    steps = None
-    if args.steps:
-        raw = Path(args.steps).read_text(encoding="utf-8")
-        parsed = json.loads(raw)
-        if not isinstance(parsed, list):
-            raise ValueError("--steps must be a JSON array")
-        steps = parsed
+    flows = _load_flows(Path(args.steps), pages) if args.steps else None
+    auth = _auth_config(
+        base_url=args.url,
+        state_dir=project_dir / ".uxdrift",
+        login_steps=Path(args.login_steps) if args.login_steps else None,
+        login_page=args.login_page,
+        storage_state=Path(args.storage_state) if args.storage_state else None,
+        ttl_s=args.storage_state_ttl_s,
+        logged_out_selector=args.logged_out_selector,
+    )
 
     ev_pages, run_meta = capture_pages(
         base_url=args.url,
@@ -247,85 +955,68 @@ def _run(args: argparse.Namespace) -> int:
         browser_channel=args.channel,
         nav_timeout_ms=int(args.nav_timeout_ms),
         wait_until=args.wait_until,
-        steps=steps,
+        flows=flows,
+        flow_concurrency=int(args.flow_concurrency),
+        aria_snapshot=bool(args.aria_snapshot),
+        aria_max_depth=int(args.aria_max_depth),
+        page_retries=int(args.page_retries),
+        retry_backoff_ms=int(args.retry_backoff_ms),
+        auth=auth,
+    )
+    run_id = _new_run_id()
+    run_meta["run_id"] = run_id
+    _maybe_compare_to_baseline(args=args, ev_pages=ev_pages, run_meta=run_meta)
+    _maybe_index_screenshots(
+        args=args,
+        ev_pages=ev_pages,
+        run_meta=run_meta,
+        state_dir=project_dir / ".uxdrift",
+        run_id=run_id,
+    )
+    _maybe_index_errors(
+        args=args,
+        ev_pages=ev_pages,
+        run_meta=run_meta,
+        state_dir=project_dir / ".uxdrift",
+        run_id=run_id,
+        scope=str(args.url),
     )
 
     goals = _collect_goals(args.goal, args.goals_file)
     non_goals = [g.strip() for g in (args.non_goal or []) if g.strip()]
-    pov_name = (str(args.pov).strip() if args.pov else None)
+    povs = list(dict.fromkeys(_collect_text_values(list(args.pov or []))))
     pov_focus = _collect_text_values(list(args.pov_focus or []))
-    pov_meta: dict[str, Any] | None = None
-    if pov_name:
-        pov_meta = {"name": pov_name, "focus": pov_focus}
 
     llm_block: dict[str, Any] | None = None
     if args.llm:
         api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("UXDRIFT_LLM_API_KEY")
         if not api_key:
             raise ValueError("LLM enabled but OPENAI_API_KEY (or UXDRIFT_LLM_API_KEY) is not set.")
-        screenshot_paths: list[Path] = []
-        for p in ev_pages:
-            step_shots = p.artifacts.get("step_screenshots")
-            if isinstance(step_shots, list):
-                for s in step_shots:
-                    if isinstance(s, str) and s:
-                        screenshot_paths.append(Path(s))
-            shot = p.artifacts.get("screenshot")
-            if isinstance(shot, str) and shot:
-                screenshot_paths.append(Path(shot))
-        evidence_for_llm = {
-            "meta": run_meta,
-            "deterministic_counts": {
-                "console_errors": sum(int(p.console.get("counts", {}).get("error", 0)) for p in ev_pages),
-                "console_warnings": sum(int(p.console.get("counts", {}).get("warning", 0)) for p in ev_pages),
-                "request_failures": sum(int(p.network.get("counts", {}).get("request_failures", 0)) for p in ev_pages),
-                "http_errors": sum(int(p.network.get("counts", {}).get("http_errors", 0)) for p in ev_pages),
-                "page_errors": sum(len(p.page_errors) for p in ev_pages),
-            },
-            "pages": [
-                {
-                    "name": p.name,
-                    "url": p.url,
-                    "timing_ms": p.timing_ms,
-                    "console_counts": p.console.get("counts"),
-                    "console_error_samples": [
-                        _truncate(str(m.get("text") or ""), 400)
-                        for m in (p.console.get("messages") or [])
-                        if m.get("type") == "error"
-                    ][:10],
-                    "console_warning_samples": [
-                        _truncate(str(m.get("text") or ""), 400)
-                        for m in (p.console.get("messages") or [])
-                        if m.get("type") == "warning"
-                    ][:10],
-                    "network_counts": p.network.get("counts"),
-                    "http_error_samples": (p.network.get("http_errors") or [])[:10],
-                    "request_failure_samples": (p.network.get("request_failures") or [])[:10],
-                    "page_error_count": len(p.page_errors),
-                    "page_error_samples": [_truncate(e, 400) for e in p.page_errors][:10],
-                    "title": p.extracted.get("title"),
-                    "text": p.extracted.get("text"),
-                    "performance_navigation": p.extracted.get("performance_navigation"),
-                    "screenshot": p.artifacts.get("screenshot"),
-                }
-                for p in ev_pages
-            ],
+        screenshot_paths = _screenshot_paths(ev_pages)
+        evidence_for_llm = _llm_evidence(ev_pages=ev_pages, run_meta=run_meta)
+        llm_kw: dict[str, Any] = {
+            "base_url": args.llm_base_url,
+            "api_key": api_key,
+            "model": args.llm_model,
+            "goals": goals,
+            "non_goals": non_goals,
+            "evidence": evidence_for_llm,
+            "screenshot_paths": screenshot_paths,
+            "povs": povs,
+            "pov_focus": pov_focus,
+            "page_screenshots": [_screenshot_paths([p]) for p in ev_pages],
+            **_llm_options(args, state_dir=project_dir / ".uxdrift"),
         }
-        llm_block = llm_critique(
-            base_url=args.llm_base_url,
-            api_key=api_key,
-            model=args.llm_model,
-            goals=goals,
-            non_goals=non_goals,
-            evidence=evidence_for_llm,
-            screenshot_paths=screenshot_paths,
-            pov=pov_name,
-            pov_focus=pov_focus,
-        )
-        resolved = llm_block.get("pov")
-        if isinstance(resolved, dict) and resolved:
-            pov_meta = resolved
+        if args.llm_batch:
+            llm_block = _submit_llm_batch(
+                out_dir=out_dir, wait_s=float(args.llm_batch_wait), poll_s=float(args.llm_batch_poll), **llm_kw
+            )
+        else:
+            llm_block = _llm_critique_povs(**llm_kw)
+    _record_llm_telemetry(llm_block, out_dir=out_dir, state_dir=project_dir / ".uxdrift", run_id=run_id)
+    _track_llm_findings(llm_block, state_dir=project_dir / ".uxdrift", run_id=run_id, scope=str(args.url))
 
+    pov_meta = _pov_meta(povs, pov_focus, llm_block)
     report = build_report(run_meta=run_meta, pages=ev_pages, goals=goals, non_goals=non_goals, llm_block=llm_block, pov=pov_meta)
 
     report_json = out_dir / "report.json"
@@ -336,11 +1027,20 @@ def _run(args: argparse.Namespace) -> int:
     if args.create_issues:
         if not args.github_repo:
             raise ValueError("--create-issues requires --github-repo <owner/repo>")
-        _create_followup_issues(repo=str(args.github_repo), threshold=str(args.issue_threshold), report=report)
+        _create_followup_issues(
+            repo=str(args.github_repo),
+            threshold=str(args.issue_threshold),
+            report=report,
+            index_path=project_dir / ".uxdrift" / "findings-index.jsonl",
+        )
+
+    return _report_exit_code(report)
 
+
+def _report_exit_code(report: dict[str, Any]) -> int:
     # Exit non-zero if we have deterministic high-ish findings, or LLM produced blockers/high.
     det = report.get("deterministic_findings") or []
-    if any(f.get("severity") in ("high", "medium") for f in det):
+    if any(f.get("severity") in ("blocker", "high", "medium") for f in det):
         return ExitCode.findings
 
     llm_parsed = (report.get("llm") or {}).get("parsed") or {}
@@ -350,6 +1050,149 @@ def _run(args: argparse.Namespace) -> int:
     return ExitCode.ok
 
 
+def _batch_block(manifest: dict[str, Any], batch: dict[str, Any], *, api_key: str) -> dict[str, Any]:
+    """The report's `llm` block for a submitted batch: pending, or folded results once it has output."""
+    base_url = str(manifest["base"]["base_url"])
+    summary = batch_summary(batch)
+    if batch.get("status") not in TERMINAL_STATUSES:
+        return {**manifest["base"], **manifest.get("shared", {}), "strategy": "batch", "pending": True, "batch": summary}
+    if not batch.get("output_file_id") and not batch.get("error_file_id"):
+        raise RuntimeError(f"LLM batch {batch.get('id')} ended with status {batch.get('status')} and no output")
+    results = batch_results(base_url=base_url, api_key=api_key, batch=batch)
+    return {**critique_from_batch(manifest, results), "batch": summary}
+
+
+def _submit_llm_batch(
+    *,
+    out_dir: Path,
+    wait_s: float,
+    poll_s: float,
+    base_url: str,
+    api_key: str,
+    model: str,
+    goals: list[str],
+    non_goals: list[str],
+    evidence: dict[str, Any],
+    screenshot_paths: list[Path],
+    povs: list[str],
+    pov_focus: list[str],
+    page_screenshots: list[list[Path]],
+    **opts: Any,
+) -> dict[str, Any]:
+    """
+    Write every critique request to `llm-batch.jsonl`, submit it, and record a manifest in
+    `llm-batch.json` for `uxdrift collect`. Streaming, caching, rate limits and the triage
+    cascade apply to interactive calls only and are ignored here.
+    """
+    inputs = prepare_inputs(
+        evidence=evidence,
+        screenshot_paths=screenshot_paths,
+        page_screenshots=page_screenshots,
+        image_options=opts.get("image_options"),
+        image_cache_dir=opts.get("image_cache_dir"),
+        token_budget=opts.get("token_budget"),
+        concurrency=int(opts.get("concurrency") or 4),
+    )
+    lines, manifest = batch_requests(
+        inputs=inputs,
+        base_url=base_url,
+        model=model,
+        goals=goals,
+        non_goals=non_goals,
+        povs=povs,
+        pov_focus=pov_focus,
+    )
+    input_path = out_dir / "llm-batch.jsonl"
+    manifest["input_bytes"] = write_batch_file(input_path, lines)
+    batch = submit_batch(
+        base_url=base_url, api_key=api_key, input_path=input_path, metadata={"uxdrift_run": out_dir.name}
+    )
+    manifest["batch_id"] = batch["id"]
+    write_json(out_dir / "llm-batch.json", manifest)
+    print(f"Submitted LLM batch {batch['id']} ({len(lines)} request(s)).", file=sys.stderr)
+    if wait_s > 0:
+        batch = wait_for_batch(
+            base_url=base_url, api_key=api_key, batch_id=str(batch["id"]), timeout_s=wait_s, poll_s=poll_s
+        )
+    return _batch_block(manifest, batch, api_key=api_key)
+
+
+def _mock_llm(args: argparse.Namespace) -> int:
+    server = MockLlmServer(_mock_options(args), host=str(args.host), port=int(args.port))
+    print(f"Mock LLM listening on {server.base_url} (Ctrl-C to stop)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.stop()
+    return ExitCode.ok
+
+
+def _bench_llm(args: argparse.Namespace) -> int:
+    kw: dict[str, Any] = {
+        "model": str(args.model),
+        "pages": int(args.pages),
+        "concurrencies": [int(c) for c in args.concurrency] or [1, 4, 8],
+        "repeats": int(args.repeats),
+        "stream": bool(args.stream),
+        "cache": bool(args.cache),
+        "screenshots": [Path(p) for p in args.screenshot],
+        "rpm": int(args.rpm),
+        "max_retries": int(args.max_retries),
+    }
+    if args.base_url:
+        api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("UXDRIFT_LLM_API_KEY")
+        if not api_key:
+            raise ValueError("--base-url needs OPENAI_API_KEY (or UXDRIFT_LLM_API_KEY) to be set.")
+        result = run_benchmark(base_url=str(args.base_url), api_key=api_key, **kw)
+    else:
+        with MockLlmServer(_mock_options(args)) as server:
+            result = run_benchmark(base_url=server.base_url, api_key="mock", **kw)
+            result["mock"] = server.stats()
+    print(json.dumps(result, indent=2))
+    return ExitCode.ok
+
+
+def _collect(args: argparse.Namespace) -> int:
+    uxdrift_project_dir = Path(__file__).resolve().parent.parent
+    load_default_dotenv(project_dir=uxdrift_project_dir)
+    run_dir = Path(args.run_dir)
+    manifest_path = run_dir / "llm-batch.json"
+    if not manifest_path.exists():
+        raise ValueError(f"No LLM batch manifest in {run_dir} (was it run with --llm-batch?)")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    report_json = run_dir / "report.json"
+    report = json.loads(report_json.read_text(encoding="utf-8"))
+
+    api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("UXDRIFT_LLM_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY (or UXDRIFT_LLM_API_KEY) is not set.")
+    batch = wait_for_batch(
+        base_url=str(manifest["base"]["base_url"]),
+        api_key=api_key,
+        batch_id=str(manifest["batch_id"]),
+        timeout_s=float(args.wait),
+        poll_s=float(args.poll),
+    )
+    llm_block = _batch_block(manifest, batch, api_key=api_key)
+    if not llm_block.get("pending"):
+        state_dir = uxdrift_project_dir / ".uxdrift"
+        meta = report.get("meta") or {}
+        scope = str(meta.get("base_url") or "")
+        run_id = str(meta.get("run_id") or run_dir.name)
+        _record_llm_telemetry(llm_block, out_dir=run_dir, state_dir=state_dir, run_id=run_id)
+        _track_llm_findings(llm_block, state_dir=state_dir, run_id=run_id, scope=scope)
+    report["llm"] = llm_block
+    pov_meta = _pov_meta([], list(manifest.get("pov_focus") or []), llm_block)
+    if pov_meta:
+        report["pov"] = pov_meta
+    write_json(report_json, report)
+    write_text(run_dir / "report.md", render_markdown(report))
+    if llm_block.get("pending"):
+        print(f"LLM batch {batch.get('id')} is still {batch.get('status')}; run collect again later.", file=sys.stderr)
+        return ExitCode.ok
+    return _report_exit_code(report)
+
+
 def _highest_severity(report: dict[str, Any]) -> str:
     best = "info"
     for f in (report.get("deterministic_findings") or []):
@@ -427,7 +1270,12 @@ def _maybe_create_wg_followup(*, wg, task_id: str, report_md: Path, report: dict
     pov = report.get("pov") or {}
     pov_name = str(pov.get("name") or "").strip() if isinstance(pov, dict) else ""
     pov_focus = pov.get("focus") if isinstance(pov, dict) else []
-    scorecard = llm_parsed.get("pov_scorecard") or []
+    scorecard = list(llm_parsed.get("pov_scorecard") or [])
+    for block in (report.get("llm") or {}).get("povs") or []:
+        name = str((block.get("pov") or {}).get("name") or "")
+        for item in ((block.get("parsed") or {}).get("pov_scorecard") or []):
+            if isinstance(item, dict):
+                scorecard.append({**item, "principle": f"{name}/{item.get('principle')}"})
 
     try:
         rel = report_md.relative_to(wg.project_dir)
@@ -472,6 +1320,9 @@ def _maybe_create_wg_followup(*, wg, task_id: str, report_md: Path, report: dict
                 clean = [str(t) for t in tags if str(t).strip()]
                 if clean:
                     tag_text = f" (principles: {', '.join(clean)})"
+            status = (f.get("history") or {}).get("status")
+            if status:
+                tag_text += f" ({status})"
             lines.append(f"- [{f.get('severity')}] {f.get('category')}: {f.get('summary')}{tag_text}")
         lines.append("")
 
@@ -522,16 +1373,25 @@ def _wg_check(args: argparse.Namespace) -> int:
             pages = ["/"]
 
     steps_path = args.steps or spec.get("steps")
-    steps = None
-    if steps_path:
-        steps_file = Path(str(steps_path))
-        if not steps_file.is_absolute():
-            steps_file = wg.project_dir / steps_file
-        raw = steps_file.read_text(encoding="utf-8")
-        parsed = json.loads(raw)
-        if not isinstance(parsed, list):
-            raise ValueError("steps file must be a JSON array")
-        steps = parsed
+    steps_file = _project_path(wg.project_dir, steps_path)
+    flows = _load_flows(steps_file, pages) if steps_file else None
+
+    auth = _auth_config(
+        base_url=str(base_url),
+        state_dir=wg_dir / ".uxdrift",
+        login_steps=_project_path(wg.project_dir, args.login_steps or spec.get("login_steps")),
+        login_page=args.login_page or spec.get("login_page"),
+        storage_state=_project_path(wg.project_dir, args.storage_state or spec.get("storage_state")),
+        ttl_s=args.storage_state_ttl_s if args.storage_state_ttl_s is not None else spec.get("storage_state_ttl_s"),
+        logged_out_selector=args.logged_out_selector or spec.get("logged_out_selector"),
+    )
+
+    aria_snapshot = (
+        bool(args.aria_snapshot) if args.aria_snapshot is not None else bool(spec.get("aria_snapshot", False))
+    )
+    aria_max_depth = (
+        int(args.aria_max_depth) if args.aria_max_depth is not None else int(spec.get("aria_max_depth", 8))
+    )
 
     out_dir = Path(args.out) if args.out else _default_wg_out_dir(wg_dir, task_id)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -545,7 +1405,31 @@ def _wg_check(args: argparse.Namespace) -> int:
         browser_channel=args.channel,
         nav_timeout_ms=int(args.nav_timeout_ms),
         wait_until=args.wait_until,
-        steps=steps,
+        flows=flows,
+        flow_concurrency=int(args.flow_concurrency),
+        aria_snapshot=aria_snapshot,
+        aria_max_depth=aria_max_depth,
+        page_retries=int(args.page_retries),
+        retry_backoff_ms=int(args.retry_backoff_ms),
+        auth=auth,
+    )
+    run_id = _new_run_id()
+    run_meta["run_id"] = run_id
+    _maybe_compare_to_baseline(args=args, ev_pages=ev_pages, run_meta=run_meta)
+    _maybe_index_screenshots(
+        args=args,
+        ev_pages=ev_pages,
+        run_meta=run_meta,
+        state_dir=wg_dir / ".uxdrift",
+        run_id=run_id,
+    )
+    _maybe_index_errors(
+        args=args,
+        ev_pages=ev_pages,
+        run_meta=run_meta,
+        state_dir=wg_dir / ".uxdrift",
+        run_id=run_id,
+        scope=f"{task_id} {base_url}",
     )
     run_meta["task_id"] = task_id
     run_meta["task_title"] = str(task.get("title") or task_id)
@@ -562,17 +1446,15 @@ def _wg_check(args: argparse.Namespace) -> int:
         non_goals.extend([str(g) for g in spec_non if str(g).strip()])
     non_goals.extend([g.strip() for g in (args.non_goal or []) if g.strip()])
 
-    spec_pov = str(spec.get("pov")).strip() if isinstance(spec.get("pov"), str) else ""
-    pov_name = (str(args.pov).strip() if args.pov else spec_pov) or None
+    raw_spec_pov = spec.get("pov")
+    spec_povs = [str(p) for p in raw_spec_pov] if isinstance(raw_spec_pov, list) else [str(raw_spec_pov or "")]
+    povs = list(dict.fromkeys(_collect_text_values(list(args.pov or [])) or _collect_text_values(spec_povs)))
     spec_pov_focus: list[str] = []
     raw_spec_pov_focus = spec.get("pov_focus")
     if isinstance(raw_spec_pov_focus, list):
         spec_pov_focus.extend([str(p).strip() for p in raw_spec_pov_focus if str(p).strip()])
     arg_pov_focus = _collect_text_values(list(args.pov_focus or []))
     pov_focus = arg_pov_focus if arg_pov_focus else spec_pov_focus
-    pov_meta: dict[str, Any] | None = None
-    if pov_name:
-        pov_meta = {"name": pov_name, "focus": pov_focus}
 
     # Decide LLM enablement: CLI flag wins; otherwise use task spec.
     llm_enabled = bool(args.llm) if args.llm is not None else bool(spec.get("llm", False))
@@ -585,57 +1467,11 @@ def _wg_check(args: argparse.Namespace) -> int:
 
         llm_base_url = str(spec.get("llm_base_url") or args.llm_base_url)
         llm_model = str(spec.get("llm_model") or args.llm_model)
+        llm_triage_model = str(spec.get("llm_triage_model") or args.llm_triage_model or "") or None
 
-        screenshot_paths: list[Path] = []
-        for p in ev_pages:
-            step_shots = p.artifacts.get("step_screenshots")
-            if isinstance(step_shots, list):
-                for s in step_shots:
-                    if isinstance(s, str) and s:
-                        screenshot_paths.append(Path(s))
-            shot = p.artifacts.get("screenshot")
-            if isinstance(shot, str) and shot:
-                screenshot_paths.append(Path(shot))
-
-        evidence_for_llm = {
-            "meta": run_meta,
-            "deterministic_counts": {
-                "console_errors": sum(int(p.console.get("counts", {}).get("error", 0)) for p in ev_pages),
-                "console_warnings": sum(int(p.console.get("counts", {}).get("warning", 0)) for p in ev_pages),
-                "request_failures": sum(int(p.network.get("counts", {}).get("request_failures", 0)) for p in ev_pages),
-                "http_errors": sum(int(p.network.get("counts", {}).get("http_errors", 0)) for p in ev_pages),
-                "page_errors": sum(len(p.page_errors) for p in ev_pages),
-            },
-            "pages": [
-                {
-                    "name": p.name,
-                    "url": p.url,
-                    "timing_ms": p.timing_ms,
-                    "console_counts": p.console.get("counts"),
-                    "console_error_samples": [
-                        _truncate(str(m.get("text") or ""), 400)
-                        for m in (p.console.get("messages") or [])
-                        if m.get("type") == "error"
-                    ][:10],
-                    "console_warning_samples": [
-                        _truncate(str(m.get("text") or ""), 400)
-                        for m in (p.console.get("messages") or [])
-                        if m.get("type") == "warning"
-                    ][:10],
-                    "network_counts": p.network.get("counts"),
-                    "http_error_samples": (p.network.get("http_errors") or [])[:10],
-                    "request_failure_samples": (p.network.get("request_failures") or [])[:10],
-                    "page_error_count": len(p.page_errors),
-                    "page_error_samples": [_truncate(e, 400) for e in p.page_errors][:10],
-                    "title": p.extracted.get("title"),
-                    "text": p.extracted.get("text"),
-                    "performance_navigation": p.extracted.get("performance_navigation"),
-                    "screenshot": p.artifacts.get("screenshot"),
-                }
-                for p in ev_pages
-            ],
-        }
-        llm_block = llm_critique(
+        screenshot_paths = _screenshot_paths(ev_pages)
+        evidence_for_llm = _llm_evidence(ev_pages=ev_pages, run_meta=run_meta)
+        llm_block = _llm_critique_povs(
             base_url=llm_base_url,
             api_key=api_key,
             model=llm_model,
@@ -643,13 +1479,17 @@ def _wg_check(args: argparse.Namespace) -> int:
             non_goals=non_goals,
             evidence=evidence_for_llm,
             screenshot_paths=screenshot_paths,
-            pov=pov_name,
+            povs=povs,
             pov_focus=pov_focus,
+            page_screenshots=[_screenshot_paths([p]) for p in ev_pages],
+            **{**_llm_options(args, state_dir=wg_dir / ".uxdrift"), "triage_model": llm_triage_model},
         )
-        resolved = llm_block.get("pov")
-        if isinstance(resolved, dict) and resolved:
-            pov_meta = resolved
+    _record_llm_telemetry(llm_block, out_dir=out_dir, state_dir=wg_dir / ".uxdrift", run_id=run_id)
+    _track_llm_findings(
+        llm_block, state_dir=wg_dir / ".uxdrift", run_id=run_id, scope=f"{task_id} {base_url}"
+    )
 
+    pov_meta = _pov_meta(povs, pov_focus, llm_block)
     report = build_report(run_meta=run_meta, pages=ev_pages, goals=goals, non_goals=non_goals, llm_block=llm_block, pov=pov_meta)
 
     report_json = out_dir / "report.json"
@@ -680,6 +1520,16 @@ def main(argv: list[str] | None = None) -> int:
             return _install_browsers(args)
         if args.cmd == "run":
             return _run(args)
+        if args.cmd == "collect":
+            return _collect(args)
+        if args.cmd == "mock-llm":
+            return _mock_llm(args)
+        if args.cmd == "bench-llm":
+            return _bench_llm(args)
+        if args.cmd == "stats":
+            return _stats(args)
+        if args.cmd == "phash-history":
+            return _phash_history(args)
         if args.cmd == "wg":
             if args.wg_cmd == "check":
                 return _wg_check(args)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import re
+from typing import Any
+
+
+# URL-shaped tokens only: a scheme URL, or a file name with a query string (`app.js?v=3`).
+# A bare `#id` or `?` elsewhere in a message (selectors, questions) is kept.
+_URL_RE = re.compile(r"[a-z][a-z0-9+.-]*://[^\s)'\"]+|[^\s()'\"]+\.\w+\?[^\s)'\"]*", re.IGNORECASE)
+_QUERY_RE = re.compile(r"[?#]")
+_HEX_RE = re.compile(r"[0-9a-f]{8,}", re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+_WS_RE = re.compile(r"\s+")
+# Stack frames beyond these add churn (framework internals), not identity.
+_STACK_FRAMES = 3
+_MAX_TEXT = 300
+
+
+def normalize_error(text: str) -> str:
+    """Drop URL query strings/fragments, mask hashes and numbers (ids, line:col, ports), collapse whitespace."""
+    text = _URL_RE.sub(lambda m: _QUERY_RE.split(m.group(0), maxsplit=1)[0], text)
+    text = _HEX_RE.sub("#", text)
+    text = _DIGITS_RE.sub("0", text)
+    return _WS_RE.sub(" ", text).strip()[:_MAX_TEXT]
+
+
+def _stack_text(error: str) -> str:
+    """First line of a page error plus its top stack frames."""
+    lines = [ln.strip() for ln in str(error).splitlines() if ln.strip()]
+    if not lines:
+        return ""
+    frames = [ln for ln in lines[1:] if ln.startswith("at ") or "@" in ln][:_STACK_FRAMES]
+    return "\n".join([lines[0], *frames])
+
+
+def _fp(kind: str, text: str) -> str:
+    return hashlib.sha1(f"{kind}\n{text}".encode("utf-8")).hexdigest()[:16]
+
+
+def page_error_fingerprints(page: Any) -> list[dict[str, Any]]:
+    """
+    Fingerprints of one page's console errors, uncaught page errors, HTTP errors and
+    failed requests, with occurrence counts. Network entries keep the status (or
+    failure) and method but not the query string.
+    """
+    raw: list[tuple[str, str]] = []
+    for m in (page.console or {}).get("messages") or []:
+        if m.get("type") == "error":
+            raw.append(("console", normalize_error(str(m.get("text") or ""))))
+    for err in page.page_errors or []:
+        raw.append(("page_error", "\n".join(normalize_error(ln) for ln in _stack_text(err).splitlines())))
+    network = page.network or {}
+    for e in network.get("http_errors") or []:
+        raw.append(("http", f"{e.get('status')} {normalize_error(str(e.get('url') or ''))}"))
+    for e in network.get("request_failures") or []:
+        text = f"{e.get('method') or ''} {normalize_error(str(e.get('url') or ''))} {e.get('failure') or ''}"
+        raw.append(("request_failure", text.strip()))
+
+    out: dict[str, dict[str, Any]] = {}
+    for kind, text in raw:
+        fp = _fp(kind, text)
+        if fp in out:
+            out[fp]["count"] += 1
+        else:
+            out[fp] = {"fp": fp, "kind": kind, "text": text, "count": 1}
+    return list(out.values())
+
+
+@dataclass
+class ErrorIndex:
+    """
+    Append-only JSONL history of error fingerprints: one entry per fingerprint, page
+    and run, plus a `run` marker per indexed run (so clean runs count too). Runs are
+    grouped by `scope` (e.g. base URL), so "new" and "gone" are judged against
+    earlier runs of the same target.
+    """
+
+    path: Path
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    _by_fp: dict[tuple[str, str], list[int]] = field(default_factory=dict, repr=False)
+    _runs: dict[str, list[str]] = field(default_factory=dict, repr=False)
+    _by_run: dict[tuple[str, str], list[int]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> ErrorIndex:
+        idx = cls(path=path)
+        if path.exists():
+            for raw in path.read_text(encoding="utf-8").splitlines():
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    entry = json.loads(raw)
+                except Exception:
+                    continue
+                if isinstance(entry, dict) and (entry.get("fp") or entry.get("kind") == "run"):
+                    idx._add(entry)
+        return idx
+
+    def _add(self, entry: dict[str, Any]) -> None:
+        scope, run = str(entry.get("scope") or ""), str(entry.get("run"))
+        runs = self._runs.setdefault(scope, [])
+        if not runs or runs[-1] != run:
+            runs.append(run)
+        if entry.get("kind") == "run":
+            return
+        pos = len(self.entries)
+        self.entries.append(entry)
+        self._by_fp.setdefault((scope, str(entry["fp"])), []).append(pos)
+        self._by_run.setdefault((scope, run), []).append(pos)
+
+    def append(self, entries: list[dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            for entry in entries:
+                self._add(entry)
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    def history(self, scope: str, fp: str) -> list[dict[str, Any]]:
+        return [self.entries[i] for i in self._by_fp.get((scope, fp), [])]
+
+    def runs(self, scope: str) -> list[str]:
+        return list(self._runs.get(scope, []))
+
+    def in_run(self, scope: str, run_id: str) -> list[dict[str, Any]]:
+        return [self.entries[i] for i in self._by_run.get((scope, run_id), [])]
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def index_errors(pages: list[Any], *, index_path: Path, run_id: str, scope: str) -> dict[str, Any]:
+    """
+    Fingerprint every page's errors, classify them against earlier runs of `scope`,
+    and append them to the persistent index.
+
+    Results land on each page as `artifacts["error_fingerprints"]` (with `status`
+    "new" or "recurring", `first_seen` and `runs`); the returned summary counts them
+    and lists fingerprints from the previous run that are `gone`.
+    """
+    idx = ErrorIndex.load(index_path)
+    previous = [r for r in idx.runs(scope) if r != run_id]
+    ts = _utc_now_iso()
+
+    added: list[dict[str, Any]] = []
+    counts = {"new": 0, "recurring": 0}
+    current: set[str] = set()
+    for p in pages:
+        results = []
+        for e in page_error_fingerprints(p):
+            earlier = [h for h in idx.history(scope, e["fp"]) if h.get("run") != run_id]
+            status = "recurring" if earlier else "new"
+            if e["fp"] not in current:
+                counts[status] += 1
+            current.add(e["fp"])
+            results.append(
+                {
+                    **e,
+                    "status": status,
+                    "first_seen": earlier[0].get("ts") if earlier else ts,
+                    "runs": len({h.get("run") for h in earlier}) + 1,
+                }
+            )
+            added.append({**e, "page": p.name, "run": run_id, "scope": scope, "ts": ts})
+        p.artifacts["error_fingerprints"] = results
+    idx.append([*added, {"kind": "run", "run": run_id, "scope": scope, "ts": ts}])
+
+    gone: dict[str, dict[str, Any]] = {}
+    for e in idx.in_run(scope, previous[-1]) if previous else []:
+        if e["fp"] not in current:
+            gone.setdefault(e["fp"], {k: e.get(k) for k in ("fp", "kind", "text", "page")})
+    return {
+        "index": str(index_path),
+        "previous_run": previous[-1] if previous else None,
+        **counts,
+        "gone": list(gone.values()),
+    }
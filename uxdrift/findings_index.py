@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import random
+import re
+from typing import Any
+
+
+# MinHash: 32 hash functions, LSH in 8 bands of 4 rows. Two findings with Jaccard
+# similarity s share a band with probability 1 - (1 - s^4)^8 (~0.9 at s = 0.6).
+_PERMS = 32
+_ROWS = 4
+_BANDS = _PERMS // _ROWS
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_COEFFS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(_PERMS)]
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9_-]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can for from has have in is it its not of on or so that the this to too was "
+    "when which while with without".split()
+)
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def _words(text: str) -> set[str]:
+    return {_stem(w) for w in _WORD_RE.findall(re.sub(r"\d+", " ", text.lower())) if w not in _STOPWORDS}
+
+
+def finding_features(finding: dict[str, Any]) -> set[str]:
+    """Normalized summary and evidence words plus principle tags (digits and stopwords dropped)."""
+    features = _words(str(finding.get("summary") or ""))
+    for ev in finding.get("evidence") or []:
+        features |= _words(str(ev))
+    for tag in finding.get("principle_tags") or []:
+        if str(tag).strip():
+            features.add("tag:" + str(tag).strip().lower())
+    return features
+
+
+def minhash(features: set[str]) -> list[int] | None:
+    """MinHash signature of a feature set; None for an empty set."""
+    if not features:
+        return None
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big") for f in features]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _COEFFS]
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the feature sets behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / _PERMS
+
+
+def _band_keys(sig: list[int]) -> list[tuple[int, tuple[int, ...]]]:
+    return [(band, tuple(sig[band * _ROWS : (band + 1) * _ROWS])) for band in range(_BANDS)]
+
+
+@dataclass
+class FindingsIndex:
+    """
+    Append-only JSONL history of LLM findings across runs, clustered by near-duplicate
+    text.
+
+    `finding` entries record one finding in one run (with its cluster id and MinHash
+    signature); `run` entries mark every tracked run, including runs without findings
+    and incomplete ones (`complete: false`); `issue` entries record that a cluster was
+    filed as an issue. Lookups only compare signatures that share an LSH band with the
+    query.
+    """
+
+    path: Path
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    _band_table: dict[tuple[int, tuple[int, ...]], list[int]] = field(default_factory=dict, repr=False)
+    _by_cluster: dict[str, list[int]] = field(default_factory=dict, repr=False)
+    _runs: dict[str, list[str]] = field(default_factory=dict, repr=False)
+    _by_run: dict[tuple[str, str], list[int]] = field(default_factory=dict, repr=False)
+    _incomplete: set[tuple[str, str]] = field(default_factory=set, repr=False)
+    _issues: set[str] = field(default_factory=set, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> FindingsIndex:
+        idx = cls(path=path)
+        if path.exists():
+            for raw in path.read_text(encoding="utf-8").splitlines():
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    entry = json.loads(raw)
+                except Exception:
+                    continue
+                if isinstance(entry, dict) and (entry.get("cluster") or entry.get("kind") == "run"):
+                    idx._add(entry)
+        return idx
+
+    def _add(self, entry: dict[str, Any]) -> None:
+        if entry.get("kind") == "issue":
+            self._issues.add(str(entry["cluster"]))
+            return
+        scope, run = str(entry.get("scope") or ""), str(entry.get("run"))
+        if entry.get("kind") == "run":
+            self._note_run(scope, run)
+            if entry.get("complete") is False:
+                self._incomplete.add((scope, run))
+            return
+        if not isinstance(entry.get("sig"), list) or len(entry["sig"]) != _PERMS:
+            return
+        pos = len(self.entries)
+        self.entries.append(entry)
+        self._by_cluster.setdefault(str(entry["cluster"]), []).append(pos)
+        self._note_run(scope, run)
+        self._by_run.setdefault((scope, run), []).append(pos)
+        for key in _band_keys(entry["sig"]):
+            self._band_table.setdefault(key, []).append(pos)
+
+    def _note_run(self, scope: str, run: str) -> None:
+        runs = self._runs.setdefault(scope, [])
+        if not runs or runs[-1] != run:
+            runs.append(run)
+
+    def append(self, entries: list[dict[str, Any]]) -> None:
+        for entry in entries:
+            self._add(entry)
+        self._write(entries)
+
+    def _write(self, entries: list[dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    def match(self, sig: list[int], *, threshold: float = 0.5) -> tuple[str, float] | None:
+        """The cluster most similar to `sig` (at least `threshold`), or None."""
+        candidates: set[int] = set()
+        for key in _band_keys(sig):
+            candidates.update(self._band_table.get(key, []))
+        best: tuple[str, float] | None = None
+        for pos in sorted(candidates):
+            entry = self.entries[pos]
+            sim = similarity(sig, entry["sig"])
+            if sim >= threshold and (best is None or sim > best[1]):
+                best = (str(entry["cluster"]), sim)
+        return best
+
+    def cluster(self, cluster_id: str) -> list[dict[str, Any]]:
+        return [self.entries[i] for i in self._by_cluster.get(cluster_id, [])]
+
+    def runs(self, scope: str) -> list[str]:
+        """Complete tracked runs for `scope` (with or without findings), oldest first."""
+        return [r for r in self._runs.get(scope, []) if (scope, r) not in self._incomplete]
+
+    def clusters_in_run(self, scope: str, run_id: str) -> dict[str, dict[str, Any]]:
+        return {str(self.entries[i]["cluster"]): self.entries[i] for i in self._by_run.get((scope, run_id), [])}
+
+    def has_issue(self, cluster_id: str) -> bool:
+        return cluster_id in self._issues
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _cluster_id(sig: list[int]) -> str:
+    return "c" + hashlib.sha1(json.dumps(sig).encode("utf-8")).hexdigest()[:12]
+
+
+def track_findings(
+    findings: list[Any],
+    *,
+    index_path: Path,
+    run_id: str,
+    scope: str,
+    threshold: float = 0.5,
+    complete: bool = True,
+) -> dict[str, Any]:
+    """
+    Match this run's findings against the index, record them, and classify them.
+
+    Each finding gets `history`: `status` ("new" or "recurring"), `cluster`,
+    `first_seen` and `runs` (distinct runs the cluster appeared in, this one included).
+    Clusters seen in the previous complete run of the same `scope` (e.g. base URL) but
+    not in this one are returned under `resolved`. Pass `complete=False` when part of
+    the critique failed: nothing is reported resolved, and later runs are not compared
+    against this one.
+    """
+    idx = FindingsIndex.load(index_path)
+    previous = [r for r in idx.runs(scope) if r != run_id]
+    before = idx.clusters_in_run(scope, previous[-1]) if previous else {}
+    ts = _utc_now_iso()
+
+    added: list[dict[str, Any]] = []
+    counts = {"new": 0, "recurring": 0}
+    for f in findings:
+        if not isinstance(f, dict):
+            continue
+        sig = minhash(finding_features(f))
+        if sig is None:
+            continue
+        hit = idx.match(sig, threshold=threshold)
+        cluster_id = hit[0] if hit else _cluster_id(sig)
+        history = idx.cluster(cluster_id)
+        entry = {
+            "kind": "finding",
+            "cluster": cluster_id,
+            "run": run_id,
+            "scope": scope,
+            "ts": ts,
+            "severity": f.get("severity"),
+            "category": f.get("category"),
+            "summary": f.get("summary"),
+            "sig": sig,
+        }
+        idx._add(entry)
+        added.append(entry)
+        earlier = [e for e in history if e.get("run") != run_id]
+        status = "recurring" if earlier else "new"
+        counts[status] += 1
+        f["history"] = {
+            "status": status,
+            "cluster": cluster_id,
+            "first_seen": (earlier[0] if earlier else entry).get("ts"),
+            "runs": len({e.get("run") for e in history} | {run_id}),
+        }
+        if hit:
+            f["history"]["similarity"] = round(hit[1], 2)
+
+    marker = {"kind": "run", "run": run_id, "scope": scope, "ts": ts, "complete": complete}
+    idx._add(marker)
+    idx._write([*added, marker])
+
+    seen = {e["cluster"] for e in added}
+    resolved = [
+        {k: e.get(k) for k in ("cluster", "severity", "category", "summary", "run")}
+        for cid, e in before.items()
+        if complete and cid not in seen
+    ]
+    return {"index": str(index_path), "previous_run": previous[-1] if previous else None, **counts, "resolved": resolved}
+
+
+def record_issue(index_path: Path, *, cluster_id: str, repo: str) -> None:
+    """Remember that `cluster_id` was filed in `repo`, so recurring findings are not filed again."""
+    FindingsIndex(path=index_path).append([{"kind": "issue", "cluster": cluster_id, "repo": repo, "ts": _utc_now_iso()}])
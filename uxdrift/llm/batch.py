@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+import httpx
+
+from uxdrift.llm.openai_compat import OpenAICompatError, get_client
+
+
+# Endpoint named in each batch input line (OpenAI batch format).
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def _headers(api_key: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {api_key}"}
+
+
+def _check(r: httpx.Response, what: str) -> httpx.Response:
+    if r.status_code >= 400:
+        raise OpenAICompatError(f"LLM batch {what} failed ({r.status_code}): {r.text[:500]}")
+    return r
+
+
+def batch_line(custom_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": payload}
+
+
+def write_batch_file(path: Path, lines: list[dict[str, Any]]) -> int:
+    """Write batch input lines as JSONL; returns the file size in bytes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = "".join(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n" for line in lines)
+    path.write_text(data, encoding="utf-8")
+    return len(data.encode("utf-8"))
+
+
+def submit_batch(
+    *,
+    base_url: str,
+    api_key: str,
+    input_path: Path,
+    completion_window: str = "24h",
+    metadata: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """Upload `input_path` (purpose=batch) and create a batch over it; returns the batch object."""
+    client = get_client()
+    root = base_url.rstrip("/")
+    with input_path.open("rb") as fh:
+        r = client.post(
+            root + "/files",
+            headers=_headers(api_key),
+            data={"purpose": "batch"},
+            files={"file": (input_path.name, fh, "application/jsonl")},
+        )
+    file_id = _check(r, "upload").json()["id"]
+    body: dict[str, Any] = {
+        "input_file_id": file_id,
+        "endpoint": BATCH_ENDPOINT,
+        "completion_window": completion_window,
+    }
+    if metadata:
+        body["metadata"] = metadata
+    r = client.post(root + "/batches", headers=_headers(api_key), json=body)
+    return _check(r, "create").json()
+
+
+def get_batch(*, base_url: str, api_key: str, batch_id: str) -> dict[str, Any]:
+    r = get_client().get(f"{base_url.rstrip('/')}/batches/{batch_id}", headers=_headers(api_key))
+    return _check(r, "status").json()
+
+
+def wait_for_batch(
+    *,
+    base_url: str,
+    api_key: str,
+    batch_id: str,
+    timeout_s: float,
+    poll_s: float = 30.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> dict[str, Any]:
+    """
+    Poll until the batch reaches a terminal status or `timeout_s` passes (0 checks
+    once); returns the last batch object seen, which may still be in progress.
+    """
+    deadline = time.monotonic() + max(0.0, timeout_s)
+    while True:
+        batch = get_batch(base_url=base_url, api_key=api_key, batch_id=batch_id)
+        remaining = deadline - time.monotonic()
+        if batch.get("status") in TERMINAL_STATUSES or remaining <= 0:
+            return batch
+        sleep(min(poll_s, remaining))
+
+
+def _file_lines(*, base_url: str, api_key: str, file_id: str) -> list[dict[str, Any]]:
+    r = get_client().get(f"{base_url.rstrip('/')}/files/{file_id}/content", headers=_headers(api_key))
+    out: list[dict[str, Any]] = []
+    for line in _check(r, "download").text.splitlines():
+        if line.strip():
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue
+    return out
+
+
+def _error_text(line: dict[str, Any]) -> str | None:
+    err = line.get("error")
+    if err:
+        return str(err.get("message") or err) if isinstance(err, dict) else str(err)
+    resp = line.get("response") or {}
+    status = int(resp.get("status_code") or 0)
+    if status >= 400:
+        body = resp.get("body") or {}
+        detail = body.get("error") if isinstance(body, dict) else body
+        if isinstance(detail, dict):
+            detail = detail.get("message") or detail
+        return f"HTTP {status}: {detail}"
+    return None
+
+
+def batch_results(*, base_url: str, api_key: str, batch: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """
+    Download a finished batch's output and error files, keyed by custom_id:
+    `{"response": <chat completion>}` or `{"error": "..."}`.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    for field in ("output_file_id", "error_file_id"):
+        file_id = batch.get(field)
+        if not file_id:
+            continue
+        for line in _file_lines(base_url=base_url, api_key=api_key, file_id=str(file_id)):
+            custom_id = str(line.get("custom_id") or "")
+            if not custom_id:
+                continue
+            error = _error_text(line)
+            results[custom_id] = {"error": error} if error else {"response": (line.get("response") or {}).get("body")}
+    return results
+
+
+def batch_summary(batch: dict[str, Any]) -> dict[str, Any]:
+    """Report-friendly subset of a batch object."""
+    keys = ("id", "status", "request_counts", "input_file_id", "output_file_id", "error_file_id", "created_at")
+    return {k: batch.get(k) for k in keys if batch.get(k) is not None}
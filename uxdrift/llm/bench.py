@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+import tempfile
+import time
+from typing import Any
+
+from uxdrift.llm.cache import LlmCache
+from uxdrift.llm.critique import critique
+from uxdrift.llm.openai_compat import ClientSettings, close_clients, configure_client
+from uxdrift.llm.ratelimit import RateLimiter, RetryPolicy
+from uxdrift.llm.telemetry import percentile
+
+
+def synthetic_evidence(pages: int, *, text_chars: int = 2000) -> dict[str, Any]:
+    """Run evidence with `pages` similar-sized pages, for benchmarks without a capture."""
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+    out = []
+    for i in range(pages):
+        name = f"/page-{i:03d}"
+        out.append(
+            {
+                "name": name,
+                "url": f"http://bench.local{name}",
+                "title": f"Page {i}",
+                "console_counts": {"error": 1 if i % 5 == 0 else 0},
+                "console_error_samples": [f"TypeError: x is undefined at {name}"] if i % 5 == 0 else [],
+                "text": (f"{name} " + filler * (text_chars // len(filler) + 1))[:text_chars],
+            }
+        )
+    return {"meta": {"base_url": "http://bench.local", "bench": True}, "pages": out}
+
+
+def run_benchmark(
+    *,
+    base_url: str,
+    api_key: str,
+    model: str,
+    pages: int,
+    concurrencies: list[int],
+    repeats: int = 1,
+    stream: bool = False,
+    cache: bool = False,
+    screenshots: list[Path] | None = None,
+    rpm: int = 0,
+    tpm: int = 0,
+    max_retries: int = 3,
+) -> dict[str, Any]:
+    """
+    Critique synthetic evidence end to end at each concurrency and report wall time,
+    throughput, per-call p50/p95 latency (and time to first token when streaming),
+    retries and bytes on the wire. Every round starts from a fresh connection pool;
+    with `cache`, each concurrency gets its own fresh cache so repeats show warm hits.
+    """
+    evidence = synthetic_evidence(pages)
+    shots = list(screenshots or [])
+    page_screenshots = [[shots[i % len(shots)]] if shots else [] for i in range(pages)]
+    rows: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="uxdrift-bench-") as tmp:
+        for c in concurrencies:
+            llm_cache = LlmCache(root=Path(tmp) / f"c{c}") if cache else None
+            for r in range(repeats):
+                configure_client(ClientSettings(max_connections=c, max_keepalive_connections=c))
+                started = time.perf_counter()
+                block = critique(
+                    base_url=base_url,
+                    api_key=api_key,
+                    model=model,
+                    goals=["benchmark"],
+                    non_goals=[],
+                    evidence=evidence,
+                    screenshot_paths=[],
+                    page_screenshots=page_screenshots,
+                    concurrency=c,
+                    cache=llm_cache,
+                    image_cache_dir=Path(tmp) / "images",
+                    on_finding=(lambda f: None) if stream else None,
+                    limiter=RateLimiter(requests_per_min=rpm, tokens_per_min=tpm, max_concurrency=c),
+                    retry=RetryPolicy(max_retries=max_retries),
+                )
+                wall_s = time.perf_counter() - started
+                calls = block.get("calls") or []
+                http = block.get("http") or {}
+                latencies = [float(s.get("latency_ms") or 0) for s in calls]
+                ttft = [float(s["ttft_ms"]) for s in calls if s.get("ttft_ms") is not None]
+                row = {
+                    "concurrency": c,
+                    "repeat": r,
+                    "pages": pages,
+                    "wall_ms": int(round(wall_s * 1000)),
+                    "pages_per_s": round(pages / wall_s, 2) if wall_s > 0 else 0.0,
+                    "calls": http.get("calls", 0),
+                    "retries": http.get("retries", 0),
+                    "cache_hits": http.get("cache_hits", 0),
+                    "p50_ms": percentile(latencies, 50),
+                    "p95_ms": percentile(latencies, 95),
+                    "bytes_sent": http.get("bytes_sent", 0),
+                    "bytes_received": http.get("bytes_received", 0),
+                    "connections_opened": http.get("connections_opened", 0),
+                    "throttled": (block.get("rate_limit") or {}).get("throttled", 0),
+                    "failed_pages": sum(1 for p in block.get("pages") or [] if p.get("error")),
+                }
+                if ttft:
+                    row["ttft_p50_ms"] = percentile(ttft, 50)
+                    row["ttft_p95_ms"] = percentile(ttft, 95)
+                rows.append(row)
+    close_clients()
+    return {
+        "base_url": base_url,
+        "model": model,
+        "stream": stream,
+        "cache": cache,
+        "results": rows,
+    }
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import math
+from typing import Any
+
+
+# Rough cross-provider heuristic; good enough to keep runs under a budget.
+_CHARS_PER_TOKEN = 4
+# Fallback cost for an image without a size estimate (e.g. passed through as raw PNG).
+_DEFAULT_IMAGE_TOKENS = 765
+# Text is only worth sending if at least this many tokens of it fit.
+_MIN_TEXT_TOKENS = 50
+_ERROR_PAGE_WEIGHT = 3
+
+# Lower number = filled first. Anything not listed here is core page metadata and always sent.
+_SAMPLE_PRIORITY = {
+    "page_error_samples": 0,
+    "console_error_samples": 1,
+    "http_error_samples": 2,
+    "request_failure_samples": 4,
+    "console_warning_samples": 6,
+}
+_TEXT_PRIORITY = 5
+_FIRST_IMAGE_PRIORITY = 3
+_MORE_IMAGES_PRIORITY = 7
+_TEXT_KEYS = ("aria", "text")
+
+
+def estimate_tokens(value: Any) -> int:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def image_tiles(paths: list[Any], prepared: dict[str, dict[str, Any]]) -> list[tuple[str, int, int]]:
+    """(path, tile index, estimated tokens) for every prepared tile of `paths`, in send order."""
+    out: list[tuple[str, int, int]] = []
+    for p in paths:
+        for n, tile in enumerate((prepared.get(str(p)) or {}).get("tiles") or []):
+            out.append((str(p), n, int(tile.get("est_tokens") or _DEFAULT_IMAGE_TOKENS)))
+    return out
+
+
+def page_has_errors(page: dict[str, Any]) -> bool:
+    """True when page evidence carries deterministic problems (capture/page/console/network errors)."""
+    if page.get("capture_error") or page.get("page_error_count"):
+        return True
+    counts = page.get("console_counts") or {}
+    net = page.get("network_counts") or {}
+    return bool(counts.get("error") or net.get("http_errors") or net.get("request_failures"))
+
+
+def _items(page: dict[str, Any], images: list[tuple[str, int, int]]) -> list[dict[str, Any]]:
+    """Droppable pieces of one page, in fill order."""
+    items: list[dict[str, Any]] = []
+    for key, prio in _SAMPLE_PRIORITY.items():
+        for i, sample in enumerate(page.get(key) or []):
+            items.append({"kind": key, "prio": prio, "index": i, "tokens": estimate_tokens(sample)})
+    for key in _TEXT_KEYS:
+        if page.get(key):
+            items.append({"kind": key, "prio": _TEXT_PRIORITY, "tokens": estimate_tokens(str(page[key]))})
+    for n, (path, tile, tokens) in enumerate(images):
+        prio = _FIRST_IMAGE_PRIORITY if n == 0 else _MORE_IMAGES_PRIORITY
+        items.append({"kind": "image", "prio": prio, "path": path, "tile": tile, "tokens": tokens})
+    items.sort(key=lambda it: it["prio"])
+    return items
+
+
+def plan_evidence(
+    evidence: dict[str, Any],
+    *,
+    budget: int,
+    page_images: list[list[tuple[str, int, int]]],
+) -> tuple[dict[str, Any], dict[str, list[int]], dict[str, Any]]:
+    """
+    Fit evidence + images into `budget` estimated tokens.
+
+    `page_images` is aligned with `evidence["pages"]`: (path, tile index, tokens) per
+    image tile. Run metadata and per-page core fields (name, url, counts, ...) are
+    always kept. The rest is filled by priority — error samples, then the first
+    screenshot tile, failures, page text/aria (truncated to fit), warnings, more
+    tiles — first within each page's share (pages with errors weigh 3x), then from
+    whatever budget other pages left unused.
+
+    Returns (trimmed evidence, tile indexes allowed per image path, plan record).
+    """
+    pages = [dict(p) for p in evidence.get("pages") or []]
+    core_pages = [{k: v for k, v in p.items() if k not in _SAMPLE_PRIORITY and k not in _TEXT_KEYS} for p in pages]
+    core = estimate_tokens({k: v for k, v in evidence.items() if k != "pages"}) + sum(
+        estimate_tokens(p) for p in core_pages
+    )
+
+    weights = [_ERROR_PAGE_WEIGHT if page_has_errors(p) else 1 for p in pages]
+    free = max(0, budget - core)
+    shares = [free * w // max(1, sum(weights)) for w in weights]
+    used = [0] * len(pages)
+    items = [_items(p, page_images[i] if i < len(page_images) else []) for i, p in enumerate(pages)]
+    text_budget: dict[tuple[int, str], int] = {}
+
+    def take(i: int, it: dict[str, Any], room: int) -> None:
+        if it.get("taken"):
+            return
+        cost = it["tokens"]
+        if it["kind"] in _TEXT_KEYS and cost > room:
+            if room < _MIN_TEXT_TOKENS:
+                return
+            cost = room
+            text_budget[(i, it["kind"])] = room
+        elif cost > room:
+            return
+        it["taken"] = True
+        used[i] += cost
+
+    # Pass 1: each page fills its own share.
+    for i, page_items in enumerate(items):
+        for it in page_items:
+            take(i, it, shares[i] - used[i])
+
+    # Pass 2: leftover budget goes to remaining items across pages, by priority then page weight.
+    rest = [(it["prio"], -weights[i], i, it) for i, page_items in enumerate(items) for it in page_items]
+    rest.sort(key=lambda x: x[:3])
+    for _, _, i, it in rest:
+        take(i, it, free - sum(used))
+
+    allowed: dict[str, list[int]] = {}
+    out_pages: list[dict[str, Any]] = []
+    by_page: list[dict[str, Any]] = []
+    for i, page in enumerate(pages):
+        trimmed = dict(core_pages[i])
+        included: dict[str, int] = {}
+        dropped: dict[str, int] = {}
+        for it in items[i]:
+            counter = included if it.get("taken") else dropped
+            counter[it["kind"]] = counter.get(it["kind"], 0) + 1
+            if not it.get("taken"):
+                continue
+            if it["kind"] == "image":
+                allowed.setdefault(it["path"], []).append(it["tile"])
+            elif it["kind"] in _TEXT_KEYS:
+                text = str(page[it["kind"]])
+                limit = text_budget.get((i, it["kind"]))
+                if limit is not None:
+                    text = text[: limit * _CHARS_PER_TOKEN] + "\n… [truncated to fit the token budget]"
+                trimmed[it["kind"]] = text
+            else:
+                trimmed.setdefault(it["kind"], []).append(page[it["kind"]][it["index"]])
+        for key in _SAMPLE_PRIORITY:
+            if key in page:
+                trimmed.setdefault(key, [])
+        out_pages.append(trimmed)
+        by_page.append(
+            {
+                "name": page.get("name"),
+                "weight": weights[i],
+                "share": shares[i],
+                "used": used[i],
+                "included": included,
+                "dropped": dropped,
+                "text_truncated": any(k[0] == i for k in text_budget),
+            }
+        )
+
+    planned = {**evidence, "pages": out_pages}
+    record = {
+        "budget": budget,
+        "core_tokens": core,
+        "used_tokens": core + sum(used),
+        "over_budget": core > budget,
+        "pages": by_page,
+    }
+    return planned, allowed, record
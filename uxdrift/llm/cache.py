@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+
+CACHE_MODES = ("off", "read", "readwrite")
+
+
+def cache_key(payload: dict[str, Any], *, base_url: str) -> str:
+    """
+    Stable content hash of a chat request: endpoint + the full JSON payload (model,
+    temperature, max_tokens, messages). Images travel as data URLs inside `messages`,
+    so their bytes are part of the key. The API key is deliberately not.
+    """
+    canonical = json.dumps(
+        {"base_url": base_url.rstrip("/"), "payload": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def evict_lru(
+    entries: list[tuple[Path, float, int]],
+    *,
+    max_bytes: int,
+    max_age_s: int,
+    remove: Callable[[Path], None],
+) -> dict[str, int]:
+    """
+    Shared size/age policy for on-disk caches. `entries` are (path, last use, bytes);
+    entries unused for more than `max_age_s` go first, then least-recently-used ones
+    until the rest fit in `max_bytes`. `max_age_s <= 0` disables the age limit.
+    """
+    removed = {"expired": 0, "lru": 0}
+    now = time.time()
+    kept: list[tuple[Path, float, int]] = []
+    for path, used_at, size in entries:
+        if max_age_s > 0 and now - used_at > max_age_s:
+            remove(path)
+            removed["expired"] += 1
+        else:
+            kept.append((path, used_at, size))
+
+    total = sum(size for _, _, size in kept)
+    for path, _, size in sorted(kept, key=lambda e: e[1]):
+        if total <= max_bytes:
+            break
+        remove(path)
+        total -= size
+        removed["lru"] += 1
+    return removed
+
+
+@dataclass
+class LlmCache:
+    """
+    On-disk completion cache: one JSON file per request hash under `root`.
+
+    A file's mtime is its last use (bumped on every hit), which drives LRU eviction
+    down to `max_bytes`; entries older than `max_age_s` since they were stored are
+    treated as misses and removed. `max_age_s <= 0` disables the age limit. Eviction
+    scans the whole tree, so `put` only runs it on the first write and then every
+    `evict_every` writes.
+    """
+
+    root: Path
+    mode: str = "readwrite"
+    max_bytes: int = 200 * 1024 * 1024
+    max_age_s: int = 30 * 24 * 3600
+    evict_every: int = 64
+    _puts: int = field(default=0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"LLM cache mode must be one of {', '.join(CACHE_MODES)}, got {self.mode!r}")
+
+    @property
+    def readable(self) -> bool:
+        return self.mode in ("read", "readwrite")
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == "readwrite"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _expired(self, stored_at: Any) -> bool:
+        if self.max_age_s <= 0:
+            return False
+        try:
+            return (time.time() - float(stored_at)) > self.max_age_s
+        except (TypeError, ValueError):
+            return True
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if not self.readable:
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("response"), dict):
+            return None
+        if self._expired(entry.get("stored_at")):
+            if self.writable:
+                path.unlink(missing_ok=True)
+            return None
+        if self.writable:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return entry["response"]
+
+    def put(self, key: str, response: dict[str, Any], *, model: str) -> None:
+        if not self.writable:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(
+            json.dumps({"stored_at": time.time(), "model": model, "response": response}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+        with self._lock:
+            due = self._puts % max(1, self.evict_every) == 0
+            self._puts += 1
+        if due:
+            self.evict()
+
+    def evict(self) -> dict[str, int]:
+        """Drop expired entries, then least-recently-used ones until under `max_bytes`."""
+        if not self.root.exists():
+            return {"expired": 0, "lru": 0}
+        with self._lock:
+            entries: list[tuple[Path, float, int]] = []
+            for path in self.root.glob("*/*.json"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                # Stored-at lives in the file; mtime >= stored_at, so a stale mtime is a cheap pre-filter.
+                entries.append((path, st.st_mtime, st.st_size))
+            return evict_lru(
+                entries,
+                max_bytes=self.max_bytes,
+                max_age_s=self.max_age_s,
+                remove=lambda path: path.unlink(missing_ok=True),
+            )
+
+    def describe(self) -> dict[str, Any]:
+        return {"mode": self.mode, "dir": str(self.root), "max_bytes": self.max_bytes, "max_age_s": self.max_age_s}
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import Any
+
+
+_WS_RE = re.compile(r"\s+")
+# A run of shared lines is only chrome if it is a real block, not one common word like "Submit".
+_MIN_BLOCK_LINES = 2
+_MIN_BLOCK_CHARS = 24
+# Shared chrome is sent once, but still capped like page text.
+_MAX_CHROME_CHARS = 4000
+_TEXT_KEYS = ("text", "aria")
+
+
+def _norm(line: str) -> str:
+    return _WS_RE.sub(" ", line).strip().lower()
+
+
+def _blocks(lines: list[str], shared: set[str], pairs: set[tuple[str, str]]) -> list[list[int]]:
+    """
+    Indexes of maximal runs of shared lines whose neighbouring lines are also shared
+    pairs (2-line shingles), keeping only runs big enough to count as chrome.
+    """
+    runs: list[list[int]] = []
+    prev: int | None = None
+    for n, line in enumerate(lines):
+        key = _norm(line)
+        if not key:
+            continue
+        if key not in shared:
+            prev = None
+            continue
+        if prev is not None and (_norm(lines[prev]), key) in pairs:
+            runs[-1].append(n)
+        else:
+            runs.append([n])
+        prev = n
+    return [
+        run
+        for run in runs
+        if len(run) >= _MIN_BLOCK_LINES or sum(len(lines[n].strip()) for n in run) >= _MIN_BLOCK_CHARS
+    ]
+
+
+def strip_shared_chrome(
+    evidence: dict[str, Any], *, min_share: float = 0.5
+) -> tuple[dict[str, Any], dict[str, Any] | None]:
+    """
+    Remove text repeated across pages (nav bars, sidebars, footers) from each page's
+    `text`/`aria` and put it once under a top-level `shared_chrome`.
+
+    Line-frequency analysis with 2-line shingles: a normalized line (or pair of
+    adjacent lines) is shared when it appears on at least `min_share` of the pages
+    (and on two or more); runs of shared lines joined by shared pairs that form a
+    real block are removed, so a common word inside unique content stays.
+
+    Returns (evidence, record), with record None when nothing was shared.
+    """
+    pages = evidence.get("pages") or []
+    out_pages = [dict(p) for p in pages]
+    chrome: dict[str, list[str]] = {}
+    removed = {"lines": 0, "chars": 0}
+    touched: set[int] = set()
+
+    for key in _TEXT_KEYS:
+        texts = [(i, str(p[key])) for i, p in enumerate(pages) if p.get(key)]
+        if len(texts) < 2:
+            continue
+        df: dict[str, int] = {}
+        pair_df: dict[tuple[str, str], int] = {}
+        for _, text in texts:
+            norm = [_norm(ln) for ln in text.splitlines() if ln.strip()]
+            for line in set(norm):
+                df[line] = df.get(line, 0) + 1
+            for pair in set(zip(norm, norm[1:])):
+                pair_df[pair] = pair_df.get(pair, 0) + 1
+        need = max(2, math.ceil(min_share * len(texts)))
+        shared = {line for line, n in df.items() if n >= need}
+        if not shared:
+            continue
+        pairs = {pair for pair, n in pair_df.items() if n >= need}
+
+        seen: set[str] = set()
+        for i, text in texts:
+            lines = text.splitlines()
+            drop: set[int] = set()
+            for run in _blocks(lines, shared, pairs):
+                drop.update(run)
+                for n in run:
+                    if _norm(lines[n]) not in seen:
+                        seen.add(_norm(lines[n]))
+                        chrome.setdefault(key, []).append(lines[n].rstrip())
+            if not drop:
+                continue
+            kept = [ln for n, ln in enumerate(lines) if n not in drop]
+            removed["lines"] += len(drop)
+            removed["chars"] += sum(len(lines[n]) for n in drop)
+            out_pages[i][key] = "\n".join(kept).strip()
+            touched.add(i)
+
+    if not chrome:
+        return evidence, None
+    shared_chrome = {key: "\n".join(lines)[:_MAX_CHROME_CHARS] for key, lines in chrome.items()}
+    record = {
+        "pages": len(touched),
+        "lines_removed": removed["lines"],
+        "chars_removed": removed["chars"],
+        "chars_shared": sum(len(v) for v in shared_chrome.values()),
+    }
+    return {**evidence, "shared_chrome": shared_chrome, "pages": out_pages}, record
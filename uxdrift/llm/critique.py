@@ -1,19 +1,534 @@
 from __future__ import annotations
 
-import base64
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
+import re
+import time
 from typing import Any
 
-from uxdrift.llm.openai_compat import chat_completions, extract_text
-from uxdrift.llm.parse import parse_json_object
+from uxdrift.llm.budget import image_tiles, page_has_errors, plan_evidence
+from uxdrift.llm.batch import batch_line
+from uxdrift.llm.cache import LlmCache
+from uxdrift.llm.chrome import strip_shared_chrome
+from uxdrift.llm.encode import encode_evidence
+from uxdrift.llm.images import ImageOptions, image_stats, prepare_images
+from uxdrift.llm.incremental import page_fingerprint, screenshot_key
+from uxdrift.llm.openai_compat import (
+    chat_completions,
+    chat_completions_stream,
+    chat_payload,
+    extract_text,
+    summarize_calls,
+)
+from uxdrift.llm.parse import FindingsStreamParser, parse_json_object
 from uxdrift.llm.pov import resolve_pov
 from uxdrift.llm.prompt import build_messages
+from uxdrift.llm.select import screenshot_candidates, screenshot_hashes, select_screenshots
+from uxdrift.llm.ratelimit import RateLimiter, RetryPolicy
 
 
-def _image_part_from_path(path: Path) -> dict[str, Any]:
-    data = base64.b64encode(path.read_bytes()).decode("ascii")
-    url = f"data:image/png;base64,{data}"
-    return {"type": "image_url", "image_url": {"url": url}}
+_SEV_ORDER: dict[str, int] = {"info": 0, "low": 1, "medium": 2, "high": 3, "blocker": 4}
+
+# Keep token pressure down: send up to 4 images (screenshot tiles) per call.
+_MAX_IMAGES_PER_CALL = 4
+# Finding fields naming where a merged finding came from.
+_SOURCE_FIELDS = ("pages", "povs")
+_PAGE_RECORD_KEYS = ("name", "raw_text", "usage", "error", "tier", "escalation", "provenance", "cached_from")
+
+
+def _image_parts(
+    picks: list[tuple[str, int]], prepared: dict[str, dict[str, Any]], allowed: dict[str, list[int]] | None = None
+) -> list[dict[str, Any]]:
+    parts: list[dict[str, Any]] = []
+    for path, n in picks:
+        if allowed is not None and n not in (allowed.get(path) or []):
+            continue
+        tiles = (prepared.get(path) or {}).get("parts") or []
+        if n < len(tiles):
+            parts.append(tiles[n])
+    return parts[:_MAX_IMAGES_PER_CALL]
+
+
+def _pick_tiles(picks: list[tuple[str, int]], prepared: dict[str, dict[str, Any]]) -> list[tuple[str, int, int]]:
+    """(path, tile index, tokens) for selected tiles, as `plan_evidence` expects."""
+    by_tile = {(path, n): tokens for path, n, tokens in image_tiles(list(dict.fromkeys(p for p, _ in picks)), prepared)}
+    return [(path, n, by_tile[(path, n)]) for path, n in picks if (path, n) in by_tile]
+
+
+def _call(
+    *,
+    base_url: str,
+    api_key: str,
+    model: str,
+    goals: list[str],
+    non_goals: list[str],
+    evidence: dict[str, Any] | str,
+    images: list[dict[str, Any]],
+    pov: dict[str, Any] | None,
+    stats: list[dict[str, Any]],
+    cache: LlmCache | None,
+    limiter: RateLimiter | None,
+    retry: RetryPolicy | None,
+    on_finding: Callable[[dict[str, Any]], None] | None,
+    page_name: str | None = None,
+    tier: str | None = None,
+) -> dict[str, Any]:
+    messages = build_messages(
+        goals=goals, non_goals=non_goals, evidence=evidence, images=images, pov=pov
+    )
+    # Records are collected per call so they can be tagged with the page/tier/POV they belong to.
+    records: list[dict[str, Any]] = []
+    kw: dict[str, Any] = {
+        "base_url": base_url,
+        "api_key": api_key,
+        "model": model,
+        "messages": messages,
+        "stats": records,
+        "cache": cache,
+        "limiter": limiter,
+        "retry": retry,
+    }
+    try:
+        if on_finding is None:
+            resp = chat_completions(**kw)
+        else:
+            parser = FindingsStreamParser()
+
+            def on_delta(delta: str) -> None:
+                for finding in parser.feed(delta):
+                    if page_name is not None:
+                        finding.setdefault("pages", [page_name])
+                    on_finding(finding)
+
+            resp = chat_completions_stream(**kw, on_delta=on_delta)
+    finally:
+        tags = {"page": page_name, "tier": tier, "pov": (pov or {}).get("name")}
+        stats.extend({**r, **{k: v for k, v in tags.items() if v}} for r in records)
+    text = extract_text(resp)
+    return {"raw_text": text, "parsed": parse_json_object(text), "usage": resp.get("usage")}
+
+
+def _timed_call(tier: str, tiers: list[dict[str, Any]], **kw: Any) -> dict[str, Any]:
+    started = time.perf_counter()
+    out = _call(**kw, tier=tier)
+    tiers.append(
+        {
+            "tier": tier,
+            "model": kw["model"],
+            "latency_ms": int(round((time.perf_counter() - started) * 1000)),
+            "usage": out.get("usage"),
+        }
+    )
+    for f in (out.get("parsed") or {}).get("findings") or []:
+        if isinstance(f, dict):
+            f["tier"] = tier
+    return out
+
+
+def _cascade_call(
+    *,
+    triage_model: str,
+    escalate_at: str,
+    has_errors: bool,
+    call_kw: dict[str, Any],
+    **kw: Any,
+) -> dict[str, Any]:
+    """
+    Triage with the cheap model; escalate to the full model when the page already has
+    deterministic problems or triage reports a finding at/above `escalate_at`.
+    """
+    tiers: list[dict[str, Any]] = []
+    if has_errors:
+        reason = "deterministic_findings"
+    else:
+        # Triage output may be superseded, so it is not streamed; it is replayed below if kept.
+        triage = _timed_call("triage", tiers, **{**call_kw, "model": triage_model, "on_finding": None}, **kw)
+        findings = [f for f in (triage.get("parsed") or {}).get("findings") or [] if isinstance(f, dict)]
+        threshold = _SEV_ORDER.get(escalate_at, 2)
+        if not any(_SEV_ORDER.get(str(f.get("severity")), 0) >= threshold for f in findings):
+            on_finding = call_kw.get("on_finding")
+            if on_finding is not None:
+                for f in findings:
+                    on_finding(f)
+            return {**triage, "tier": "triage", "tiers": tiers}
+        reason = "triage_flagged"
+
+    full = _timed_call("full", tiers, **call_kw, **kw)
+    return {
+        **full,
+        "usage": _sum_usage([t.get("usage") for t in tiers]),
+        "tier": "full",
+        "escalation": reason,
+        "tiers": tiers,
+    }
+
+
+def _cascade_summary(
+    results: list[dict[str, Any]], *, triage_model: str, model: str, escalate_at: str
+) -> dict[str, Any]:
+    by_tier: dict[str, dict[str, Any]] = {}
+    for r in results:
+        for t in r.get("tiers") or []:
+            agg = by_tier.setdefault(t["tier"], {"model": t["model"], "calls": 0, "latency_ms": 0, "usage": None})
+            agg["calls"] += 1
+            agg["latency_ms"] += int(t.get("latency_ms") or 0)
+            agg["usage"] = _sum_usage([agg["usage"], t.get("usage")])
+    return {
+        "triage_model": triage_model,
+        "model": model,
+        "escalate_at": escalate_at,
+        "pages_triage_only": sum(1 for r in results if r.get("tier") == "triage"),
+        "pages_escalated": sum(1 for r in results if r.get("tier") == "full"),
+        "tiers": by_tier,
+    }
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _tag_findings(parsed: dict[str, Any] | None, *, provenance: str) -> None:
+    for f in (parsed or {}).get("findings") or []:
+        if isinstance(f, dict):
+            f["provenance"] = provenance
+
+
+def _reused(
+    hit: dict[str, Any], *, page_name: str | None, on_finding: Callable[[dict[str, Any]], None] | None
+) -> dict[str, Any]:
+    """A page-cache hit as a call result: stored findings marked cached, no tokens spent."""
+    parsed = copy.deepcopy(hit.get("parsed"))
+    _tag_findings(parsed, provenance="cached")
+    if on_finding is not None:
+        for f in (parsed or {}).get("findings") or []:
+            if isinstance(f, dict):
+                on_finding({**f, "pages": f.get("pages") or ([page_name] if page_name is not None else [])})
+    out = {
+        "raw_text": hit.get("raw_text") or "",
+        "parsed": parsed,
+        "usage": None,
+        "provenance": "cached",
+        "cached_from": hit.get("critiqued_at"),
+    }
+    return {**out, **{k: hit[k] for k in ("tier", "escalation") if hit.get(k) is not None}}
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _sum_usage(usages: list[Any]) -> dict[str, int] | None:
+    total: dict[str, int] = {}
+    for u in usages:
+        if not isinstance(u, dict):
+            continue
+        for k, v in u.items():
+            if isinstance(v, int):
+                total[k] = total.get(k, 0) + v
+    return total or None
+
+
+def _dedupe_text(items: list[Any]) -> list[str]:
+    out: list[str] = []
+    seen: set[str] = set()
+    for it in items:
+        s = str(it).strip()
+        key = _norm(s)
+        if not s or key in seen:
+            continue
+        seen.add(key)
+        out.append(s)
+    return out
+
+
+def merge_parsed(parts: list[tuple[str, dict[str, Any] | None]], *, source: str = "pages") -> dict[str, Any]:
+    """
+    Reduce per-page critiques (page name, parsed JSON) into the single-critique schema.
+
+    - Findings with the same category + normalized summary merge: highest severity and
+      confidence win, evidence/principle tags are unioned, `pages` lists every source page
+      (with `source="povs"`, parts are POVs and `povs` lists them instead).
+    - A merged finding is `provenance: "fresh"` if any part critiqued it this run.
+    - Findings are ranked by severity, then confidence, then how many pages reported them.
+    - Scorecard scores are averaged per principle; the lowest-scoring page's rationale is kept.
+    - Ideas and experiments are de-duplicated in first-seen order.
+    """
+    merged: dict[tuple[str, str], dict[str, Any]] = {}
+    order: list[tuple[str, str]] = []
+    scores: dict[str, list[tuple[float, str, str]]] = {}
+    ideas: list[Any] = []
+    experiments: list[Any] = []
+
+    for page_name, parsed in parts:
+        if not isinstance(parsed, dict):
+            continue
+        for f in parsed.get("findings") or []:
+            if not isinstance(f, dict):
+                continue
+            key = (str(f.get("category") or "other"), _norm(str(f.get("summary") or "")))
+            cur = merged.get(key)
+            if cur is None:
+                cur = dict(f)
+                cur["evidence"] = list(f.get("evidence") or [])
+                cur["principle_tags"] = list(f.get("principle_tags") or [])
+                for field_name in _SOURCE_FIELDS:
+                    if field_name != source and field_name in f:
+                        cur[field_name] = list(f.get(field_name) or [])
+                cur[source] = []
+                merged[key] = cur
+                order.append(key)
+            else:
+                if _SEV_ORDER.get(str(f.get("severity")), 0) > _SEV_ORDER.get(str(cur.get("severity")), 0):
+                    cur["severity"] = f.get("severity")
+                try:
+                    cur["confidence"] = max(float(cur.get("confidence") or 0), float(f.get("confidence") or 0))
+                except (TypeError, ValueError):
+                    pass
+                if f.get("provenance") == "fresh":
+                    cur["provenance"] = "fresh"
+                for field_name in ("evidence", "principle_tags", *_SOURCE_FIELDS):
+                    if field_name == source or field_name not in cur:
+                        continue
+                    for v in f.get(field_name) or []:
+                        if v not in cur[field_name]:
+                            cur[field_name].append(v)
+            for name in f.get(source) or [page_name]:
+                if name not in cur[source]:
+                    cur[source].append(name)
+
+        for item in parsed.get("pov_scorecard") or []:
+            if not isinstance(item, dict):
+                continue
+            principle = str(item.get("principle") or "").strip()
+            try:
+                score = float(item.get("score"))
+            except (TypeError, ValueError):
+                continue
+            if principle:
+                scores.setdefault(principle, []).append((score, page_name, str(item.get("rationale") or "")))
+
+        ideas.extend(parsed.get("novel_ideas") or [])
+        experiments.extend(parsed.get("next_experiments") or [])
+
+    def rank(key: tuple[str, str]) -> tuple[int, float, int]:
+        f = merged[key]
+        try:
+            conf = float(f.get("confidence") or 0)
+        except (TypeError, ValueError):
+            conf = 0.0
+        return (-_SEV_ORDER.get(str(f.get("severity")), 0), -conf, -len(f[source]))
+
+    scorecard = []
+    for principle, entries in scores.items():
+        low = min(entries, key=lambda e: e[0])
+        scorecard.append(
+            {
+                "principle": principle,
+                "score": round(sum(e[0] for e in entries) / len(entries), 2),
+                "rationale": f"{low[1]}: {low[2]}" if low[2] else "",
+                "pages": len(entries),
+            }
+        )
+
+    return {
+        "findings": [merged[k] for k in sorted(order, key=rank)],
+        "pov_scorecard": scorecard,
+        "novel_ideas": _dedupe_text(ideas),
+        "next_experiments": _dedupe_text(experiments),
+    }
+
+
+def _call_stats(
+    stats: list[dict[str, Any]], cache: LlmCache | None, limiter: RateLimiter | None
+) -> dict[str, Any]:
+    http = summarize_calls(stats)
+    out: dict[str, Any] = {"http": http, "calls": stats}
+    if cache is not None:
+        misses = http["calls"] - http["cache_hits"] - http["retries"]
+        out["cache"] = {**cache.describe(), "hits": http["cache_hits"], "misses": misses}
+    if limiter is not None:
+        out["rate_limit"] = limiter.stats()
+    return out
+
+
+def _reduce_pages(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge per-page call results (name, raw_text, parsed, usage, error, ...) into one block."""
+    failed = [r for r in results if r.get("error")]
+    if len(failed) == len(results):
+        raise RuntimeError(f"LLM critique failed for every page; first error: {failed[0]['error']}")
+    return {
+        "raw_text": "",
+        "parsed": merge_parsed([(str(r.get("name")), r.get("parsed")) for r in results]),
+        "usage": _sum_usage([r.get("usage") for r in results if r.get("provenance") != "cached"]),
+        "pages": [
+            {k: r.get(k) for k in _PAGE_RECORD_KEYS if r.get(k) is not None}
+            for r in results
+        ],
+    }
+
+
+def _merge_povs(blocks: list[dict[str, Any]], shared: dict[str, Any]) -> dict[str, Any]:
+    """Combine per-POV critique blocks; `shared` holds the blocks every POV reused (images, budget)."""
+    failed = [b for b in blocks if b.get("error")]
+    if len(failed) == len(blocks):
+        raise RuntimeError(f"LLM critique failed for every POV; first error: {failed[0]['error']}")
+
+    parts = [
+        (str((b.get("pov") or {}).get("name")), {**(b.get("parsed") or {}), "pov_scorecard": []}) for b in blocks
+    ]
+    merged = merge_parsed(parts, source="povs")
+    merged.pop("pov_scorecard", None)
+
+    first = next(b for b in blocks if not b.get("error"))
+    return {
+        "enabled": True,
+        "provider": first.get("provider"),
+        "base_url": first.get("base_url"),
+        "model": first.get("model"),
+        "strategy": "multi_pov",
+        "pov": None,
+        **shared,
+        "raw_text": "",
+        "parsed": merged,
+        "usage": _sum_usage([b.get("usage") for b in blocks]),
+        "povs": [{k: v for k, v in b.items() if k not in shared} for b in blocks],
+    }
+
+
+@dataclass(frozen=True)
+class PreparedInputs:
+    """
+    Everything a critique needs that does not depend on the POV: the (budgeted)
+    evidence, prepared image tiles, and the encoded evidence for each call, so several
+    POVs over the same capture reuse one preparation.
+    """
+
+    evidence: dict[str, Any]
+    screenshot_paths: list[Path]
+    page_screenshots: list[list[Path]] | None
+    prepared: dict[str, dict[str, Any]]
+    allowed: dict[str, list[int]] | None
+    blocks: dict[str, Any]
+    single: bool
+    calls: list[dict[str, Any]]  # per call: name, evidence, encoded, images, source, shots[, screenshot_keys]
+
+
+def prepare_inputs(
+    *,
+    evidence: dict[str, Any],
+    screenshot_paths: list[Path],
+    page_screenshots: list[list[Path]] | None = None,
+    image_options: ImageOptions | None = None,
+    image_cache_dir: Path | None = None,
+    token_budget: int | None = None,
+    concurrency: int = 4,
+    fingerprint: bool = False,
+    shared_chrome: bool = True,
+) -> PreparedInputs:
+    """
+    POV-independent preparation (see `PreparedInputs`). With `shared_chrome`, text
+    repeated across pages is sent once (see `strip_shared_chrome`); in per-page mode
+    only the first page's call carries it. With `fingerprint`, each per-page call also
+    carries its original page evidence and screenshot keys, so `critique` can
+    fingerprint it for the page cache.
+    """
+    pages = evidence.get("pages") or []
+    source_pages = list(pages)
+    all_paths = list(screenshot_paths) + [p for shots in page_screenshots or [] for p in shots]
+    prepared = prepare_images(all_paths, options=image_options, cache_dir=image_cache_dir, concurrency=concurrency)
+    blocks: dict[str, Any] = {"images": image_stats(prepared)}
+    if shared_chrome:
+        evidence, chrome = strip_shared_chrome(evidence)
+        if chrome is not None:
+            blocks["shared_chrome"] = chrome
+            pages = evidence.get("pages") or []
+    single = page_screenshots is None or len(pages) <= 1
+
+    phashes = screenshot_hashes(all_paths, concurrency=concurrency) if fingerprint or len(set(all_paths)) > 1 else {}
+    candidates = screenshot_candidates(
+        pages=pages, page_screenshots=page_screenshots, screenshot_paths=screenshot_paths, phashes=phashes
+    )
+    if single:
+        picks, selection = select_screenshots(candidates, prepared=prepared, budget=_MAX_IMAGES_PER_CALL)
+        call_picks = [picks]
+        blocks["screenshots"] = selection
+    else:
+        call_picks = []
+        selections = []
+        for i in range(len(pages)):
+            shots = {str(p) for p in (page_screenshots or [])[i]} if i < len(page_screenshots or []) else set()
+            mine = [c for c in candidates if c.path in shots]
+            picks, selection = select_screenshots(mine, prepared=prepared, budget=_MAX_IMAGES_PER_CALL)
+            call_picks.append(picks)
+            selections.append(selection)
+        blocks["screenshots"] = {
+            "budget": _MAX_IMAGES_PER_CALL,
+            "candidates": sum(s["candidates"] for s in selections),
+            "selected": [x for s in selections for x in s["selected"]],
+            "skipped": [x for s in selections for x in s["skipped"]],
+        }
+
+    allowed: dict[str, list[int]] | None = None
+    if token_budget:
+        if single:
+            # One call: attribute each selected tile to the page it shows.
+            names = [p.get("name") for p in pages]
+            page_of = {c.path: names.index(c.page) if c.page in names else 0 for c in candidates}
+            per_page: list[list[tuple[str, int, int]]] = [[] for _ in pages] or [[]]
+            for tile in _pick_tiles(call_picks[0], prepared):
+                per_page[page_of.get(tile[0], 0)].append(tile)
+        else:
+            per_page = [_pick_tiles(picks, prepared) for picks in call_picks]
+        evidence, allowed, blocks["budget"] = plan_evidence(evidence, budget=token_budget, page_images=per_page)
+        pages = evidence.get("pages") or []
+
+    calls: list[dict[str, Any]] = []
+    if single:
+        calls.append(
+            {
+                "name": None,
+                "evidence": evidence,
+                "encoded": encode_evidence(evidence),
+                "images": _image_parts(call_picks[0], prepared, allowed),
+                # Only a one-page run can be fingerprinted as a page.
+                "source": source_pages[0] if len(source_pages) == 1 else None,
+                "shots": list(screenshot_paths),
+            }
+        )
+    else:
+        for i, page in enumerate(pages):
+            run_keys = ("pages", "deterministic_counts") if i == 0 else ("pages", "deterministic_counts", "shared_chrome")
+            page_evidence = {k: v for k, v in evidence.items() if k not in run_keys}
+            page_evidence["pages"] = [page]
+            shots = (page_screenshots or [])[i] if i < len(page_screenshots or []) else []
+            calls.append(
+                {
+                    "name": page.get("name"),
+                    "evidence": page_evidence,
+                    "encoded": encode_evidence(page_evidence),
+                    "images": _image_parts(call_picks[i], prepared, allowed),
+                    "source": source_pages[i],
+                    "shots": list(shots),
+                }
+            )
+    if fingerprint:
+        for c in calls:
+            keys = [screenshot_key(Path(p), phashes.get(str(p))) for p in c["shots"]]
+            c["screenshot_keys"] = keys if c["source"] is not None else None
+    return PreparedInputs(
+        evidence=evidence,
+        screenshot_paths=list(screenshot_paths),
+        page_screenshots=page_screenshots,
+        prepared=prepared,
+        allowed=allowed,
+        blocks=blocks,
+        single=single,
+        calls=calls,
+    )
 
 
 def critique(
@@ -27,27 +542,297 @@ def critique(
     screenshot_paths: list[Path],
     pov: str | None = None,
     pov_focus: list[str] | None = None,
+    page_screenshots: list[list[Path]] | None = None,
+    concurrency: int = 4,
+    cache: LlmCache | None = None,
+    image_options: ImageOptions | None = None,
+    image_cache_dir: Path | None = None,
+    token_budget: int | None = None,
+    on_finding: Callable[[dict[str, Any]], None] | None = None,
+    limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    triage_model: str | None = None,
+    escalate_at: str = "medium",
+    page_cache: LlmCache | None = None,
+    inputs: PreparedInputs | None = None,
 ) -> dict[str, Any]:
-    images = []
-    # Keep token pressure down: send up to 4 screenshots.
-    for p in screenshot_paths[:4]:
-        try:
-            images.append(_image_part_from_path(p))
-        except Exception:
-            continue
+    """
+    Critique a run. With `page_screenshots` (aligned with `evidence["pages"]`) and more
+    than one page, each page is critiqued on its own (map, up to `concurrency` at once)
+    and the results are merged (reduce); otherwise one call covers the whole run.
 
+    With `cache`, identical requests (same model, prompt, evidence and image bytes) are
+    answered from disk; hits are counted in the returned `cache` block.
+
+    Screenshots are tiled/downscaled/re-encoded once up front (see `prepare_images`);
+    upload sizes and token estimates land in the returned `images` block.
+
+    With `token_budget`, evidence and image tiles are trimmed to fit (see
+    `plan_evidence`) and the returned `budget` block lists what was kept and dropped.
+
+    With `on_finding`, responses are streamed and each finding is passed to the
+    callback as soon as it is complete (from worker threads in map/reduce mode), before
+    the merged result is returned.
+
+    `limiter` (shared across threads) and `retry` pace and retry calls; limiter stats
+    land in the returned `rate_limit` block.
+
+    With `triage_model`, each page (or the whole run, in single mode) is screened by
+    that model first and only escalated to `model` when it has deterministic errors or
+    triage finds something at/above `escalate_at`. Findings carry the `tier` that
+    produced them; the `cascade` block has per-tier calls, latency and usage.
+
+    With `page_cache`, each page's critique is stored under a fingerprint of its
+    evidence, screenshots, models, POV and goals (see `page_fingerprint`); unchanged
+    pages reuse the stored findings instead of calling the model. Pages and findings
+    carry `provenance` ("fresh" or "cached"); counts land in the `incremental` block.
+
+    Pass `inputs` from `prepare_inputs` to skip preparation (see `critique_povs`).
+    """
+    if inputs is None:
+        inputs = prepare_inputs(
+            evidence=evidence,
+            screenshot_paths=screenshot_paths,
+            page_screenshots=page_screenshots,
+            image_options=image_options,
+            image_cache_dir=image_cache_dir,
+            token_budget=token_budget,
+            concurrency=concurrency,
+            fingerprint=page_cache is not None,
+        )
     resolved_pov = resolve_pov(pov, pov_focus)
-    messages = build_messages(goals=goals, non_goals=non_goals, evidence=evidence, images=images, pov=resolved_pov)
-    resp = chat_completions(base_url=base_url, api_key=api_key, model=model, messages=messages)
-    text = extract_text(resp)
-    parsed = parse_json_object(text)
-    return {
+    base = {
         "enabled": True,
         "provider": "openai_compat",
         "base_url": base_url,
         "model": model,
-        "raw_text": text,
-        "parsed": parsed,
         "pov": resolved_pov,
-        "usage": resp.get("usage"),
+        "streamed": on_finding is not None,
+        **inputs.blocks,
+    }
+    stats: list[dict[str, Any]] = []
+    call_kw: dict[str, Any] = {
+        "stats": stats,
+        "cache": cache,
+        "limiter": limiter,
+        "retry": retry,
+        "on_finding": on_finding,
+        "base_url": base_url,
+        "api_key": api_key,
+        "model": model,
+        "goals": goals,
+        "non_goals": non_goals,
+        "pov": resolved_pov,
+    }
+
+    def run_call(c: dict[str, Any]) -> dict[str, Any]:
+        kw = {"evidence": c["encoded"], "images": c["images"], "page_name": c["name"]}
+        if not triage_model:
+            return _call(**call_kw, **kw)
+        has_errors = any(page_has_errors(p) for p in c["evidence"].get("pages") or [])
+        return _cascade_call(
+            triage_model=triage_model, escalate_at=escalate_at, has_errors=has_errors, call_kw=call_kw, **kw
+        )
+
+    def cached_call(c: dict[str, Any]) -> dict[str, Any]:
+        if page_cache is None or c.get("screenshot_keys") is None:
+            return run_call(c)
+        fp = page_fingerprint(
+            c["source"],
+            screenshots=c["screenshot_keys"],
+            model=model,
+            triage_model=triage_model,
+            escalate_at=escalate_at,
+            pov=resolved_pov,
+            goals=goals,
+            non_goals=non_goals,
+        )
+        hit = page_cache.get(fp)
+        if hit is not None:
+            return _reused(hit, page_name=c["name"], on_finding=on_finding)
+        out = run_call(c)
+        _tag_findings(out.get("parsed"), provenance="fresh")
+        if out.get("parsed") is not None:
+            stored = {k: out.get(k) for k in ("raw_text", "parsed", "usage", "tier", "escalation")}
+            page_cache.put(fp, {**stored, "critiqued_at": _utc_now_iso()}, model=model)
+        return {**out, "provenance": "fresh"}
+
+    def cascade_block(results: list[dict[str, Any]]) -> dict[str, Any]:
+        if not triage_model:
+            return {}
+        fresh = [r for r in results if r.get("provenance") != "cached"]
+        summary = _cascade_summary(fresh, triage_model=triage_model, model=model, escalate_at=escalate_at)
+        return {"cascade": summary}
+
+    def incremental_block(results: list[dict[str, Any]]) -> dict[str, Any]:
+        if page_cache is None:
+            return {}
+        reused = sum(1 for r in results if r.get("provenance") == "cached")
+        fresh = sum(1 for r in results if r.get("provenance") == "fresh")
+        return {"incremental": {**page_cache.describe(), "pages_reused": reused, "pages_fresh": fresh}}
+
+    if inputs.single:
+        out = cached_call(inputs.calls[0])
+        extra = {**cascade_block([out]), **incremental_block([out])}
+        out = {k: v for k, v in out.items() if k != "tiers"}
+        return {**base, "strategy": "single", **out, **extra, **_call_stats(stats, cache, limiter)}
+
+    def map_page(c: dict[str, Any]) -> dict[str, Any]:
+        try:
+            return {"name": c["name"], **cached_call(c)}
+        except Exception as e:
+            return {"name": c["name"], "raw_text": "", "parsed": None, "usage": None, "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(inputs.calls)))) as pool:
+        results = list(pool.map(map_page, inputs.calls))
+
+    return {
+        **base,
+        "strategy": "map_reduce",
+        "concurrency": concurrency,
+        **_reduce_pages(results),
+        **cascade_block(results),
+        **incremental_block(results),
+        **_call_stats(stats, cache, limiter),
     }
+
+
+def critique_povs(
+    *,
+    povs: list[str],
+    pov_focus: list[str] | None = None,
+    evidence: dict[str, Any],
+    screenshot_paths: list[Path],
+    page_screenshots: list[list[Path]] | None = None,
+    concurrency: int = 4,
+    image_options: ImageOptions | None = None,
+    image_cache_dir: Path | None = None,
+    token_budget: int | None = None,
+    **kw: Any,
+) -> dict[str, Any]:
+    """
+    Critique one capture under several POVs concurrently.
+
+    Images, the token budget and the encoded evidence are prepared once and shared;
+    each POV gets its own `critique` block under `povs` (with its own scorecard), and
+    findings are merged across POVs with a `povs` list naming which ones raised them.
+    """
+    inputs = prepare_inputs(
+        evidence=evidence,
+        screenshot_paths=screenshot_paths,
+        page_screenshots=page_screenshots,
+        image_options=image_options,
+        image_cache_dir=image_cache_dir,
+        token_budget=token_budget,
+        concurrency=concurrency,
+        fingerprint=kw.get("page_cache") is not None,
+    )
+
+    def run_pov(pov: str) -> dict[str, Any]:
+        try:
+            return critique(
+                pov=pov,
+                pov_focus=pov_focus,
+                evidence=evidence,
+                screenshot_paths=screenshot_paths,
+                page_screenshots=page_screenshots,
+                concurrency=concurrency,
+                inputs=inputs,
+                **kw,
+            )
+        except Exception as e:
+            return {"enabled": True, "pov": resolve_pov(pov, pov_focus), "parsed": None, "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, len(povs))) as pool:
+        blocks = list(pool.map(run_pov, povs))
+
+    return _merge_povs(blocks, inputs.blocks)
+
+
+def batch_requests(
+    *,
+    inputs: PreparedInputs,
+    base_url: str,
+    model: str,
+    goals: list[str],
+    non_goals: list[str],
+    povs: list[str],
+    pov_focus: list[str] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """
+    Batch input lines (OpenAI batch format) for every call a critique would make, one
+    set per POV, plus a manifest mapping each `custom_id` back to its POV and page so
+    `critique_from_batch` can rebuild the usual critique block from the batch output.
+    """
+    lines: list[dict[str, Any]] = []
+    plan: list[dict[str, Any]] = []
+    for n, pov in enumerate(povs or [None]):
+        resolved = resolve_pov(pov, pov_focus)
+        calls: list[dict[str, Any]] = []
+        for i, c in enumerate(inputs.calls):
+            custom_id = f"pov{n}-call{i}"
+            messages = build_messages(
+                goals=goals, non_goals=non_goals, evidence=c["encoded"], images=c["images"], pov=resolved
+            )
+            lines.append(batch_line(custom_id, chat_payload(model=model, messages=messages)))
+            calls.append({"custom_id": custom_id, "name": c["name"], "images": len(c["images"])})
+        plan.append({"pov": resolved, "calls": calls})
+    manifest = {
+        "base": {"enabled": True, "provider": "openai_compat", "base_url": base_url, "model": model},
+        "shared": inputs.blocks,
+        "single": inputs.single,
+        "pov_focus": list(pov_focus or []),
+        "povs": plan,
+    }
+    return lines, manifest
+
+
+def _batch_call(name: str | None, result: dict[str, Any] | None) -> dict[str, Any]:
+    result = result or {"error": "missing from batch output"}
+    if result.get("error"):
+        return {"name": name, "raw_text": "", "parsed": None, "usage": None, "error": str(result["error"])}
+    resp = result.get("response") or {}
+    text = extract_text(resp)
+    return {"name": name, "raw_text": text, "parsed": parse_json_object(text), "usage": resp.get("usage")}
+
+
+def _batch_record(
+    model: str, pov: dict[str, Any] | None, planned: dict[str, Any], out: dict[str, Any]
+) -> dict[str, Any]:
+    """A per-call stats record (as `critique` keeps in `calls`) for one batch result, tagged `batch`."""
+    rec: dict[str, Any] = {"model": model, "batch": True, "images": int(planned.get("images") or 0)}
+    usage = out.get("usage") if isinstance(out.get("usage"), dict) else {}
+    rec.update({k: usage[k] for k in ("prompt_tokens", "completion_tokens") if isinstance(usage.get(k), int)})
+    tags = {"page": out.get("name"), "pov": (pov or {}).get("name"), "error": out.get("error")}
+    rec.update({k: v for k, v in tags.items() if v is not None})
+    return rec
+
+
+def critique_from_batch(manifest: dict[str, Any], results: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Fold batch output (see `batch_results`) back into a critique block shaped like `critique`'s."""
+    shared = manifest.get("shared") or {}
+    blocks: list[dict[str, Any]] = []
+    for plan in manifest.get("povs") or []:
+        base = {**manifest["base"], "pov": plan.get("pov"), **shared}
+        planned = plan.get("calls") or []
+        calls = [_batch_call(c.get("name"), results.get(c["custom_id"])) for c in planned]
+        records = [
+            _batch_record(str(manifest["base"]["model"]), plan.get("pov"), c, out) for c, out in zip(planned, calls)
+        ]
+        try:
+            if manifest.get("single"):
+                out = calls[0]
+                if out.get("error"):
+                    raise RuntimeError(f"LLM critique failed: {out['error']}")
+                block = {**base, "strategy": "single", **{k: v for k, v in out.items() if k != "name"}}
+            else:
+                block = {**base, "strategy": "map_reduce", **_reduce_pages(calls)}
+        except RuntimeError as e:
+            if len(manifest["povs"]) == 1:
+                raise
+            block = {**base, "parsed": None, "error": str(e)}
+        block["calls"] = records
+        blocks.append(block)
+    if len(blocks) == 1:
+        return blocks[0]
+    return _merge_povs(blocks, shared)
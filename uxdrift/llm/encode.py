@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+
+_URL_ORIGIN_RE = re.compile(r"^[a-z][a-z0-9+.-]*://[^/?#\s]+", re.IGNORECASE)
+# Only prefixes long enough to pay for their `refs` entry are interned.
+_MIN_PREFIX_CHARS = 16
+_MIN_PREFIX_USES = 2
+
+
+def _prune(value: Any) -> Any:
+    """Drop None / empty strings / empty containers recursively (0 and False are kept)."""
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            v = _prune(v)
+            if v is None or v == "" or v == [] or v == {}:
+                continue
+            out[str(k)] = v
+        return out
+    if isinstance(value, (list, tuple)):
+        items = [_prune(v) for v in value]
+        return [v for v in items if not (v is None or v == "" or v == [] or v == {})]
+    return value
+
+
+def _strings(value: Any, out: list[str]) -> None:
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _strings(v, out)
+    elif isinstance(value, list):
+        for v in value:
+            _strings(v, out)
+
+
+def _prefix(s: str) -> str | None:
+    m = _URL_ORIGIN_RE.match(s)
+    if m:
+        return m.group(0)
+    if s.startswith("/") and "/" in s[1:] and "\n" not in s:
+        return s.rsplit("/", 1)[0]
+    return None
+
+
+def _matches(s: str, prefix: str) -> bool:
+    return s.startswith(prefix) and (len(s) == len(prefix) or s[len(prefix)] in "/?#")
+
+
+def _intern(value: Any, refs: dict[str, str]) -> Any:
+    if isinstance(value, str):
+        for alias, prefix in refs.items():
+            if _matches(value, prefix):
+                return alias + value[len(prefix) :]
+        return value
+    if isinstance(value, dict):
+        return {k: _intern(v, refs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern(v, refs) for v in value]
+    return value
+
+
+def encode_evidence(evidence: dict[str, Any]) -> str:
+    """
+    Canonical, compact JSON for the prompt.
+
+    - minified, keys sorted, null/empty fields dropped
+    - repeated URL origins and directory prefixes are replaced by `$1`, `$2`, ...
+      defined once in a top-level `refs` object (longest prefix first, so a
+      subdirectory wins over its parent)
+
+    The same evidence always encodes to the same string, which keeps LLM cache keys
+    and provider-side prompt caches stable. That only holds across runs if the
+    evidence leaves out timings and run-dir paths (see `cli._llm_evidence`).
+    """
+    pruned = _prune(evidence)
+    strings: list[str] = []
+    _strings(pruned, strings)
+
+    counts: dict[str, int] = {}
+    for s in strings:
+        p = _prefix(s)
+        if p and len(p) >= _MIN_PREFIX_CHARS:
+            counts[p] = counts.get(p, 0) + 1
+    chosen = sorted((p for p, n in counts.items() if n >= _MIN_PREFIX_USES), key=lambda p: (-len(p), p))
+    refs = {f"${i + 1}": p for i, p in enumerate(chosen)}
+
+    body = _intern(pruned, refs) if refs else pruned
+    if refs:
+        body = {**body, "refs": refs}
+    return json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
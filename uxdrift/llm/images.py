@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+import hashlib
+import io
+import json
+import math
+import os
+from pathlib import Path
+import shutil
+from typing import Any
+
+from uxdrift.llm.cache import evict_lru
+
+
+_MIME = {"jpeg": "image/jpeg", "webp": "image/webp", "png": "image/png"}
+
+
+@dataclass(frozen=True)
+class ImageOptions:
+    """
+    How screenshots are shaped before upload.
+
+    - `max_width`: downscale wider screenshots to this width (aspect preserved)
+    - `tile_height`: after scaling, tall pages are cut into crops of this height
+    - `max_tiles`: tiles kept per screenshot (top of the page first)
+    - `format`/`quality`: re-encoding (jpeg | webp | png)
+    """
+
+    max_width: int = 1024
+    tile_height: int = 1024
+    max_tiles: int = 4
+    format: str = "jpeg"
+    quality: int = 80
+
+    def __post_init__(self) -> None:
+        if self.format not in _MIME:
+            raise ValueError(f"image format must be one of {', '.join(_MIME)}, got {self.format!r}")
+
+
+def _require_pillow() -> Any:
+    try:
+        from PIL import Image
+    except ImportError as e:  # pragma: no cover - depends on optional extras
+        raise RuntimeError("Screenshot preprocessing needs Pillow. Install with: pip install 'uxdrift[visual]'") from e
+    return Image
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """
+    Rough vision-token cost of one image (OpenAI "high" detail accounting): fit in
+    2048x2048, shortest side to 768, then 170 tokens per 512px tile + 85 base.
+    """
+    if width <= 0 or height <= 0:
+        return 0
+    scale = min(1.0, 2048 / max(width, height))
+    w, h = width * scale, height * scale
+    scale = min(1.0, 768 / min(w, h))
+    w, h = w * scale, h * scale
+    return 85 + 170 * math.ceil(w / 512) * math.ceil(h / 512)
+
+
+def _encode(im: Any, options: ImageOptions) -> bytes:
+    buf = io.BytesIO()
+    if options.format == "jpeg":
+        im.convert("RGB").save(buf, format="JPEG", quality=options.quality, optimize=True)
+    elif options.format == "webp":
+        im.save(buf, format="WEBP", quality=options.quality, method=4)
+    else:
+        im.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def _tiles(data: bytes, options: ImageOptions) -> tuple[list[tuple[bytes, int, int]], int]:
+    Image = _require_pillow()
+    with Image.open(io.BytesIO(data)) as src:
+        im = src.convert("RGBA" if options.format != "jpeg" and "A" in src.getbands() else "RGB")
+    scale = min(1.0, options.max_width / im.width)
+    if scale < 1.0:
+        im = im.resize((options.max_width, max(1, round(im.height * scale))), Image.Resampling.LANCZOS)
+
+    total = max(1, math.ceil(im.height / options.tile_height))
+    out: list[tuple[bytes, int, int]] = []
+    for i in range(min(total, options.max_tiles)):
+        crop = im.crop((0, i * options.tile_height, im.width, min(im.height, (i + 1) * options.tile_height)))
+        out.append((_encode(crop, options), crop.width, crop.height))
+    return out, total
+
+
+def _prepare_one(path: Path, *, options: ImageOptions, cache_dir: Path | None) -> dict[str, Any]:
+    data = path.read_bytes()
+    digest = hashlib.sha256(data + json.dumps(asdict(options), sort_keys=True).encode("utf-8")).hexdigest()
+    record: dict[str, Any] = {"source": str(path), "original_bytes": len(data), "format": options.format}
+
+    entry = cache_dir / digest[:2] / digest if cache_dir is not None else None
+    meta_path = entry / "meta.json" if entry is not None else None
+    if meta_path is not None and meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            tiles = [((entry / t["file"]).read_bytes(), t["width"], t["height"]) for t in meta["tiles"]]
+            # meta.json's mtime is the entry's last use, for `evict_image_cache`.
+            os.utime(meta_path)
+            return {**record, **_describe(tiles, meta["total_tiles"], options), "cached": True}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    tiles, total = _tiles(data, options)
+    if entry is not None and meta_path is not None:
+        entry.mkdir(parents=True, exist_ok=True)
+        meta_tiles = []
+        for i, (blob, w, h) in enumerate(tiles):
+            name = f"{i:02d}.{options.format}"
+            (entry / name).write_bytes(blob)
+            meta_tiles.append({"file": name, "width": w, "height": h})
+        meta_path.write_text(json.dumps({"total_tiles": total, "tiles": meta_tiles}), encoding="utf-8")
+    return {**record, **_describe(tiles, total, options), "cached": False}
+
+
+def _image_part(blob: bytes, mime: str) -> dict[str, Any]:
+    return {"type": "image_url", "image_url": {"url": f"data:{mime};base64,{base64.b64encode(blob).decode('ascii')}"}}
+
+
+def _describe(tiles: list[tuple[bytes, int, int]], total: int, options: ImageOptions) -> dict[str, Any]:
+    mime = _MIME[options.format]
+    return {
+        "parts": [_image_part(b, mime) for b, _, _ in tiles],
+        "tiles": [
+            {"width": w, "height": h, "bytes": len(b), "est_tokens": estimate_image_tokens(w, h)} for b, w, h in tiles
+        ],
+        "dropped_tiles": max(0, total - len(tiles)),
+    }
+
+
+def _passthrough(path: Path, error: str) -> dict[str, Any]:
+    data = path.read_bytes()
+    return {
+        "source": str(path),
+        "original_bytes": len(data),
+        "format": "png",
+        "parts": [_image_part(data, "image/png")],
+        "tiles": [{"bytes": len(data)}],
+        "dropped_tiles": 0,
+        "cached": False,
+        "error": error,
+    }
+
+
+def prepare_images(
+    paths: list[Path],
+    *,
+    options: ImageOptions | None = None,
+    cache_dir: Path | None = None,
+    concurrency: int = 4,
+) -> dict[str, dict[str, Any]]:
+    """
+    Tile, downscale and re-encode screenshots for upload, keyed by source path.
+
+    Each result has `parts` (ready-to-send image message parts) plus per-tile size and
+    token estimates. Results are cached under `cache_dir` by source bytes + options.
+    If preprocessing fails (e.g. Pillow missing) the original PNG is passed through
+    with an `error` note; unreadable files are left out.
+    """
+    options = options or ImageOptions()
+    unique = list(dict.fromkeys(str(p) for p in paths))
+
+    def work(raw: str) -> tuple[str, dict[str, Any] | None]:
+        path = Path(raw)
+        try:
+            return raw, _prepare_one(path, options=options, cache_dir=cache_dir)
+        except OSError:
+            return raw, None
+        except Exception as e:
+            try:
+                return raw, _passthrough(path, str(e))
+            except OSError:
+                return raw, None
+
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(unique)))) as pool:
+        results = list(pool.map(work, unique))
+    return {raw: res for raw, res in results if res is not None}
+
+
+def evict_image_cache(cache_dir: Path, *, max_bytes: int, max_age_s: int) -> dict[str, int]:
+    """Apply the LLM cache's size/age policy (see `evict_lru`) to tile cache entries."""
+    entries: list[tuple[Path, float, int]] = []
+    for meta_path in cache_dir.glob("*/*/meta.json"):
+        entry = meta_path.parent
+        try:
+            used_at = meta_path.stat().st_mtime
+            size = sum(f.stat().st_size for f in entry.iterdir())
+        except OSError:
+            continue
+        entries.append((entry, used_at, size))
+    return evict_lru(
+        entries, max_bytes=max_bytes, max_age_s=max_age_s, remove=lambda entry: shutil.rmtree(entry, ignore_errors=True)
+    )
+
+
+def image_stats(prepared: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Report-friendly summary: per-image records (without the base64 payloads) and totals."""
+    images = [{k: v for k, v in rec.items() if k != "parts"} for rec in prepared.values()]
+    tiles = [t for rec in images for t in rec.get("tiles") or []]
+    return {
+        "images": images,
+        "original_bytes": sum(int(rec.get("original_bytes") or 0) for rec in images),
+        "upload_bytes": sum(int(t.get("bytes") or 0) for t in tiles),
+        "est_tokens": sum(int(t.get("est_tokens") or 0) for t in tiles),
+    }
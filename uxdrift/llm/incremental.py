@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+import re
+from typing import Any
+
+
+# Bump when the fingerprint inputs change, so old page critiques stop matching.
+_FINGERPRINT_VERSION = 2
+_WS_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+_HEX_RE = re.compile(r"\b[0-9a-f]{8,}\b", re.IGNORECASE)
+_ERROR_SAMPLE_KEYS = (
+    "console_error_samples",
+    "console_warning_samples",
+    "page_error_samples",
+    "http_error_samples",
+    "request_failure_samples",
+)
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace and volatile tokens (hashes, counters, timestamps) so reruns compare equal."""
+    text = _HEX_RE.sub("#", text)
+    text = _DIGITS_RE.sub("0", text)
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _sample_text(sample: Any) -> str:
+    if isinstance(sample, dict):
+        # Network samples: status + URL without its query string.
+        url = str(sample.get("url") or "").split("?", 1)[0].split("#", 1)[0]
+        parts = [str(sample.get(k) or "") for k in ("status", "method", "failure")]
+        return " ".join([*parts, url])
+    return str(sample)
+
+
+def screenshot_key(path: Path, phash: int | None) -> str:
+    """The screenshot's perceptual hash when known (see `screenshot_hashes`), else a content hash."""
+    if phash is not None:
+        return f"p:{phash:016x}"
+    try:
+        return "s:" + hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def page_fingerprint(
+    page: dict[str, Any],
+    *,
+    screenshots: list[str],
+    model: str,
+    triage_model: str | None,
+    escalate_at: str,
+    pov: dict[str, Any] | None,
+    goals: list[str],
+    non_goals: list[str],
+) -> str:
+    """
+    Stable key for one page's critique: the page's identity, a hash of its normalized
+    text/aria, normalized error fingerprints, screenshot keys (see `screenshot_key`),
+    and everything else that shapes the answer (model, triage cascade, POV, goals).
+    Timings and artifact paths are left out so an unchanged page matches across runs.
+    """
+    errors = sorted(
+        {_sha(_normalize(_sample_text(s)))[:16] for key in _ERROR_SAMPLE_KEYS for s in page.get(key) or []}
+    )
+    capture_error = page.get("capture_error") or {}
+    material = {
+        "v": _FINGERPRINT_VERSION,
+        "name": page.get("name"),
+        "url": page.get("url"),
+        "title": _normalize(str(page.get("title") or "")),
+        "text": _sha(_normalize(str(page.get("aria") or page.get("text") or ""))),
+        "errors": errors,
+        "capture_error": capture_error.get("type") if isinstance(capture_error, dict) else str(capture_error),
+        "screenshots": list(screenshots),
+        "model": model,
+        "triage_model": triage_model,
+        # The escalation threshold only matters when a triage tier runs first.
+        "escalate_at": escalate_at if triage_model else None,
+        "pov": {k: (pov or {}).get(k) for k in ("name", "focus", "principles")},
+        "goals": list(goals),
+        "non_goals": list(non_goals),
+    }
+    return _sha(json.dumps(material, sort_keys=True, ensure_ascii=False, default=str))
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Any
+
+
+_DEFAULT_CONTENT = {
+    "findings": [
+        {
+            "severity": "medium",
+            "category": "usability",
+            "summary": "Primary action is below the fold on small viewports.",
+            "evidence": ["screenshot"],
+            "fix": "Move the call to action above the fold.",
+            "impact": "Users miss the main task.",
+            "confidence": 0.6,
+            "principle_tags": ["discoverability"],
+        }
+    ],
+    "pov_scorecard": [],
+    "novel_ideas": ["Sticky call to action on mobile"],
+    "next_experiments": [],
+}
+
+
+@dataclass(frozen=True)
+class MockOptions:
+    """
+    Behaviour of the local stand-in for an OpenAI-compatible chat endpoint.
+
+    - `latency_ms` (+ uniform `jitter_ms`): delay before the response starts
+    - `chunks`/`chunk_delay_ms`: how streamed responses are split and paced
+    - `throttle_rate`: fraction of requests answered 429 with `retry_after_s`
+    - `responses`: JSON file with one canned response (object or string) or a list
+      of them, served round-robin; the default is a single small finding
+    """
+
+    latency_ms: float = 200.0
+    jitter_ms: float = 0.0
+    chunks: int = 8
+    chunk_delay_ms: float = 5.0
+    throttle_rate: float = 0.0
+    retry_after_s: float = 1.0
+    responses: Path | None = None
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.throttle_rate <= 1.0:
+            raise ValueError(f"throttle_rate must be between 0 and 1, got {self.throttle_rate}")
+
+
+def _load_responses(path: Path | None) -> list[str]:
+    if path is None:
+        return [json.dumps(_DEFAULT_CONTENT)]
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    items = raw if isinstance(raw, list) else [raw]
+    if not items:
+        raise ValueError(f"No canned responses in {path}")
+    return [item if isinstance(item, str) else json.dumps(item) for item in items]
+
+
+class MockLlmServer:
+    """
+    Threaded local server speaking `POST /v1/chat/completions` (plain and SSE streaming),
+    for exercising critique/openai_compat without a provider. Use as a context manager
+    or via `start()`/`stop()`; `stats()` counts requests, throttles and bytes.
+    """
+
+    def __init__(self, options: MockOptions | None = None, *, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.options = options or MockOptions()
+        self._responses = itertools.cycle(_load_responses(self.options.responses))
+        self._random = random.Random(self.options.seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "throttled": 0, "streamed": 0, "bytes_received": 0, "bytes_sent": 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> MockLlmServer:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> MockLlmServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for k, v in deltas.items():
+                self._stats[k] += v
+
+    def _next(self) -> tuple[bool, str, float]:
+        """(throttle?, canned content, delay seconds) for one request."""
+        o = self.options
+        with self._lock:
+            throttle = self._random.random() < o.throttle_rate
+            content = next(self._responses)
+            delay = (o.latency_ms + self._random.uniform(0, o.jitter_ms)) / 1000
+        return throttle, content, delay
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, data: bytes, headers: dict[str, str]) -> None:
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                mock._count(bytes_sent=len(data))
+
+            def do_POST(self) -> None:  # noqa: N802
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                mock._count(requests=1, bytes_received=len(raw))
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, b'{"error":{"message":"not found"}}', {"Content-Type": "application/json"})
+                    return
+                try:
+                    body = json.loads(raw or b"{}")
+                except ValueError:
+                    self._send(400, b'{"error":{"message":"invalid JSON"}}', {"Content-Type": "application/json"})
+                    return
+                throttle, content, delay = mock._next()
+                if throttle:
+                    mock._count(throttled=1)
+                    error = json.dumps({"error": {"message": "rate limited (mock)", "type": "rate_limit"}}).encode()
+                    headers = {"Content-Type": "application/json", "Retry-After": f"{mock.options.retry_after_s:g}"}
+                    self._send(429, error, headers)
+                    return
+                time.sleep(delay)
+                usage = {
+                    "prompt_tokens": len(raw) // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": len(raw) // 4 + len(content) // 4,
+                }
+                model = str(body.get("model") or "mock")
+                if body.get("stream"):
+                    mock._count(streamed=1)
+                    self._stream(content, usage, model)
+                    return
+                resp = {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion",
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                }
+                self._send(200, json.dumps(resp).encode("utf-8"), {"Content-Type": "application/json"})
+
+            def _stream(self, content: str, usage: dict[str, int], model: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                n = max(1, mock.options.chunks)
+                size = max(1, -(-len(content) // n))
+                pieces = [content[i : i + size] for i in range(0, len(content), size)]
+                events = [{"model": model, "choices": [{"index": 0, "delta": {"content": p}}]} for p in pieces]
+                events.append({"model": model, "choices": [], "usage": usage})
+                for i, event in enumerate(events):
+                    if i:
+                        time.sleep(mock.options.chunk_delay_ms / 1000)
+                    self._chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self._chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+                mock._count(bytes_sent=len(data))
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return Handler
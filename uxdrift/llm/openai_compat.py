@@ -1,15 +1,288 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import json
+import threading
+import time
 from typing import Any
 
 import httpx
 
+from uxdrift.llm.cache import LlmCache, cache_key
+from uxdrift.llm.ratelimit import RETRY_STATUSES, RateLimiter, RetryPolicy, retry_after_seconds
+
 
 class OpenAICompatError(RuntimeError):
     pass
 
 
+@dataclass(frozen=True)
+class ClientSettings:
+    max_connections: int = 10
+    max_keepalive_connections: int = 10
+    keepalive_expiry_s: float = 30.0
+    http2: bool = False
+    timeout_s: float = 60.0
+
+
+_lock = threading.Lock()
+_settings = ClientSettings()
+_client: httpx.Client | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _client_kwargs() -> dict[str, Any]:
+    return {
+        "timeout": _settings.timeout_s,
+        "limits": httpx.Limits(
+            max_connections=_settings.max_connections,
+            max_keepalive_connections=_settings.max_keepalive_connections,
+            keepalive_expiry=_settings.keepalive_expiry_s,
+        ),
+        # HTTP/2 needs the optional `h2` package (pip install 'httpx[http2]'); fall back to HTTP/1.1.
+        "http2": _settings.http2 and _http2_available(),
+    }
+
+
+def configure_client(settings: ClientSettings) -> None:
+    """Set pool settings for the shared client; an existing client is closed and rebuilt lazily."""
+    global _settings
+    close_clients()
+    with _lock:
+        _settings = settings
+
+
+def get_client() -> httpx.Client:
+    """Process-wide keep-alive client, shared by every (threaded) critique call."""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(**_client_kwargs())
+        return _client
+
+
+def close_clients() -> None:
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+class _ConnectionTrace:
+    """httpcore trace hook: a TCP connect during the request means the pool had no idle connection."""
+
+    def __init__(self) -> None:
+        self.new_connection = False
+
+    def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name.startswith("connection.connect_tcp"):
+            self.new_connection = True
+
+
+def chat_payload(
+    *, model: str, messages: list[dict[str, Any]], temperature: float = 0.2, max_tokens: int = 1200
+) -> dict[str, Any]:
+    """The JSON body of a chat completions request (also used for batch input lines)."""
+    return {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+
+
+def _request(
+    *, base_url: str, api_key: str, model: str, messages: list[dict[str, Any]], temperature: float, max_tokens: int
+) -> tuple[str, dict[str, str], dict[str, Any]]:
+    url = base_url.rstrip("/") + "/chat/completions"
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    payload = chat_payload(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+    return url, headers, payload
+
+
+def _cached(
+    cache: LlmCache | None, key: str, *, model: str, images: int, stats: list[dict[str, Any]] | None
+) -> dict[str, Any] | None:
+    if cache is None:
+        return None
+    started = time.perf_counter()
+    resp = cache.get(key)
+    if resp is not None and stats is not None:
+        stats.append(
+            {
+                "model": model,
+                "latency_ms": int(round((time.perf_counter() - started) * 1000)),
+                "bytes_sent": 0,
+                "images": images,
+                "new_connection": False,
+                "cache_hit": True,
+                "cache_key": key,
+            }
+        )
+    return resp
+
+
+def _record(
+    stats: list[dict[str, Any]] | None,
+    *,
+    model: str,
+    started: float,
+    body: bytes,
+    r: httpx.Response | None,
+    trace: _ConnectionTrace,
+    error: str | None = None,
+    extra: dict[str, Any] | None = None,
+) -> None:
+    if stats is None:
+        return
+    rec: dict[str, Any] = {
+        "model": model,
+        "latency_ms": int(round((time.perf_counter() - started) * 1000)),
+        "bytes_sent": len(body),
+        "new_connection": trace.new_connection,
+    }
+    if r is not None:
+        rec["status"] = r.status_code
+        rec["bytes_received"] = r.num_bytes_downloaded
+        rec["http_version"] = r.http_version
+    if extra:
+        rec.update(extra)
+    if error:
+        rec["error"] = error
+    stats.append(rec)
+
+
+def _payload_size(payload: dict[str, Any]) -> tuple[int, int]:
+    """(text chars, image parts) across the request's messages."""
+    chars = 0
+    images = 0
+    for m in payload.get("messages") or []:
+        content = m.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "image_url":
+                images += 1
+            else:
+                chars += len(str(part.get("text") or ""))
+    return chars, images
+
+
+def _estimate_request_tokens(payload: dict[str, Any]) -> int:
+    """Rough token cost for rate limiting: text chars / 4, a flat cost per image, plus max_tokens."""
+    chars, images = _payload_size(payload)
+    return chars // 4 + images * 765 + int(payload.get("max_tokens") or 0)
+
+
+def _usage_tokens(usage: Any) -> dict[str, int]:
+    """Prompt/completion token counts from a response `usage` object, for stats records."""
+    if not isinstance(usage, dict):
+        return {}
+    out = {}
+    for k in ("prompt_tokens", "completion_tokens"):
+        if isinstance(usage.get(k), int):
+            out[k] = usage[k]
+    return out
+
+
+def _response_usage(r: httpx.Response) -> dict[str, int]:
+    try:
+        body = r.json()
+    except ValueError:
+        return {}
+    return _usage_tokens(body.get("usage") if isinstance(body, dict) else None)
+
+
+class _Attempt:
+    """Bookkeeping for one HTTP attempt (stats record extras, timing, connection trace)."""
+
+    def __init__(self, attempt: int, extra: dict[str, Any]) -> None:
+        self.trace = _ConnectionTrace()
+        self.started = time.perf_counter()
+        self.extra = {**extra, **({"attempt": attempt} if attempt else {})}
+
+    def waited(self, seconds: float) -> None:
+        if seconds >= 0.001:
+            self.extra["limiter_wait_ms"] = int(round(seconds * 1000))
+
+
+def _failed(r: httpx.Response) -> OpenAICompatError:
+    return OpenAICompatError(f"LLM request failed ({r.status_code}): {r.text[:500]}")
+
+
+def _send(
+    *,
+    url: str,
+    headers: dict[str, str],
+    body: bytes,
+    timeout_s: float | None,
+    model: str,
+    stream: bool,
+    est_tokens: int,
+    stats: list[dict[str, Any]] | None,
+    limiter: RateLimiter | None,
+    retry: RetryPolicy | None,
+    extra: dict[str, Any],
+) -> tuple[httpx.Response, _Attempt]:
+    """
+    POST with limiter admission and retries on transport errors / retryable statuses.
+    Every attempt is recorded in `stats`. For non-streaming calls the limiter slot is
+    released here; for streams the caller releases it once the body has been consumed.
+    """
+    client = get_client()
+    attempt = 0
+    while True:
+        a = _Attempt(attempt, extra)
+        if limiter is not None:
+            a.waited(limiter.acquire(est_tokens))
+        request = client.build_request(
+            "POST",
+            url,
+            headers=headers,
+            content=body,
+            timeout=timeout_s if timeout_s is not None else httpx.USE_CLIENT_DEFAULT,
+            extensions={"trace": a.trace},
+        )
+        try:
+            r = client.send(request, stream=stream)
+        except httpx.TransportError as e:
+            if limiter is not None:
+                limiter.release(status=None)
+            _record(stats, model=model, started=a.started, body=body, r=None, trace=a.trace, error=str(e), extra=a.extra)
+            if retry is None or attempt >= retry.max_retries:
+                raise
+            delay = retry.delay(attempt)
+        else:
+            retry_after = retry_after_seconds(r.headers)
+            if limiter is not None and (r.status_code >= 400 or not stream):
+                limiter.release(status=r.status_code, retry_after_s=retry_after)
+            if r.status_code < 400:
+                if not stream:
+                    a.extra.update(_response_usage(r))
+                    _record(stats, model=model, started=a.started, body=body, r=r, trace=a.trace, extra=a.extra)
+                return r, a
+            r.read()
+            r.close()
+            _record(stats, model=model, started=a.started, body=body, r=r, trace=a.trace, extra=a.extra)
+            if retry is None or attempt >= retry.max_retries or r.status_code not in RETRY_STATUSES:
+                raise _failed(r)
+            delay = retry.delay(attempt, retry_after)
+        attempt += 1
+        if limiter is not None:
+            limiter.note_retry()
+        time.sleep(delay)
+
+
 def chat_completions(
     *,
     base_url: str,
@@ -18,22 +291,168 @@ def chat_completions(
     messages: list[dict[str, Any]],
     temperature: float = 0.2,
     max_tokens: int = 1200,
-    timeout_s: float = 60.0,
+    timeout_s: float | None = None,
+    stats: list[dict[str, Any]] | None = None,
+    cache: LlmCache | None = None,
+    limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
 ) -> dict[str, Any]:
-    url = base_url.rstrip("/") + "/chat/completions"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    payload: dict[str, Any] = {
-        "model": model,
-        "messages": messages,
-        "temperature": temperature,
-        "max_tokens": max_tokens,
-    }
+    url, headers, payload = _request(
+        base_url=base_url, api_key=api_key, model=model, messages=messages, temperature=temperature, max_tokens=max_tokens
+    )
+    key = cache_key(payload, base_url=base_url) if cache is not None else ""
+    images = _payload_size(payload)[1]
+    hit = _cached(cache, key, model=model, images=images, stats=stats)
+    if hit is not None:
+        return hit
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    r, _ = _send(
+        url=url,
+        headers=headers,
+        body=body,
+        timeout_s=timeout_s,
+        model=model,
+        stream=False,
+        est_tokens=_estimate_request_tokens(payload),
+        stats=stats,
+        limiter=limiter,
+        retry=retry,
+        extra={"images": images},
+    )
+    resp = r.json()
+    if cache is not None:
+        cache.put(key, resp, model=model)
+    return resp
+
+
+_SSE_DONE = object()
 
-    with httpx.Client(timeout=timeout_s) as client:
-        r = client.post(url, headers=headers, json=payload)
-        if r.status_code >= 400:
-            raise OpenAICompatError(f"LLM request failed ({r.status_code}): {r.text[:500]}")
-        return r.json()
+
+def _sse_event(line: str) -> Any:
+    """One parsed `data:` payload of an OpenAI-style SSE stream, `_SSE_DONE`, or None to skip."""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return _SSE_DONE
+    try:
+        event = json.loads(data)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def _delta_text(event: dict[str, Any]) -> str:
+    choices = event.get("choices") or []
+    if not choices:
+        return ""
+    content = (choices[0].get("delta") or {}).get("content")
+    return content if isinstance(content, str) else ""
+
+
+def _stream_body(payload: dict[str, Any]) -> bytes:
+    body = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def _streamed_response(parts: list[str], usage: Any) -> dict[str, Any]:
+    return {"choices": [{"message": {"role": "assistant", "content": "".join(parts)}}], "usage": usage}
+
+
+def chat_completions_stream(
+    *,
+    base_url: str,
+    api_key: str,
+    model: str,
+    messages: list[dict[str, Any]],
+    temperature: float = 0.2,
+    max_tokens: int = 1200,
+    timeout_s: float | None = None,
+    stats: list[dict[str, Any]] | None = None,
+    cache: LlmCache | None = None,
+    limiter: RateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    on_delta: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Like `chat_completions`, but requests an SSE stream and calls `on_delta` with each
+    text chunk as it arrives. Returns the assembled response in the non-streaming shape,
+    so it can be cached and parsed the same way. Cache hits replay as a single chunk.
+    Retries only happen before the stream starts, so no delta is ever delivered twice.
+    """
+    url, headers, payload = _request(
+        base_url=base_url, api_key=api_key, model=model, messages=messages, temperature=temperature, max_tokens=max_tokens
+    )
+    key = cache_key(payload, base_url=base_url) if cache is not None else ""
+    images = _payload_size(payload)[1]
+    hit = _cached(cache, key, model=model, images=images, stats=stats)
+    if hit is not None:
+        if on_delta is not None:
+            on_delta(extract_text(hit))
+        return hit
+
+    body = _stream_body(payload)
+    r, a = _send(
+        url=url,
+        headers=headers,
+        body=body,
+        timeout_s=timeout_s,
+        model=model,
+        stream=True,
+        est_tokens=_estimate_request_tokens(payload),
+        stats=stats,
+        limiter=limiter,
+        retry=retry,
+        extra={"stream": True, "images": images},
+    )
+    parts: list[str] = []
+    usage: Any = None
+    done = False
+    try:
+        for line in r.iter_lines():
+            event = _sse_event(line)
+            if event is _SSE_DONE:
+                # Read on to the end of the body so the connection goes back to the pool.
+                done = True
+            if done or event is None:
+                continue
+            usage = event.get("usage") or usage
+            delta = _delta_text(event)
+            if not delta:
+                continue
+            if not parts:
+                a.extra["ttft_ms"] = int(round((time.perf_counter() - a.started) * 1000))
+            parts.append(delta)
+            if on_delta is not None:
+                on_delta(delta)
+    except httpx.HTTPError as e:
+        _record(stats, model=model, started=a.started, body=body, r=None, trace=a.trace, error=str(e), extra=a.extra)
+        raise
+    finally:
+        r.close()
+        if limiter is not None:
+            limiter.release(status=r.status_code)
+    a.extra.update(_usage_tokens(usage))
+    _record(stats, model=model, started=a.started, body=body, r=r, trace=a.trace, extra=a.extra)
+    resp = _streamed_response(parts, usage)
+    if cache is not None:
+        cache.put(key, resp, model=model)
+    return resp
+
+
+def summarize_calls(stats: list[dict[str, Any]]) -> dict[str, Any]:
+    latencies = sorted(int(s.get("latency_ms") or 0) for s in stats)
+    return {
+        "calls": len(stats),
+        "connections_opened": sum(1 for s in stats if s.get("new_connection")),
+        "connections_reused": sum(1 for s in stats if not s.get("new_connection") and "status" in s),
+        "cache_hits": sum(1 for s in stats if s.get("cache_hit")),
+        "retries": sum(1 for s in stats if s.get("attempt")),
+        "bytes_sent": sum(int(s.get("bytes_sent") or 0) for s in stats),
+        "bytes_received": sum(int(s.get("bytes_received") or 0) for s in stats),
+        "latency_ms_total": sum(latencies),
+        "latency_ms_max": latencies[-1] if latencies else 0,
+    }
 
 
 def extract_text(resp: dict[str, Any]) -> str:
@@ -46,4 +465,3 @@ def extract_text(resp: dict[str, Any]) -> str:
         return content
     # Some providers might return structured content; best-effort stringify.
     return json.dumps(content, ensure_ascii=False)
-
@@ -78,3 +78,74 @@ def parse_json_object(text: str) -> dict[str, Any] | None:
 
     return None
 
+
+class FindingsStreamParser:
+    """
+    Incremental scanner for the critique JSON: feed text chunks as they stream in and
+    get back each `findings[]` element as soon as its closing brace arrives.
+
+    Only the top-level object's `findings` array is tracked; prose or a code fence
+    before the first `{` is skipped. Elements that are not valid JSON objects are dropped.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_str = False
+        self._escape = False
+        self._str_start = -1
+        self._last_key: str | None = None
+        self._in_findings = False
+        self._elem_start = -1
+        self._done = False
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        self._text += chunk
+        text = self._text
+        out: list[dict[str, Any]] = []
+        i = self._pos
+        while i < len(text) and not self._done:
+            ch = text[i]
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_str = False
+                    if len(self._stack) == 1:
+                        try:
+                            self._last_key = json.loads(text[self._str_start : i + 1])
+                        except ValueError:
+                            self._last_key = None
+            elif ch == '"':
+                if self._stack:
+                    self._in_str = True
+                    self._str_start = i
+            elif ch in "{[":
+                if ch == "{" and self._in_findings and len(self._stack) == 2:
+                    self._elem_start = i
+                if ch == "[" and self._stack == ["{"] and self._last_key == "findings":
+                    self._in_findings = True
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if ch == "}" and self._in_findings and len(self._stack) == 2 and self._elem_start >= 0:
+                    try:
+                        item = json.loads(text[self._elem_start : i + 1])
+                    except ValueError:
+                        item = None
+                    if isinstance(item, dict):
+                        out.append(item)
+                    self._elem_start = -1
+                elif ch == "]" and self._in_findings and len(self._stack) == 1:
+                    self._in_findings = False
+                if not self._stack:
+                    self._done = True
+            elif ch == "," and len(self._stack) == 1:
+                self._last_key = None
+            i += 1
+        self._pos = i
+        return out
+
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from typing import Any
 
+from uxdrift.llm.encode import encode_evidence
+
 
 def build_messages(
     *,
     goals: list[str],
     non_goals: list[str],
-    evidence: dict[str, Any],
+    evidence: dict[str, Any] | str,
     images: list[dict[str, Any]],
     pov: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
@@ -45,6 +47,12 @@ def build_messages(
     system = (
         "You are uxdrift, a UX evaluator.\n"
         "You will be given goals/non-goals and concrete browser evidence (errors + screenshots + minimal page text).\n"
+        "Evidence is minified JSON with null/empty fields omitted. Strings starting with `$1`, `$2`, ...\n"
+        "begin with the prefix defined under `refs` (e.g. `$1/checkout` with refs {\"$1\": \"https://x.test\"}).\n"
+        "Text repeated across pages (navigation, sidebars, footers) is removed from each page and sent once\n"
+        "under `shared_chrome`; judge it once rather than per page.\n"
+        "A page may carry `aria` instead of `text`: a compact accessibility-tree outline, one node per line,\n"
+        "indented by depth, as `role \"name\" [states] inline-text`.\n"
         "Your job:\n"
         "- Identify glitches, UX issues, and opportunities.\n"
         "- Prioritize by user impact.\n"
@@ -78,13 +86,14 @@ def build_messages(
         "}\n"
     )
 
+    # Static parts first (system prompt, goals) so provider-side prompt caches can reuse the prefix.
     user_text = (
         "Goals:\n"
         f"{goals_text}\n\n"
         "Non-goals:\n"
         f"{non_goals_text}\n\n"
         "Evidence (JSON):\n"
-        f"{evidence}\n"
+        f"{evidence if isinstance(evidence, str) else encode_evidence(evidence)}\n"
     )
 
     user_content: list[dict[str, Any]] = [{"type": "text", "text": user_text}]
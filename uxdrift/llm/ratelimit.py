@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+from typing import Any
+
+
+# Statuses worth retrying: throttling, overload and transient gateway failures.
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+# Statuses that mean "slow down" rather than "try again".
+_THROTTLE_STATUSES = frozenset({429, 503, 529})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retries for transient LLM failures: Retry-After when given, else full-jitter exponential backoff."""
+
+    max_retries: int = 3
+    base_delay_s: float = 1.0
+    max_delay_s: float = 30.0
+
+    def delay(self, attempt: int, retry_after_s: float | None = None) -> float:
+        if retry_after_s is not None:
+            return min(self.max_delay_s, retry_after_s) + random.uniform(0, self.base_delay_s / 4)
+        return random.uniform(0, min(self.max_delay_s, self.base_delay_s * (2**attempt)))
+
+
+def retry_after_seconds(headers: Any) -> float | None:
+    """Parse `Retry-After` (delta-seconds or HTTP date); also accepts `retry-after-ms`."""
+    raw_ms = headers.get("retry-after-ms") if headers is not None else None
+    if raw_ms:
+        try:
+            return max(0.0, float(raw_ms) / 1000)
+        except ValueError:
+            pass
+    raw = headers.get("retry-after") if headers is not None else None
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RateLimiter:
+    """
+    Shared limiter for LLM calls across threads.
+
+    - token buckets for requests/min and (estimated) tokens/min; 0 disables a bucket
+    - adaptive concurrency (AIMD): a throttle response halves the in-flight limit and
+      pauses everyone for Retry-After; each run of `limit` successes raises it by one,
+      up to `max_concurrency`
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_min: int = 0,
+        tokens_per_min: int = 0,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+    ) -> None:
+        self.requests_per_min = requests_per_min
+        self.tokens_per_min = tokens_per_min
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self._cond = threading.Condition()
+        self._limit = self.max_concurrency
+        self._in_flight = 0
+        self._req_level = float(requests_per_min)
+        self._tok_level = float(tokens_per_min)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._stats = {"requests": 0, "throttled": 0, "errors": 0, "retries": 0, "waited_ms": 0}
+        self._lowest_limit = self._limit
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled
+        self._refilled = now
+        if self.requests_per_min:
+            self._req_level = min(self.requests_per_min, self._req_level + elapsed * self.requests_per_min / 60)
+        if self.tokens_per_min:
+            self._tok_level = min(self.tokens_per_min, self._tok_level + elapsed * self.tokens_per_min / 60)
+
+    def _wait_s(self, now: float, tokens: int) -> float | None:
+        """Seconds until a request of `tokens` could start, or None if it can start now."""
+        waits: list[float] = []
+        if now < self._paused_until:
+            waits.append(self._paused_until - now)
+        if self.requests_per_min and self._req_level < 1:
+            waits.append((1 - self._req_level) * 60 / self.requests_per_min)
+        if self.tokens_per_min and self._tok_level < tokens:
+            waits.append((tokens - self._tok_level) * 60 / self.tokens_per_min)
+        if self._in_flight >= self._limit:
+            waits.append(0.5)  # woken early by release()
+        return max(waits) if waits else None
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request may start; returns seconds waited."""
+        if self.tokens_per_min:
+            tokens = min(tokens, self.tokens_per_min)  # a single huge request must still fit eventually
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_s(now, tokens)
+                if wait is None:
+                    break
+                self._cond.wait(timeout=wait)
+            if self.requests_per_min:
+                self._req_level -= 1
+            if self.tokens_per_min:
+                self._tok_level -= tokens
+            self._in_flight += 1
+            self._stats["requests"] += 1
+            waited = time.monotonic() - started
+            self._stats["waited_ms"] += int(round(waited * 1000))
+            return waited
+
+    def release(self, *, status: int | None, retry_after_s: float | None = None) -> None:
+        """Finish a request started with `acquire`; `status` None means a transport error."""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if status in _THROTTLE_STATUSES:
+                self._stats["throttled"] += 1
+                self._limit = max(self.min_concurrency, self._limit // 2)
+                self._lowest_limit = min(self._lowest_limit, self._limit)
+                self._successes = 0
+                pause = retry_after_s if retry_after_s is not None else 1.0
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            elif status is None or status >= 400:
+                self._stats["errors"] += 1
+            else:
+                self._successes += 1
+                if self._successes >= self._limit and self._limit < self.max_concurrency:
+                    self._limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def note_retry(self) -> None:
+        with self._cond:
+            self._stats["retries"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "requests_per_min": self.requests_per_min,
+                "tokens_per_min": self.tokens_per_min,
+                "max_concurrency": self.max_concurrency,
+                "concurrency_limit": self._limit,
+                "lowest_concurrency_limit": self._lowest_limit,
+            }
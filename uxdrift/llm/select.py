@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from uxdrift.llm.budget import page_has_errors
+from uxdrift.phash import hamming, phash
+
+
+# Screenshots within this many phash bits of an already-selected one are near-duplicates.
+_NEAR_DUPLICATE_BITS = 6
+_PAGE_WEIGHT = 1.0
+_STEP_WEIGHT = 0.5
+_FINAL_STEP_BONUS = 0.3
+_ERROR_BONUS = 1.0
+_NEW_PAGE_BONUS = 0.5
+
+
+@dataclass(frozen=True)
+class ScreenshotCandidate:
+    path: str
+    page: str | None
+    kind: str  # "page" (the page's own screenshot) or "step"
+    order: int
+    step: int | None = None
+    final_step: bool = False
+    has_errors: bool = False
+    phash: int | None = None
+
+
+def screenshot_hashes(paths: list[Path], *, concurrency: int = 4) -> dict[str, int | None]:
+    """Perceptual hash per screenshot; None where it cannot be computed (e.g. no `visual` extra)."""
+
+    def one(raw: str) -> int | None:
+        try:
+            return phash(Path(raw))
+        except Exception:
+            return None
+
+    unique = list(dict.fromkeys(str(p) for p in paths))
+    if not unique:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(unique)))) as pool:
+        return dict(zip(unique, pool.map(one, unique)))
+
+
+def screenshot_candidates(
+    *,
+    pages: list[dict[str, Any]],
+    page_screenshots: list[list[Path]] | None,
+    screenshot_paths: list[Path],
+    phashes: dict[str, int | None],
+) -> list[ScreenshotCandidate]:
+    """Candidates with page/step/error context; without `page_screenshots` only paths are known."""
+    out: list[ScreenshotCandidate] = []
+    if page_screenshots is None:
+        for p in screenshot_paths:
+            out.append(ScreenshotCandidate(path=str(p), page=None, kind="page", order=len(out), phash=phashes.get(str(p))))
+        return out
+    for i, shots in enumerate(page_screenshots):
+        page = pages[i] if i < len(pages) else {}
+        # The evidence names the page screenshot by file name only (see cli._llm_page_evidence).
+        main = Path(str(page.get("screenshot") or "")).name
+        steps = [str(s) for s in shots if Path(s).name != main]
+        for s in shots:
+            raw = str(s)
+            step = None if Path(raw).name == main else steps.index(raw)
+            out.append(
+                ScreenshotCandidate(
+                    path=raw,
+                    page=page.get("name"),
+                    kind="page" if step is None else "step",
+                    order=len(out),
+                    step=step,
+                    final_step=step is not None and step == len(steps) - 1,
+                    has_errors=page_has_errors(page),
+                    phash=phashes.get(raw),
+                )
+            )
+    return out
+
+
+def _importance(c: ScreenshotCandidate) -> tuple[float, list[str]]:
+    if c.kind == "page":
+        score, reasons = _PAGE_WEIGHT, ["page screenshot"]
+    else:
+        score, reasons = _STEP_WEIGHT, [f"step {c.step}"]
+        if c.final_step:
+            score += _FINAL_STEP_BONUS
+            reasons = [f"final step {c.step}"]
+    if c.has_errors:
+        score += _ERROR_BONUS if c.kind == "page" else _ERROR_BONUS / 2
+        reasons.append("page has errors")
+    return score, reasons
+
+
+def select_screenshots(
+    candidates: list[ScreenshotCandidate],
+    *,
+    prepared: dict[str, dict[str, Any]],
+    budget: int,
+) -> tuple[list[tuple[str, int]], dict[str, Any]]:
+    """
+    Pick the most informative screenshots for `budget` image tiles.
+
+    Greedy: each round takes the candidate with the best importance (page screenshot >
+    final step > other steps, error pages boosted) + a bonus for a page not yet shown +
+    novelty (phash distance to what is already picked). Near-duplicates of a picked
+    image are skipped. Each pick sends its top tile; leftover budget adds lower tiles
+    of the picks in rank order. Returns ((path, tile index) in capture order, record).
+    """
+    pool = [c for c in candidates if (prepared.get(c.path) or {}).get("tiles")]
+    picked: list[tuple[ScreenshotCandidate, float, list[str]]] = []
+    skipped: list[dict[str, Any]] = []
+    seen_paths: set[str] = set()
+    while pool and len(picked) < budget:
+        best: tuple[float, ScreenshotCandidate, list[str]] | None = None
+        for c in list(pool):
+            if c.path in seen_paths:
+                pool.remove(c)
+                continue
+            score, reasons = _importance(c)
+            near = [(hamming(c.phash, p.phash), p) for p, _, _ in picked if c.phash is not None and p.phash is not None]
+            if near:
+                dist, other = min(near, key=lambda x: x[0])
+                if dist <= _NEAR_DUPLICATE_BITS:
+                    pool.remove(c)
+                    skipped.append(
+                        {
+                            "path": c.path,
+                            "page": c.page,
+                            "reason": "near_duplicate",
+                            "duplicate_of": other.path,
+                            "distance": dist,
+                        }
+                    )
+                    continue
+                score += min(1.0, dist / 32)
+                reasons = [*reasons, f"novel ({dist} bits from nearest pick)"]
+            else:
+                score += 1.0
+            if c.page is not None and all(p.page != c.page for p, _, _ in picked):
+                score += _NEW_PAGE_BONUS
+                reasons = [*reasons, "first image of its page"]
+            if best is None or score > best[0]:
+                best = (score, c, reasons)
+        if best is None:
+            break
+        score, c, reasons = best
+        pool.remove(c)
+        seen_paths.add(c.path)
+        picked.append((c, score, reasons))
+    for c in pool:
+        skipped.append({"path": c.path, "page": c.page, "reason": "over_budget"})
+
+    tiles: dict[str, list[int]] = {c.path: [0] for c, _, _ in picked}
+    room = budget - len(picked)
+    for c, _, _ in picked:
+        extra = len((prepared.get(c.path) or {}).get("tiles") or []) - 1
+        take = max(0, min(extra, room))
+        tiles[c.path].extend(range(1, 1 + take))
+        room -= take
+
+    ordered = sorted(picked, key=lambda x: x[0].order)
+    picks = [(c.path, n) for c, _, _ in ordered for n in tiles[c.path]]
+    record = {
+        "budget": budget,
+        "candidates": len(candidates),
+        "selected": [
+            {"path": c.path, "page": c.page, "kind": c.kind, "tiles": len(tiles[c.path]), "score": round(s, 2), "reasons": r}
+            for c, s, r in picked
+        ],
+        "skipped": skipped,
+    }
+    return picks, record
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+
+# USD per 1M tokens (public list prices when written). Override or extend with a
+# prices file: {"model": {"input": 0.15, "output": 0.6}, ...}.
+DEFAULT_PRICES: dict[str, dict[str, float]] = {
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "output": 10.00},
+    "gpt-4.1-nano": {"input": 0.10, "output": 0.40},
+    "gpt-4.1-mini": {"input": 0.40, "output": 1.60},
+    "gpt-4.1": {"input": 2.00, "output": 8.00},
+    "o4-mini": {"input": 1.10, "output": 4.40},
+}
+# Batch API calls are billed at half the interactive list price.
+_BATCH_PRICE_FACTOR = 0.5
+GROUP_BY = ("model", "tier", "pov", "page", "run", "day", "month")
+# Per-call fields kept in the run log and the history (everything else in a stats record is dropped).
+_RECORD_KEYS = (
+    "model",
+    "tier",
+    "pov",
+    "page",
+    "prompt_tokens",
+    "completion_tokens",
+    "images",
+    "bytes_sent",
+    "bytes_received",
+    "latency_ms",
+    "ttft_ms",
+    "limiter_wait_ms",
+    "attempt",
+    "status",
+    "stream",
+    "batch",
+    "cache_hit",
+    "new_connection",
+    "error",
+)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (`q` in 0..100); 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return float(ordered[min(rank, len(ordered)) - 1])
+
+
+def load_prices(path: Path | None) -> dict[str, dict[str, float]]:
+    """`DEFAULT_PRICES` with entries from the JSON file at `path` (if it exists) on top."""
+    prices = dict(DEFAULT_PRICES)
+    if path is None or not path.exists():
+        return prices
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"Prices file must be a JSON object of model -> {{input, output}}: {path}")
+    for model, entry in data.items():
+        if not isinstance(entry, dict) or not {"input", "output"} <= set(entry):
+            raise ValueError(f"Price for {model!r} needs 'input' and 'output' (USD per 1M tokens): {path}")
+        prices[str(model)] = {"input": float(entry["input"]), "output": float(entry["output"])}
+    return prices
+
+
+def price_for(model: str, prices: dict[str, dict[str, float]]) -> dict[str, float] | None:
+    """Exact match, else the longest price-table key the model name starts with (dated snapshots)."""
+    if model in prices:
+        return prices[model]
+    matches = [k for k in prices if model.startswith(k)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def call_cost(record: dict[str, Any], prices: dict[str, dict[str, float]]) -> float | None:
+    """
+    Estimated USD for one call record: 0 for cache hits and failed attempts, None when
+    the tokens or the model's price are unknown. Batch calls get the batch discount.
+    """
+    if record.get("cache_hit") or record.get("error") or int(record.get("status") or 0) >= 400:
+        return 0.0
+    price = price_for(str(record.get("model") or ""), prices)
+    if price is None or "prompt_tokens" not in record:
+        return None
+    prompt = int(record["prompt_tokens"])
+    completion = int(record.get("completion_tokens") or 0)
+    cost = (price["input"] * prompt + price["output"] * completion) / 1e6
+    return cost * _BATCH_PRICE_FACTOR if record.get("batch") else cost
+
+
+def call_records(llm_block: dict[str, Any], *, run_id: str, at: str) -> list[dict[str, Any]]:
+    """Flatten an `llm` report block's per-call stats (including per-POV blocks) into log records."""
+    blocks = [b for b in llm_block.get("povs") or [] if isinstance(b, dict)] or [llm_block]
+    out = []
+    for block in blocks:
+        for rec in block.get("calls") or []:
+            out.append({"at": at, "run": run_id, **{k: rec[k] for k in _RECORD_KEYS if k in rec}})
+    return out
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def write_call_log(path: Path, records: list[dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records), encoding="utf-8")
+
+
+def append_history(root: Path, records: list[dict[str, Any]]) -> None:
+    """Append records to `root/<YYYY-MM>.jsonl`, so queries over a date range only read the months they need."""
+    by_month: dict[str, list[dict[str, Any]]] = {}
+    for r in records:
+        by_month.setdefault(str(r.get("at") or "")[:7] or "unknown", []).append(r)
+    root.mkdir(parents=True, exist_ok=True)
+    for month, recs in by_month.items():
+        with (root / f"{month}.jsonl").open("a", encoding="utf-8") as f:
+            for r in recs:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+
+def load_history(root: Path, *, since: str | None = None, until: str | None = None) -> list[dict[str, Any]]:
+    """Records with `since <= at < until` (ISO date/time prefixes, e.g. "2026-10" or "2026-10-01")."""
+    out: list[dict[str, Any]] = []
+    if not root.exists():
+        return out
+    for path in sorted(root.glob("*.jsonl")):
+        month = path.stem
+        if since and month < since[:7] or until and month > until[:7]:
+            continue
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                r = json.loads(line)
+            except ValueError:
+                continue
+            at = str(r.get("at") or "")
+            if since and at < since or until and at >= until:
+                continue
+            out.append(r)
+    return out
+
+
+def _group_key(record: dict[str, Any], by: str | None) -> str:
+    if by is None:
+        return "total"
+    if by == "day":
+        return str(record.get("at") or "")[:10]
+    if by == "month":
+        return str(record.get("at") or "")[:7]
+    if by == "tier":
+        return str(record.get("tier") or "single")
+    return str(record.get(by) or "-")
+
+
+def aggregate(
+    records: list[dict[str, Any]], *, prices: dict[str, dict[str, float]], by: str | None = "model"
+) -> list[dict[str, Any]]:
+    """
+    Usage, latency and estimated cost per `by` group (see `GROUP_BY`; None = one total row).
+
+    `calls` counts HTTP attempts and cache hits alike; `cost_usd` sums the calls that
+    could be priced and `unpriced` counts the rest (unknown model or no usage returned).
+    """
+    if by is not None and by not in GROUP_BY:
+        raise ValueError(f"group by must be one of {', '.join(GROUP_BY)}, got {by!r}")
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for r in records:
+        groups.setdefault(_group_key(r, by), []).append(r)
+
+    rows = []
+    for key, recs in sorted(groups.items()):
+        costs = [call_cost(r, prices) for r in recs]
+        latencies = [float(r.get("latency_ms") or 0) for r in recs if not r.get("cache_hit")]
+        rows.append(
+            {
+                "key": key,
+                "calls": len(recs),
+                "cache_hits": sum(1 for r in recs if r.get("cache_hit")),
+                "retries": sum(1 for r in recs if r.get("attempt")),
+                "errors": sum(1 for r in recs if r.get("error") or int(r.get("status") or 0) >= 400),
+                "prompt_tokens": sum(int(r.get("prompt_tokens") or 0) for r in recs),
+                "completion_tokens": sum(int(r.get("completion_tokens") or 0) for r in recs),
+                "images": sum(int(r.get("images") or 0) for r in recs),
+                "bytes_sent": sum(int(r.get("bytes_sent") or 0) for r in recs),
+                "latency_ms_p50": percentile(latencies, 50),
+                "latency_ms_p95": percentile(latencies, 95),
+                "cost_usd": round(sum(c for c in costs if c is not None), 6),
+                "unpriced": sum(1 for c in costs if c is None),
+            }
+        )
+    return rows
+
+
+def record_run(
+    llm_block: dict[str, Any],
+    *,
+    run_dir: Path,
+    run_id: str,
+    history_dir: Path,
+    prices: dict[str, dict[str, float]],
+) -> dict[str, Any] | None:
+    """
+    Write the run's per-call records to `run_dir/llm-calls.jsonl`, append them to the
+    history under `history_dir`, and return a usage/cost summary (None without calls).
+    """
+    records = call_records(llm_block, run_id=run_id, at=_utc_now_iso())
+    if not records:
+        return None
+    write_call_log(run_dir / "llm-calls.jsonl", records)
+    append_history(history_dir, records)
+    total = aggregate(records, prices=prices, by=None)[0]
+    return {"log": "llm-calls.jsonl", **{k: v for k, v in total.items() if k != "key"}}
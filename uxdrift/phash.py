@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+from typing import Any
+
+from uxdrift.visual import page_screenshots
+
+
+_BANDS = 4
+_BAND_BITS = 64 // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def _require_image_deps() -> tuple[Any, Any]:
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError as e:  # pragma: no cover - depends on optional extras
+        raise RuntimeError(
+            "Perceptual hashing needs numpy + Pillow. Install with: pip install 'uxdrift[visual]'"
+        ) from e
+    return np, Image
+
+
+def _grayscale(path: Path, size: tuple[int, int]) -> Any:
+    np, Image = _require_image_deps()
+    with Image.open(path) as im:
+        small = im.convert("L").resize(size, Image.Resampling.LANCZOS)
+        return np.asarray(small, dtype=np.float64)
+
+
+def _bits_to_int(bits: Any) -> int:
+    out = 0
+    for b in bits.flatten():
+        out = (out << 1) | int(bool(b))
+    return out
+
+
+def dhash(path: Path) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 thumbnail."""
+    px = _grayscale(path, (9, 8))
+    return _bits_to_int(px[:, 1:] > px[:, :-1])
+
+
+def _dct_matrix(n: int) -> Any:
+    np, _ = _require_image_deps()
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0, :] = np.sqrt(1.0 / n)
+    return m
+
+
+def phash(path: Path) -> int:
+    """64-bit perceptual hash: low-frequency 2D DCT of a 32x32 thumbnail vs its median."""
+    np, _ = _require_image_deps()
+    px = _grayscale(path, (32, 32))
+    d = _dct_matrix(32)
+    low = (d @ px @ d.T)[:8, :8]
+    med = np.median(low.flatten()[1:])  # ignore the DC term
+    return _bits_to_int(low > med)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _bands(h: int) -> list[int]:
+    return [(h >> (i * _BAND_BITS)) & _BAND_MASK for i in range(_BANDS)]
+
+
+@dataclass
+class PhashIndex:
+    """
+    Append-only JSONL index of screenshot hashes across runs.
+
+    Entries are keyed by screenshot stem (e.g. `00-root`, `00-root-home`), which is
+    stable across runs that capture the same pages/steps. Lookups never decode old
+    images; they compare stored 64-bit hashes.
+    """
+
+    path: Path
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    _band_table: dict[tuple[int, int], list[int]] = field(default_factory=dict, repr=False)
+    _by_key: dict[str, list[int]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> PhashIndex:
+        idx = cls(path=path)
+        if path.exists():
+            for raw in path.read_text(encoding="utf-8").splitlines():
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    entry = json.loads(raw)
+                except Exception:
+                    continue
+                if isinstance(entry, dict) and entry.get("key") and entry.get("phash"):
+                    idx._add(entry)
+        return idx
+
+    def _add(self, entry: dict[str, Any]) -> None:
+        pos = len(self.entries)
+        self.entries.append(entry)
+        self._by_key.setdefault(str(entry["key"]), []).append(pos)
+        for band, value in enumerate(_bands(int(entry["phash"], 16))):
+            self._band_table.setdefault((band, value), []).append(pos)
+
+    def append(self, entry: dict[str, Any]) -> None:
+        self._add(entry)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    def history(self, key: str) -> list[dict[str, Any]]:
+        return [self.entries[i] for i in self._by_key.get(key, [])]
+
+    def find_similar(self, h: int, *, max_distance: int = 4) -> list[tuple[int, dict[str, Any]]]:
+        """
+        All entries within `max_distance` bits of `h`, nearest first.
+
+        With fewer differing bits than bands, a match must agree exactly on at least
+        one 16-bit band (pigeonhole), so only those buckets are scanned.
+        """
+        if max_distance < _BANDS:
+            candidates: set[int] = set()
+            for band, value in enumerate(_bands(h)):
+                candidates.update(self._band_table.get((band, value), []))
+            pool = (self.entries[i] for i in sorted(candidates))
+        else:
+            pool = iter(self.entries)
+
+        out: list[tuple[int, dict[str, Any]]] = []
+        for e in pool:
+            dist = hamming(h, int(e["phash"], 16))
+            if dist <= max_distance:
+                out.append((dist, e))
+        out.sort(key=lambda x: x[0])
+        return out
+
+    def last_different(self, key: str, h: int, *, max_distance: int = 4) -> dict[str, Any] | None:
+        """Most recent entry for `key` that looked different from hash `h`."""
+        for e in reversed(self.history(key)):
+            if hamming(h, int(e["phash"], 16)) > max_distance:
+                return e
+        return None
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def index_screenshots(
+    pages: list[Any],
+    *,
+    index_path: Path,
+    run_id: str,
+    max_distance: int = 4,
+) -> None:
+    """
+    Hash every page/step screenshot, compare with the previous entry for the same key,
+    and append to the persistent index.
+
+    Results land on each page as `artifacts["phash"]`: one entry per screenshot with
+    `same_as_previous` set when the last recorded state is within `max_distance` bits.
+    """
+    _require_image_deps()
+    idx = PhashIndex.load(index_path)
+    ts = _utc_now_iso()
+
+    for p in pages:
+        results: list[dict[str, Any]] = []
+        for shot in page_screenshots(p.artifacts):
+            path = Path(shot)
+            if not path.exists():
+                continue
+            key = path.stem
+            try:
+                ph = phash(path)
+                dh = dhash(path)
+            except Exception as e:
+                results.append({"screenshot": shot, "key": key, "error": str(e)})
+                continue
+
+            prev_entries = idx.history(key)
+            prev = prev_entries[-1] if prev_entries else None
+            res: dict[str, Any] = {
+                "screenshot": shot,
+                "key": key,
+                "phash": f"{ph:016x}",
+                "dhash": f"{dh:016x}",
+                "same_as_previous": False,
+            }
+            if prev:
+                dist = hamming(ph, int(prev["phash"], 16))
+                res["previous"] = {"run": prev.get("run"), "ts": prev.get("ts"), "distance": dist}
+                res["same_as_previous"] = dist <= max_distance
+            last_diff = idx.last_different(key, ph, max_distance=max_distance)
+            if last_diff:
+                res["last_different"] = {"run": last_diff.get("run"), "ts": last_diff.get("ts")}
+            results.append(res)
+
+            idx.append({"key": key, "run": run_id, "ts": ts, "path": shot, "phash": res["phash"], "dhash": res["dhash"]})
+
+        if results:
+            p.artifacts["phash"] = results
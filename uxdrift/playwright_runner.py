@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
+import threading
 import time
 from typing import Any, Literal
 
 from playwright.sync_api import ConsoleMessage, Page, Response, sync_playwright
 
+from uxdrift.a11y import compact_aria_snapshot
+from uxdrift.auth import AuthConfig, SessionExpiredError, protect_file, storage_state_fresh
+from uxdrift.steps import Flow, Step, StepPlan
+
 
 _NEXT_DEV_OVERLAY_CSS = """
 nextjs-portal { pointer-events: none !important; }
@@ -24,6 +30,7 @@ class PageEvidence:
     network: dict[str, Any]
     page_errors: list[str]
     extracted: dict[str, Any]
+    capture_error: dict[str, Any] | None = None
 
 
 def _safe_int(v: float) -> int:
@@ -83,50 +90,10 @@ def _attach_listeners(
     page.on("response", on_response)
 
 
-def _locator(page: Page, spec: dict[str, Any]):
-    nth = spec.get("nth")
-    first = bool(spec.get("first", False))
-    last = bool(spec.get("last", False))
-
-    if "selector" in spec:
-        loc = page.locator(str(spec["selector"]))
-        if nth is not None:
-            return loc.nth(int(nth))
-        if first:
-            return loc.first
-        if last:
-            return loc.last
-        return loc
-    if "role" in spec:
-        role = str(spec["role"])
-        name = spec.get("name")
-        if name is None:
-            loc = page.get_by_role(role)
-        else:
-            loc = page.get_by_role(role, name=str(name))
-        if nth is not None:
-            return loc.nth(int(nth))
-        if first:
-            return loc.first
-        if last:
-            return loc.last
-        return loc
-    if "text" in spec:
-        loc = page.get_by_text(str(spec["text"]), exact=bool(spec.get("exact", True)))
-        if nth is not None:
-            return loc.nth(int(nth))
-        if first:
-            return loc.first
-        if last:
-            return loc.last
-        return loc
-    raise ValueError(f"Step is missing a locator: {spec}")
-
-
 def _run_steps(
     *,
     page: Page,
-    steps: list[dict[str, Any]],
+    steps: list[Step],
     out_dir: Path,
     prefix: str,
     artifacts: dict[str, Any],
@@ -135,34 +102,26 @@ def _run_steps(
     screenshots: list[str] = []
 
     for idx, step in enumerate(steps):
-        action = str(step.get("action") or "").strip()
-        if not action:
-            continue
-
+        action = step.action
+        # Locators are validated at compile time, so `step.locator` is set for these actions.
         if action == "click":
-            _locator(page, step).click()
+            step.locator.resolve(page).click()
         elif action == "fill":
-            _locator(page, step).fill(str(step.get("value") or ""))
+            step.locator.resolve(page).fill(step.value)
         elif action == "press":
-            page.keyboard.press(str(step.get("key") or ""))
+            page.keyboard.press(step.key)
         elif action == "wait_for":
-            loc = _locator(page, step)
-            state = str(step.get("state") or "visible")
-            timeout_ms = int(step.get("timeout_ms") or 15_000)
-            loc.wait_for(state=state, timeout=timeout_ms)
+            step.locator.resolve(page).wait_for(state=step.state, timeout=step.timeout_ms)
         elif action == "sleep":
-            ms = int(step.get("ms") or 0)
-            if ms > 0:
-                page.wait_for_timeout(ms)
+            if step.ms > 0:
+                page.wait_for_timeout(step.ms)
         elif action == "screenshot":
-            name = str(step.get("name") or f"step-{idx + 1:02d}")
+            name = step.name or f"step-{idx + 1:02d}"
             shot_path = out_dir / f"{prefix}-{name}.png"
             page.screenshot(path=str(shot_path), full_page=True)
             screenshots.append(str(shot_path))
-        else:
-            raise ValueError(f"Unknown step action: {action}")
 
-        logs.append({"action": action, "step": step})
+        logs.append({"action": action, "step": step.raw})
 
     if logs:
         artifacts["step_log"] = logs
@@ -170,144 +129,419 @@ def _run_steps(
         artifacts["step_screenshots"] = screenshots
 
 
-def capture_pages(
+def _is_visible(page: Page, selector: str) -> bool:
+    try:
+        return bool(page.locator(selector).first.is_visible())
+    except Exception:
+        return False
+
+
+def _login(
+    b: Any,
     *,
+    auth: AuthConfig,
     base_url: str,
-    pages: list[str],
     out_dir: Path,
-    headful: bool,
-    browser: Literal["chromium", "firefox", "webkit"],
-    browser_channel: str | None,
     nav_timeout_ms: int,
     wait_until: Literal["load", "domcontentloaded", "networkidle"],
-    steps: list[dict[str, Any]] | None = None,
-) -> tuple[list[PageEvidence], dict[str, Any]]:
-    out_dir.mkdir(parents=True, exist_ok=True)
+) -> None:
+    """Run the login flow once in a fresh context and save its storage state."""
+    context = b.new_context()
+    try:
+        page = context.new_page()
+        page.set_default_timeout(nav_timeout_ms)
+        page.goto(base_url.rstrip("/") + auth.login_page, wait_until=wait_until, timeout=nav_timeout_ms)
+        _run_steps(page=page, steps=auth.login_steps, out_dir=out_dir, prefix="auth", artifacts={})
+        auth.storage_state.parent.mkdir(parents=True, exist_ok=True)
+        context.storage_state(path=str(auth.storage_state))
+        protect_file(auth.storage_state)
+    except Exception as e:
+        raise RuntimeError(f"Login flow failed: {e}") from e
+    finally:
+        context.close()
 
+
+def _capture_page(
+    context: Any,
+    *,
+    idx: int,
+    path: str,
+    base_url: str,
+    out_dir: Path,
+    nav_timeout_ms: int,
+    wait_until: Literal["load", "domcontentloaded", "networkidle"],
+    steps: list[Step] | None,
+    aria_snapshot: bool,
+    aria_max_depth: int,
+    logged_out_selector: str | None = None,
+    tag: str | None = None,
+) -> PageEvidence:
+    """
+    Capture one page. Never raises: failures come back as evidence with `capture_error`
+    set, carrying whatever console/network data was collected before the failure.
+    """
+    name = path if path != "/" else "root"
+    if tag:
+        name = f"{name}@{tag}"
+    url = base_url.rstrip("/") + path
+
+    console_messages: list[dict[str, Any]] = []
+    page_errors: list[str] = []
+    request_failures: list[dict[str, Any]] = []
+    http_errors: list[dict[str, Any]] = []
+    artifacts: dict[str, Any] = {}
+    timing_ms: dict[str, int] = {}
+    extracted: dict[str, Any] = {"title": "", "text": "", "aria": None, "performance_navigation": None}
+    capture_error: dict[str, Any] | None = None
+
+    page = None
     started = time.time()
+    try:
+        page = context.new_page()
+        page.set_default_timeout(nav_timeout_ms)
+
+        _attach_listeners(
+            page,
+            console_messages=console_messages,
+            page_errors=page_errors,
+            request_failures=request_failures,
+            http_errors=http_errors,
+        )
 
-    with sync_playwright() as p:
-        browser_type = getattr(p, browser)
-        launched_channel: str | None = None
-        preferred_channel = browser_channel
-        if preferred_channel is None and browser == "chromium":
-            # Local Chrome is commonly installed even when Playwright browsers are not.
-            preferred_channel = "chrome"
-
-        if preferred_channel and browser == "chromium":
+        nav_started = time.time()
+        page.goto(url, wait_until=wait_until, timeout=nav_timeout_ms)
+        nav_ended = time.time()
+        timing_ms["navigation"] = _safe_int((nav_ended - nav_started) * 1000)
+
+        # In Next.js dev mode, the dev overlay portal can intercept clicks and break flows.
+        try:
+            page.add_style_tag(content=_NEXT_DEV_OVERLAY_CSS)
+        except Exception:
+            pass
+
+        if logged_out_selector and _is_visible(page, logged_out_selector):
+            raise SessionExpiredError(f"Logged-out marker is visible: {logged_out_selector}")
+
+        if steps:
+            _run_steps(page=page, steps=steps, out_dir=out_dir, prefix=f"{idx:02d}-{name}", artifacts=artifacts)
+
+        screenshot_path = out_dir / f"{idx:02d}-{name}.png"
+        page.screenshot(path=str(screenshot_path), full_page=True)
+        artifacts["screenshot"] = str(screenshot_path)
+
+        extracted.update(_extract(page, aria_snapshot=aria_snapshot, aria_max_depth=aria_max_depth))
+        if extracted.get("aria"):
+            aria_path = out_dir / f"{idx:02d}-{name}.aria.txt"
+            aria_path.parent.mkdir(parents=True, exist_ok=True)
+            aria_path.write_text(str(extracted["aria"]) + "\n", encoding="utf-8")
+            artifacts["aria_snapshot"] = str(aria_path)
+    except Exception as e:
+        capture_error = {
+            "type": type(e).__name__,
+            "message": _truncate(str(e), 2_000),
+            "elapsed_ms": _safe_int((time.time() - started) * 1000),
+        }
+        if page is not None:
+            # Best-effort: show what the page looked like when it failed.
             try:
-                b = browser_type.launch(headless=not headful, channel=preferred_channel)
-                launched_channel = preferred_channel
+                error_shot = out_dir / f"{idx:02d}-{name}.error.png"
+                page.screenshot(path=str(error_shot), full_page=True)
+                artifacts["error_screenshot"] = str(error_shot)
             except Exception:
-                b = browser_type.launch(headless=not headful)
-        else:
-            b = browser_type.launch(headless=not headful)
-
-        context = b.new_context()
-        evidence: list[PageEvidence] = []
-
-        for idx, path in enumerate(pages):
-            page = context.new_page()
-            page.set_default_timeout(nav_timeout_ms)
-
-            name = path if path != "/" else "root"
-            url = base_url.rstrip("/") + path
-
-            console_messages: list[dict[str, Any]] = []
-            page_errors: list[str] = []
-            request_failures: list[dict[str, Any]] = []
-            http_errors: list[dict[str, Any]] = []
-
-            _attach_listeners(
-                page,
-                console_messages=console_messages,
-                page_errors=page_errors,
-                request_failures=request_failures,
-                http_errors=http_errors,
-            )
-
-            nav_started = time.time()
-            page.goto(url, wait_until=wait_until, timeout=nav_timeout_ms)
-            nav_ended = time.time()
-
-            # In Next.js dev mode, the dev overlay portal can intercept clicks and break flows.
+                pass
+    finally:
+        if page is not None:
             try:
-                page.add_style_tag(content=_NEXT_DEV_OVERLAY_CSS)
+                page.close()
             except Exception:
                 pass
 
-            artifacts: dict[str, Any] = {}
-            if steps:
-                _run_steps(page=page, steps=steps, out_dir=out_dir, prefix=f"{idx:02d}-{name}", artifacts=artifacts)
+    return PageEvidence(
+        name=name,
+        url=url,
+        artifacts=artifacts,
+        timing_ms=timing_ms,
+        console={
+            "messages": console_messages,
+            "counts": {
+                "error": sum(1 for m in console_messages if m.get("type") == "error"),
+                "warning": sum(1 for m in console_messages if m.get("type") == "warning"),
+            },
+        },
+        network={
+            "request_failures": request_failures,
+            "http_errors": http_errors,
+            "counts": {
+                "request_failures": len(request_failures),
+                "http_errors": len(http_errors),
+            },
+        },
+        page_errors=page_errors,
+        extracted=extracted,
+        capture_error=capture_error,
+    )
+
+
+def _extract(page: Page, *, aria_snapshot: bool, aria_max_depth: int) -> dict[str, Any]:
+    extracted_title = ""
+    extracted_text = ""
+    try:
+        extracted_title = page.title()
+    except Exception:
+        extracted_title = ""
+    try:
+        extracted_text = page.inner_text("body")
+    except Exception:
+        extracted_text = ""
+
+    extracted_aria = None
+    if aria_snapshot:
+        try:
+            raw_aria = page.locator("body").aria_snapshot()
+            extracted_aria = compact_aria_snapshot(raw_aria, max_depth=aria_max_depth)
+        except Exception:
+            extracted_aria = None
+
+    nav_entries = None
+    try:
+        nav_entries = page.evaluate(
+            "() => {\n"
+            "  const nav = performance.getEntriesByType('navigation');\n"
+            "  if (!nav || nav.length === 0) return null;\n"
+            "  const n = nav[0];\n"
+            "  return {\n"
+            "    type: n.type,\n"
+            "    startTime: n.startTime,\n"
+            "    duration: n.duration,\n"
+            "    domContentLoadedEventEnd: n.domContentLoadedEventEnd,\n"
+            "    loadEventEnd: n.loadEventEnd,\n"
+            "  };\n"
+            "}"
+        )
+    except Exception:
+        nav_entries = None
+
+    return {
+        "title": extracted_title,
+        "text": _truncate(extracted_text, 12_000),
+        "aria": extracted_aria,
+        "performance_navigation": nav_entries,
+    }
 
-            screenshot_path = out_dir / f"{idx:02d}-{name}.png"
-            page.screenshot(path=str(screenshot_path), full_page=True)
-            artifacts["screenshot"] = str(screenshot_path)
 
-            extracted_title = ""
-            extracted_text = ""
-            try:
-                extracted_title = page.title()
-            except Exception:
-                extracted_title = ""
-            try:
-                extracted_text = page.inner_text("body")
-            except Exception:
-                extracted_text = ""
+def _launch(p: Any, *, browser: str, browser_channel: str | None, headful: bool) -> tuple[Any, str | None]:
+    browser_type = getattr(p, browser)
+    preferred_channel = browser_channel
+    if preferred_channel is None and browser == "chromium":
+        # Local Chrome is commonly installed even when Playwright browsers are not.
+        preferred_channel = "chrome"
 
-            nav_entries = None
-            try:
-                nav_entries = page.evaluate(
-                    "() => {\n"
-                    "  const nav = performance.getEntriesByType('navigation');\n"
-                    "  if (!nav || nav.length === 0) return null;\n"
-                    "  const n = nav[0];\n"
-                    "  return {\n"
-                    "    type: n.type,\n"
-                    "    startTime: n.startTime,\n"
-                    "    duration: n.duration,\n"
-                    "    domContentLoadedEventEnd: n.domContentLoadedEventEnd,\n"
-                    "    loadEventEnd: n.loadEventEnd,\n"
-                    "  };\n"
-                    "}"
-                )
-            except Exception:
-                nav_entries = None
-
-            evidence.append(
-                PageEvidence(
-                    name=name,
-                    url=url,
-                    artifacts=artifacts,
-                    timing_ms={"navigation": _safe_int((nav_ended - nav_started) * 1000)},
-                    console={
-                        "messages": console_messages,
-                        "counts": {
-                            "error": sum(1 for m in console_messages if m.get("type") == "error"),
-                            "warning": sum(1 for m in console_messages if m.get("type") == "warning"),
-                        },
-                    },
-                    network={
-                        "request_failures": request_failures,
-                        "http_errors": http_errors,
-                        "counts": {
-                            "request_failures": len(request_failures),
-                            "http_errors": len(http_errors),
-                        },
-                    },
-                    page_errors=page_errors,
-                    extracted={
-                        "title": extracted_title,
-                        "text": _truncate(extracted_text, 12_000),
-                        "performance_navigation": nav_entries,
-                    },
+    if preferred_channel and browser == "chromium":
+        try:
+            return browser_type.launch(headless=not headful, channel=preferred_channel), preferred_channel
+        except Exception:
+            return browser_type.launch(headless=not headful), None
+    return browser_type.launch(headless=not headful), None
+
+
+def _ensure_login(
+    b: Any,
+    *,
+    auth: AuthConfig,
+    lock: threading.Lock,
+    stale_before: float | None,
+    base_url: str,
+    out_dir: Path,
+    nav_timeout_ms: int,
+    wait_until: Literal["load", "domcontentloaded", "networkidle"],
+) -> bool:
+    """
+    Log in unless the cached state is usable. Flows share one storage-state file, so the
+    lock serializes logins and `stale_before` lets a flow pick up a state another flow
+    refreshed after its own context was created instead of logging in again.
+    """
+    with lock:
+        if stale_before is None:
+            if storage_state_fresh(auth.storage_state, auth.ttl_s):
+                return False
+        elif auth.storage_state.exists() and auth.storage_state.stat().st_mtime > stale_before:
+            return False
+        _login(b, auth=auth, base_url=base_url, out_dir=out_dir, nav_timeout_ms=nav_timeout_ms, wait_until=wait_until)
+        return True
+
+
+def _capture_flow(
+    flow: Flow,
+    *,
+    base_url: str,
+    pages: list[str],
+    out_dir: Path,
+    headful: bool,
+    browser: Literal["chromium", "firefox", "webkit"],
+    browser_channel: str | None,
+    nav_timeout_ms: int,
+    wait_until: Literal["load", "domcontentloaded", "networkidle"],
+    aria_snapshot: bool,
+    aria_max_depth: int,
+    page_retries: int,
+    retry_backoff_ms: int,
+    auth: AuthConfig | None,
+    auth_lock: threading.Lock,
+) -> tuple[list[PageEvidence], str | None, int]:
+    """Capture every page for one flow in its own Playwright instance + browser context."""
+    logins = 0
+    evidence: list[PageEvidence] = []
+
+    # Sync Playwright objects are bound to the thread that created them, so each flow
+    # (possibly running on a worker thread) owns its Playwright instance.
+    with sync_playwright() as p:
+        b, launched_channel = _launch(p, browser=browser, browser_channel=browser_channel, headful=headful)
+        login_kw: dict[str, Any] = {
+            "base_url": base_url,
+            "out_dir": out_dir,
+            "nav_timeout_ms": nav_timeout_ms,
+            "wait_until": wait_until,
+        }
+
+        if auth is not None and auth.login_steps:
+            if _ensure_login(b, auth=auth, lock=auth_lock, stale_before=None, **login_kw):
+                logins += 1
+
+        def new_context() -> tuple[Any, float]:
+            created = time.time()
+            if auth is not None:
+                return b.new_context(storage_state=str(auth.storage_state)), created
+            return b.new_context(), created
+
+        context, context_created = new_context()
+        reauth_error: dict[str, Any] | None = None
+
+        for idx, path in enumerate(pages):
+            attempts: list[dict[str, Any]] = []
+            attempt = 0
+            reauthed = False
+            while True:
+                ev = _capture_page(
+                    context,
+                    idx=idx,
+                    path=path,
+                    base_url=base_url,
+                    out_dir=out_dir,
+                    nav_timeout_ms=nav_timeout_ms,
+                    wait_until=wait_until,
+                    steps=flow.plan.steps_for(path) if flow.plan else None,
+                    aria_snapshot=aria_snapshot,
+                    aria_max_depth=aria_max_depth,
+                    logged_out_selector=auth.logged_out_selector if auth is not None else None,
+                    tag=flow.label,
                 )
-            )
-            page.close()
+                if ev.capture_error is None:
+                    break
+                attempts.append(ev.capture_error)
+                expired = ev.capture_error.get("type") == SessionExpiredError.__name__
+                if expired and auth is not None and auth.login_steps and not reauthed and reauth_error is None:
+                    # Session went stale mid-run: log in again once, then retry without using up a retry.
+                    reauthed = True
+                    try:
+                        if _ensure_login(b, auth=auth, lock=auth_lock, stale_before=context_created, **login_kw):
+                            logins += 1
+                    except Exception as e:
+                        # The failed login is this page's error; later pages in the flow don't try again.
+                        reauth_error = {"type": type(e).__name__, "message": _truncate(str(e), 2_000)}
+                        attempts.append(reauth_error)
+                        ev = replace(ev, capture_error=reauth_error)
+                        break
+                    context.close()
+                    context, context_created = new_context()
+                    continue
+                if attempt >= max(0, page_retries):
+                    break
+                attempt += 1
+                # Exponential backoff between attempts: backoff, 2x backoff, 4x backoff, ...
+                time.sleep(retry_backoff_ms * (2 ** (attempt - 1)) / 1000)
+            if attempts:
+                ev.artifacts["capture_attempts"] = attempts
+            if flow.label is not None:
+                ev.artifacts["params"] = {"label": flow.label, "values": flow.params}
+            evidence.append(ev)
 
         context.close()
         b.close()
 
+    return evidence, launched_channel, logins
+
+
+def capture_pages(
+    *,
+    base_url: str,
+    pages: list[str],
+    out_dir: Path,
+    headful: bool,
+    browser: Literal["chromium", "firefox", "webkit"],
+    browser_channel: str | None,
+    nav_timeout_ms: int,
+    wait_until: Literal["load", "domcontentloaded", "networkidle"],
+    steps: StepPlan | None = None,
+    aria_snapshot: bool = False,
+    aria_max_depth: int = 8,
+    page_retries: int = 0,
+    retry_backoff_ms: int = 1_000,
+    auth: AuthConfig | None = None,
+    flows: list[Flow] | None = None,
+    flow_concurrency: int = 4,
+) -> tuple[list[PageEvidence], dict[str, Any]]:
+    """
+    Capture `pages` once per flow. Without `flows`, a single unlabelled flow runs `steps`.
+
+    Parametrized flows run concurrently (up to `flow_concurrency`), each in its own
+    browser context; their evidence is tagged with the parameter-set label.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.time()
+
+    if not flows:
+        flows = [Flow(label=None, params={}, plan=steps or StepPlan())]
+
+    auth_meta: dict[str, Any] | None = None
+    if auth is not None:
+        auth_meta = {"storage_state": str(auth.storage_state), "reused": False, "logins": 0}
+        if not auth.login_steps and not auth.storage_state.exists():
+            raise FileNotFoundError(f"Storage state not found (and no login steps to create it): {auth.storage_state}")
+
+    flow_kw: dict[str, Any] = {
+        "base_url": base_url,
+        "pages": pages,
+        "out_dir": out_dir,
+        "headful": headful,
+        "browser": browser,
+        "browser_channel": browser_channel,
+        "nav_timeout_ms": nav_timeout_ms,
+        "wait_until": wait_until,
+        "aria_snapshot": aria_snapshot,
+        "aria_max_depth": aria_max_depth,
+        "page_retries": page_retries,
+        "retry_backoff_ms": retry_backoff_ms,
+        "auth": auth,
+        "auth_lock": threading.Lock(),
+    }
+    if len(flows) == 1:
+        results = [_capture_flow(flows[0], **flow_kw)]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(flow_concurrency, len(flows)))) as pool:
+            results = list(pool.map(lambda f: _capture_flow(f, **flow_kw), flows))
+
+    evidence: list[PageEvidence] = []
+    launched_channel: str | None = None
+    logins = 0
+    for flow_evidence, channel, flow_logins in results:
+        evidence.extend(flow_evidence)
+        launched_channel = launched_channel or channel
+        logins += flow_logins
+    if auth_meta is not None:
+        auth_meta["logins"] = logins
+        auth_meta["reused"] = logins == 0
+
     ended = time.time()
     meta = {
         "base_url": base_url,
@@ -317,6 +551,13 @@ def capture_pages(
         "headful": headful,
         "nav_timeout_ms": nav_timeout_ms,
         "wait_until": wait_until,
+        "aria_snapshot": aria_snapshot,
+        "page_retries": page_retries,
+        "retry_backoff_ms": retry_backoff_ms,
+        "failed_pages": [e.name for e in evidence if e.capture_error is not None],
+        "auth": auth_meta,
+        "flows": [{"label": f.label, "params": f.params} for f in flows if f.label is not None],
+        "flow_concurrency": flow_concurrency,
         "timing_ms": {"total": _safe_int((ended - started) * 1000)},
     }
     return evidence, meta
@@ -21,6 +21,22 @@ def write_text(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
+def _error_severity(p: PageEvidence, severity: str, kinds: tuple[str, ...]) -> tuple[str, str, dict[str, Any]]:
+    """
+    With error fingerprints (see `index_errors`), only new ones keep `severity`; a page
+    whose errors were all seen in earlier runs drops to "low". Returns (severity,
+    summary note, details).
+    """
+    fps = [e for e in p.artifacts.get("error_fingerprints") or [] if e.get("kind") in kinds]
+    if not fps:
+        return severity, "", {}
+    new = [e for e in fps if e.get("status") == "new"]
+    details = {"new_fingerprints": [e["fp"] for e in new], "known_fingerprints": len(fps) - len(new)}
+    if new:
+        return severity, f" ({len(new)} new)", details
+    return "low", " (all seen in earlier runs)", details
+
+
 def summarize_deterministic_findings(pages: list[PageEvidence]) -> list[dict[str, Any]]:
     findings: list[dict[str, Any]] = []
     for p in pages:
@@ -30,29 +46,47 @@ def summarize_deterministic_findings(pages: list[PageEvidence]) -> list[dict[str
         http_err = int(p.network.get("counts", {}).get("http_errors", 0))
         page_errs = len(p.page_errors)
 
+        if p.capture_error:
+            attempts = p.artifacts.get("capture_attempts") or [p.capture_error]
+            findings.append(
+                {
+                    "severity": "blocker",
+                    "category": "glitch",
+                    "summary": f"{p.name}: page capture failed ({p.capture_error.get('type')})",
+                    "evidence": [p.artifacts.get("error_screenshot", "")],
+                    "details": {
+                        "error": p.capture_error.get("message"),
+                        "attempts": len(attempts),
+                    },
+                }
+            )
         if err_count or page_errs:
+            sev, note, known = _error_severity(p, "high", ("console", "page_error"))
             findings.append(
                 {
-                    "severity": "high",
+                    "severity": sev,
                     "category": "glitch",
-                    "summary": f"{p.name}: console/page errors detected",
+                    "summary": f"{p.name}: console/page errors detected{note}",
                     "evidence": [p.artifacts.get("screenshot", "")],
                     "details": {
                         "console_error_count": err_count,
                         "page_error_count": page_errs,
+                        **known,
                     },
                 }
             )
         if req_fail or http_err:
+            sev, note, known = _error_severity(p, "medium", ("http", "request_failure"))
             findings.append(
                 {
-                    "severity": "medium",
+                    "severity": sev,
                     "category": "glitch",
-                    "summary": f"{p.name}: request failures or HTTP errors detected",
+                    "summary": f"{p.name}: request failures or HTTP errors detected{note}",
                     "evidence": [p.artifacts.get("screenshot", "")],
                     "details": {
                         "request_failure_count": req_fail,
                         "http_error_count": http_err,
+                        **known,
                     },
                 }
             )
@@ -66,6 +100,23 @@ def summarize_deterministic_findings(pages: list[PageEvidence]) -> list[dict[str
                     "details": {"console_warning_count": warn_count},
                 }
             )
+        for d in (p.artifacts.get("visual_diff") or []):
+            if not isinstance(d, dict) or not d.get("changed"):
+                continue
+            ratio = float(d.get("diff_ratio") or 0.0)
+            findings.append(
+                {
+                    "severity": "medium",
+                    "category": "visual",
+                    "summary": f"{p.name}: screenshot differs from baseline ({ratio:.1%} of pixels changed)",
+                    "evidence": [str(d.get("overlay") or d.get("screenshot") or ""), str(d.get("baseline") or "")],
+                    "details": {
+                        "screenshot": d.get("screenshot"),
+                        "diff_ratio": ratio,
+                        "boxes": d.get("boxes") or [],
+                    },
+                }
+            )
 
     return findings
 
@@ -110,10 +161,107 @@ def render_markdown(report: dict[str, Any]) -> str:
             lines.append(f"- [{sev}] {cat}: {summary}")
     lines.append("")
 
+    errors = meta.get("error_index") or {}
+    if errors:
+        lines.append("### Error Fingerprints")
+        lines.append("")
+        lines.append(
+            f"- {errors.get('new', 0)} new, {errors.get('recurring', 0)} recurring, "
+            f"{len(errors.get('gone') or [])} gone since run `{errors.get('previous_run')}`"
+        )
+        for p in report.get("pages", []):
+            for e in (p.get("artifacts") or {}).get("error_fingerprints") or []:
+                if e.get("status") == "new":
+                    lines.append(f"- New on `{p.get('name')}`: {e.get('kind')} `{e.get('text')}`")
+        for e in (errors.get("gone") or [])[:20]:
+            lines.append(f"- Gone from `{e.get('page')}`: {e.get('kind')} `{e.get('text')}`")
+        lines.append("")
+
     llm = report.get("llm", {})
     if llm.get("enabled"):
         lines.append("## LLM Critique")
         lines.append("")
+        batch = llm.get("batch") or {}
+        if batch:
+            counts = batch.get("request_counts") or {}
+            lines.append(
+                f"- Batch: `{batch.get('id')}` {batch.get('status')}"
+                + (f" ({counts.get('completed', 0)}/{counts.get('total', 0)} requests done)" if counts else "")
+            )
+            if llm.get("pending"):
+                lines.append("- Results pending: run `uxdrift collect <run-dir>` once the batch completes.")
+            lines.append("")
+        cache = llm.get("cache") or {}
+        images = llm.get("images") or {}
+        if cache.get("hits"):
+            lines.append(f"- Cache: {cache['hits']} of {cache['hits'] + cache.get('misses', 0)} call(s) served from cache")
+        if images.get("images"):
+            lines.append(
+                f"- Images: {len(images['images'])} screenshot(s), {images.get('upload_bytes', 0) // 1024} KB uploaded "
+                f"(from {images.get('original_bytes', 0) // 1024} KB), ~{images.get('est_tokens', 0)} image tokens"
+            )
+        chrome = llm.get("shared_chrome") or {}
+        if chrome:
+            lines.append(
+                f"- Shared chrome: {chrome.get('chars_removed', 0)} chars of repeated nav/footer text removed from "
+                f"{chrome.get('pages', 0)} page(s), sent once as {chrome.get('chars_shared', 0)} chars"
+            )
+        shots = llm.get("screenshots") or {}
+        if shots.get("skipped"):
+            dupes = sum(1 for s in shots["skipped"] if s.get("reason") == "near_duplicate")
+            lines.append(
+                f"- Screenshots: {len(shots.get('selected') or [])} of {shots.get('candidates', 0)} sent "
+                f"({dupes} near-duplicate(s) skipped, {len(shots['skipped']) - dupes} over the per-call limit)"
+            )
+        budget = llm.get("budget") or {}
+        if budget:
+            dropped: dict[str, int] = {}
+            for bp in budget.get("pages") or []:
+                for kind, n in (bp.get("dropped") or {}).items():
+                    dropped[kind] = dropped.get(kind, 0) + int(n)
+            dropped_text = ", ".join(f"{n} {kind}" for kind, n in sorted(dropped.items())) or "nothing"
+            lines.append(
+                f"- Token budget: ~{budget.get('used_tokens', 0)} of {budget.get('budget', 0)} tokens; dropped {dropped_text}"
+            )
+        incremental = llm.get("incremental") or {}
+        if incremental.get("pages_reused"):
+            total = incremental["pages_reused"] + incremental.get("pages_fresh", 0)
+            lines.append(
+                f"- Incremental: {incremental['pages_reused']} of {total} page critique(s) reused (evidence unchanged)"
+            )
+        cascade = llm.get("cascade") or {}
+        if cascade:
+            lines.append(
+                f"- Cascade: {cascade.get('pages_triage_only', 0)} page(s) settled by {cascade.get('triage_model')}, "
+                f"{cascade.get('pages_escalated', 0)} escalated to {cascade.get('model')}"
+            )
+        usage = llm.get("telemetry") or {}
+        if usage:
+            cost = f"~${usage.get('cost_usd', 0):.4f}" + (" (some calls unpriced)" if usage.get("unpriced") else "")
+            lines.append(
+                f"- Usage: {usage.get('calls', 0)} call(s), {usage.get('prompt_tokens', 0)} prompt + "
+                f"{usage.get('completion_tokens', 0)} completion tokens, {cost}; per call in `{usage.get('log')}`"
+            )
+        rate = llm.get("rate_limit") or {}
+        if rate.get("throttled") or rate.get("retries") or rate.get("waited_ms"):
+            lines.append(
+                f"- Rate limit: {rate.get('requests', 0)} request(s), {rate.get('throttled', 0)} throttled, "
+                f"{rate.get('retries', 0)} retried, {rate.get('waited_ms', 0) / 1000:.1f}s waiting; "
+                f"concurrency dipped to {rate.get('lowest_concurrency_limit')}"
+            )
+        if (
+            cache.get("hits")
+            or images.get("images")
+            or chrome
+            or shots.get("skipped")
+            or budget
+            or incremental.get("pages_reused")
+            or cascade
+            or usage
+            or rate.get("throttled")
+            or rate.get("retries")
+        ):
+            lines.append("")
         critique = llm.get("parsed") or {}
         c_findings = critique.get("findings") or []
         if c_findings:
@@ -129,13 +277,42 @@ def render_markdown(report: dict[str, Any]) -> str:
                     clean = [str(t) for t in tags if str(t).strip()]
                     if clean:
                         tag_text = f" (principles: {', '.join(clean)})"
+                f_pages = f.get("pages") or []
+                if isinstance(f_pages, list) and f_pages:
+                    tag_text += f" (pages: {', '.join(str(x) for x in f_pages)})"
+                f_povs = f.get("povs") or []
+                if isinstance(f_povs, list) and f_povs:
+                    tag_text += f" (povs: {', '.join(str(x) for x in f_povs)})"
+                if f.get("provenance") == "cached":
+                    tag_text += " (cached)"
+                if cascade and f.get("tier"):
+                    tag_text += f" (tier: {f['tier']})"
+                seen = f.get("history") or {}
+                if seen.get("status") == "new":
+                    tag_text += " (new)"
+                elif seen.get("status") == "recurring":
+                    tag_text += f" (recurring: {seen.get('runs')} runs since {str(seen.get('first_seen') or '')[:10]})"
                 lines.append(f"- [{sev}] {cat}: {summary}{tag_text}")
             lines.append("")
-        scorecard = critique.get("pov_scorecard") or []
-        if isinstance(scorecard, list) and scorecard:
-            lines.append("### POV Scorecard")
+        resolved = (llm.get("history") or {}).get("resolved") or []
+        if resolved:
+            lines.append("### Resolved Since Last Run")
+            lines.append("")
+            for f in resolved[:30]:
+                lines.append(f"- [{f.get('severity')}] {f.get('category')}: {f.get('summary')}")
             lines.append("")
-            for item in scorecard[:40]:
+        scorecards = [(None, critique.get("pov_scorecard") or [], None)]
+        for block in llm.get("povs") or []:
+            name = str((block.get("pov") or {}).get("name") or "unknown")
+            scorecards.append((name, (block.get("parsed") or {}).get("pov_scorecard") or [], block.get("error")))
+        for pov_name, scorecard, error in scorecards:
+            if pov_name is None and not (isinstance(scorecard, list) and scorecard):
+                continue
+            lines.append("### POV Scorecard" if pov_name is None else f"### POV Scorecard: `{pov_name}`")
+            lines.append("")
+            if error:
+                lines.append(f"- Critique failed: {error}")
+            for item in scorecard[:40] if isinstance(scorecard, list) else []:
                 if not isinstance(item, dict):
                     continue
                 principle = str(item.get("principle") or "").strip()
@@ -169,6 +346,15 @@ def render_markdown(report: dict[str, Any]) -> str:
         if isinstance(step_shots, list) and step_shots:
             for s in step_shots[:20]:
                 lines.append(f"- Step screenshot: `{s}`")
+        for d in (artifacts.get("visual_diff") or [])[:20]:
+            if not isinstance(d, dict) or not d.get("baseline"):
+                continue
+            mark = " (changed)" if d.get("changed") else ""
+            lines.append(f"- Visual diff: `{d.get('screenshot')}` `diff_ratio={d.get('diff_ratio')}`{mark}")
+        for h in (artifacts.get("phash") or [])[:20]:
+            if isinstance(h, dict) and h.get("same_as_previous"):
+                prev = h.get("previous") or {}
+                lines.append(f"- Visually unchanged: `{h.get('key')}` (same as run `{prev.get('run')}`)")
         timing = p.get("timing_ms", {})
         if timing.get("navigation") is not None:
             lines.append(f"- Navigation: `{timing.get('navigation')}ms`")
@@ -184,6 +370,12 @@ def render_markdown(report: dict[str, Any]) -> str:
         )
         if p.get("page_errors"):
             lines.append(f"- Page errors: `{len(p.get('page_errors'))}`")
+        capture_error = p.get("capture_error")
+        if isinstance(capture_error, dict) and capture_error:
+            attempts = len(artifacts.get("capture_attempts") or [capture_error])
+            lines.append(
+                f"- Capture failed after `{attempts}` attempt(s): `{capture_error.get('type')}` {capture_error.get('message')}"
+            )
         lines.append("")
 
     return "\n".join(lines).rstrip() + "\n"
@@ -210,6 +402,7 @@ def build_report(
                 "network": p.network,
                 "page_errors": p.page_errors,
                 "extracted": p.extracted,
+                "capture_error": p.capture_error,
             }
         )
 
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import fnmatch
+import re
+from typing import Any
+
+
+_ACTIONS = {"click", "fill", "press", "wait_for", "sleep", "screenshot"}
+_LOCATOR_ACTIONS = {"click", "fill", "wait_for"}
+_WAIT_STATES = {"attached", "detached", "visible", "hidden"}
+_PARAM_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+_LABEL_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+class StepPlanError(ValueError):
+    """Raised when a steps file fails validation; lists every problem found."""
+
+    def __init__(self, problems: list[str]) -> None:
+        self.problems = problems
+        super().__init__("Invalid steps:\n" + "\n".join(f"- {p}" for p in problems))
+
+
+@dataclass(frozen=True)
+class LocatorSpec:
+    kind: str  # selector | role | text
+    value: str
+    name: str | None = None
+    exact: bool = True
+    nth: int | None = None
+    first: bool = False
+    last: bool = False
+
+    def resolve(self, page: Any) -> Any:
+        if self.kind == "selector":
+            loc = page.locator(self.value)
+        elif self.kind == "role":
+            loc = page.get_by_role(self.value) if self.name is None else page.get_by_role(self.value, name=self.name)
+        else:
+            loc = page.get_by_text(self.value, exact=self.exact)
+        if self.nth is not None:
+            return loc.nth(self.nth)
+        if self.first:
+            return loc.first
+        if self.last:
+            return loc.last
+        return loc
+
+
+@dataclass(frozen=True)
+class Step:
+    action: str
+    raw: dict[str, Any]
+    locator: LocatorSpec | None = None
+    value: str = ""
+    key: str = ""
+    state: str = "visible"
+    timeout_ms: int = 15_000
+    ms: int = 0
+    name: str = ""
+
+
+@dataclass(frozen=True)
+class StepPlan:
+    """
+    Compiled steps: `common` runs on every page, then each `scoped` entry whose route
+    pattern (fnmatch-style, e.g. `/checkout` or `/admin/*`) matches the page path.
+    """
+
+    common: list[Step] = field(default_factory=list)
+    scoped: list[tuple[str, list[Step]]] = field(default_factory=list)
+
+    def steps_for(self, path: str) -> list[Step]:
+        out = list(self.common)
+        for pattern, steps in self.scoped:
+            if fnmatch.fnmatchcase(path, pattern):
+                out.extend(steps)
+        return out
+
+    def check_pages(self, pages: list[str]) -> None:
+        unmatched = [pat for pat, _ in self.scoped if not any(fnmatch.fnmatchcase(p, pat) for p in pages)]
+        if unmatched:
+            raise StepPlanError([f"pages[{pat!r}] matches none of the captured pages {pages}" for pat in unmatched])
+
+    def __bool__(self) -> bool:
+        return bool(self.common or self.scoped)
+
+
+def _int(raw: dict[str, Any], key: str, default: int, where: str, problems: list[str]) -> int:
+    v = raw.get(key)
+    if v is None:
+        return default
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        problems.append(f"{where}: `{key}` must be an integer, got {v!r}")
+        return default
+
+
+def _compile_locator(raw: dict[str, Any], where: str, problems: list[str]) -> LocatorSpec | None:
+    nth = raw.get("nth")
+    if nth is not None:
+        try:
+            nth = int(nth)
+        except (TypeError, ValueError):
+            problems.append(f"{where}: `nth` must be an integer, got {nth!r}")
+            nth = None
+    common = {"nth": nth, "first": bool(raw.get("first", False)), "last": bool(raw.get("last", False))}
+    if "selector" in raw:
+        return LocatorSpec(kind="selector", value=str(raw["selector"]), **common)
+    if "role" in raw:
+        name = raw.get("name")
+        return LocatorSpec(kind="role", value=str(raw["role"]), name=None if name is None else str(name), **common)
+    if "text" in raw:
+        return LocatorSpec(kind="text", value=str(raw["text"]), exact=bool(raw.get("exact", True)), **common)
+    return None
+
+
+def compile_step(raw: Any, *, where: str, problems: list[str]) -> Step | None:
+    if not isinstance(raw, dict):
+        problems.append(f"{where}: step must be an object, got {type(raw).__name__}")
+        return None
+    action = str(raw.get("action") or "").strip()
+    if not action:
+        # Blank actions were always skipped; keep them as no-ops.
+        return None
+    if action not in _ACTIONS:
+        problems.append(f"{where}: unknown action {action!r} (expected one of {', '.join(sorted(_ACTIONS))})")
+        return None
+
+    locator = _compile_locator(raw, where, problems)
+    if action in _LOCATOR_ACTIONS and locator is None:
+        problems.append(f"{where}: `{action}` needs a locator (`selector`, `role`, or `text`)")
+        return None
+
+    state = str(raw.get("state") or "visible")
+    if action == "wait_for" and state not in _WAIT_STATES:
+        problems.append(f"{where}: `state` must be one of {', '.join(sorted(_WAIT_STATES))}, got {state!r}")
+    key = str(raw.get("key") or "")
+    if action == "press" and not key:
+        problems.append(f"{where}: `press` needs a `key`")
+
+    return Step(
+        action=action,
+        raw=raw,
+        locator=locator,
+        value=str(raw.get("value") or ""),
+        key=key,
+        state=state,
+        timeout_ms=_int(raw, "timeout_ms", 15_000, where, problems) or 15_000,
+        ms=_int(raw, "ms", 0, where, problems),
+        name=str(raw.get("name") or ""),
+    )
+
+
+def _compile_list(raw: Any, *, where: str, problems: list[str]) -> list[Step]:
+    if not isinstance(raw, list):
+        problems.append(f"{where}: must be a JSON array")
+        return []
+    out: list[Step] = []
+    for i, item in enumerate(raw):
+        step = compile_step(item, where=f"{where}[{i}]", problems=problems)
+        if step is not None:
+            out.append(step)
+    return out
+
+
+def compile_steps(raw: Any) -> StepPlan:
+    """
+    Validate and compile a steps document.
+
+    Accepts either a JSON array (runs on every page) or an object:
+
+        {"steps": [...], "pages": {"/checkout": [...], "/admin/*": [...]}}
+
+    Raises `StepPlanError` listing every problem, before any browser is launched.
+    """
+    problems: list[str] = []
+    if isinstance(raw, list):
+        plan = StepPlan(common=_compile_list(raw, where="steps", problems=problems))
+    elif isinstance(raw, dict):
+        unknown = sorted(set(raw) - {"steps", "pages", "params"})
+        if unknown:
+            problems.append(f"unknown top-level keys: {', '.join(unknown)}")
+        common = _compile_list(raw.get("steps") or [], where="steps", problems=problems)
+        scoped: list[tuple[str, list[Step]]] = []
+        pages = raw.get("pages") or {}
+        if not isinstance(pages, dict):
+            problems.append("pages: must be an object mapping route patterns to step arrays")
+            pages = {}
+        for pattern, items in pages.items():
+            scoped.append((str(pattern), _compile_list(items, where=f"pages[{pattern!r}]", problems=problems)))
+        plan = StepPlan(common=common, scoped=scoped)
+    else:
+        problems.append("steps file must be a JSON array or an object with `steps`/`pages`")
+        plan = StepPlan()
+
+    if problems:
+        raise StepPlanError(problems)
+    return plan
+
+
+@dataclass(frozen=True)
+class Flow:
+    """One parameter set bound into a compiled plan. `label` is None for unparametrized runs."""
+
+    label: str | None
+    params: dict[str, str]
+    plan: StepPlan
+
+
+def _substitute(value: Any, params: dict[str, str], missing: set[str]) -> Any:
+    if isinstance(value, str):
+
+        def repl(m: re.Match[str]) -> str:
+            key = m.group(1)
+            if key not in params:
+                missing.add(key)
+                return m.group(0)
+            return params[key]
+
+        return _PARAM_RE.sub(repl, value)
+    if isinstance(value, list):
+        return [_substitute(v, params, missing) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, params, missing) for k, v in value.items()}
+    return value
+
+
+def _param_sets(raw: Any, problems: list[str]) -> list[tuple[str, dict[str, str]]]:
+    if isinstance(raw, dict):
+        items = [(str(k), v) for k, v in raw.items()]
+    elif isinstance(raw, list):
+        items = [(f"p{i + 1}", v) for i, v in enumerate(raw)]
+    else:
+        problems.append("params: must be an array of objects or an object mapping labels to objects")
+        return []
+
+    out: list[tuple[str, dict[str, str]]] = []
+    seen: set[str] = set()
+    for label, values in items:
+        clean = _LABEL_RE.sub("-", label).strip("-") or "p"
+        if clean in seen:
+            problems.append(f"params[{label!r}]: duplicate label")
+            continue
+        seen.add(clean)
+        if not isinstance(values, dict):
+            problems.append(f"params[{label!r}]: must be an object of variable values")
+            continue
+        out.append((clean, {str(k): str(v) for k, v in values.items()}))
+    return out
+
+
+def compile_flows(raw: Any) -> list[Flow]:
+    """
+    Compile a steps document into one `Flow` per parameter set.
+
+    A `params` key (array of objects, or object of label -> object) binds `{{var}}`
+    placeholders anywhere in `steps`/`pages` (fill values, selectors, names, keys).
+    Every set is substituted and validated up front; an unbound placeholder is an error.
+    """
+    if not (isinstance(raw, dict) and "params" in raw):
+        plan = compile_steps(raw)
+        missing: set[str] = set()
+        _substitute(raw, {}, missing)
+        if missing:
+            raise StepPlanError([f"`{{{{{k}}}}}` is used but no `params` are defined" for k in sorted(missing)])
+        return [Flow(label=None, params={}, plan=plan)]
+
+    problems: list[str] = []
+    sets = _param_sets(raw.get("params"), problems)
+    if not sets and not problems:
+        problems.append("params: at least one parameter set is required")
+
+    body = {k: v for k, v in raw.items() if k != "params"}
+    flows: list[Flow] = []
+    for label, values in sets:
+        missing = set()
+        bound = _substitute(body, values, missing)
+        for key in sorted(missing):
+            problems.append(f"params[{label!r}]: no value for `{{{{{key}}}}}`")
+        try:
+            flows.append(Flow(label=label, params=values, plan=compile_steps(bound)))
+        except StepPlanError as e:
+            problems.extend(f"params[{label!r}]: {p}" for p in e.problems)
+
+    if problems:
+        raise StepPlanError(problems)
+    return flows
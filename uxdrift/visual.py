@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+
+def _require_image_deps() -> tuple[Any, Any]:
+    try:
+        import numpy as np
+        from PIL import Image
+    except ImportError as e:  # pragma: no cover - depends on optional extras
+        raise RuntimeError(
+            "Visual diffing needs numpy + Pillow. Install with: pip install 'uxdrift[visual]'"
+        ) from e
+    return np, Image
+
+
+def _load_rgb(path: Path) -> Any:
+    np, Image = _require_image_deps()
+    with Image.open(path) as im:
+        return np.asarray(im.convert("RGB"), dtype=np.int16)
+
+
+def _pad_to(arr: Any, height: int, width: int) -> Any:
+    np, _ = _require_image_deps()
+    h, w = arr.shape[:2]
+    if h == height and w == width:
+        return arr
+    out = np.zeros((height, width, 3), dtype=arr.dtype)
+    out[:h, :w] = arr
+    return out
+
+
+def _changed_boxes(mask: Any, *, block: int, max_boxes: int) -> list[list[int]]:
+    """
+    Group changed pixels into bounding boxes.
+
+    The mask is reduced to a coarse grid of `block`x`block` cells first, so the
+    connected-component pass stays cheap even on tall full-page screenshots.
+    """
+    np, _ = _require_image_deps()
+    h, w = mask.shape
+    gh = -(-h // block)
+    gw = -(-w // block)
+    padded = np.zeros((gh * block, gw * block), dtype=bool)
+    padded[:h, :w] = mask
+    grid = padded.reshape(gh, block, gw, block).any(axis=(1, 3))
+
+    seen = np.zeros_like(grid)
+    boxes: list[tuple[int, list[int]]] = []
+    for gy, gx in zip(*np.nonzero(grid)):
+        if seen[gy, gx]:
+            continue
+        seen[gy, gx] = True
+        queue = deque([(int(gy), int(gx))])
+        y0 = y1 = int(gy)
+        x0 = x1 = int(gx)
+        cells = 0
+        while queue:
+            cy, cx = queue.popleft()
+            cells += 1
+            y0, y1, x0, x1 = min(y0, cy), max(y1, cy), min(x0, cx), max(x1, cx)
+            for ny, nx in ((cy - 1, cx), (cy + 1, cx), (cy, cx - 1), (cy, cx + 1)):
+                if 0 <= ny < gh and 0 <= nx < gw and grid[ny, nx] and not seen[ny, nx]:
+                    seen[ny, nx] = True
+                    queue.append((ny, nx))
+        x = x0 * block
+        y = y0 * block
+        boxes.append((cells, [x, y, min((x1 + 1) * block, w) - x, min((y1 + 1) * block, h) - y]))
+
+    boxes.sort(key=lambda b: b[0], reverse=True)
+    return [b for _, b in boxes[:max_boxes]]
+
+
+def _write_overlay(current: Any, mask: Any, boxes: list[list[int]], path: Path) -> None:
+    np, Image = _require_image_deps()
+    from PIL import ImageDraw
+
+    base = (current * 0.4 + 153).astype(np.uint8)  # wash out unchanged content
+    base[mask] = (255, 0, 0)
+    im = Image.fromarray(base)
+    draw = ImageDraw.Draw(im)
+    for x, y, bw, bh in boxes:
+        draw.rectangle([x, y, x + bw - 1, y + bh - 1], outline=(255, 0, 255), width=3)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    im.save(path)
+
+
+def diff_screenshots(
+    current: Path,
+    baseline: Path,
+    *,
+    tolerance: int = 16,
+    block: int = 16,
+    max_boxes: int = 20,
+    overlay_path: Path | None = None,
+) -> dict[str, Any]:
+    """
+    Pixel-diff two screenshots.
+
+    A pixel counts as changed when any RGB channel differs by more than
+    `tolerance` (0-255). Size differences count the non-overlapping area as changed.
+    """
+    np, _ = _require_image_deps()
+    cur = _load_rgb(current)
+    base = _load_rgb(baseline)
+    height = max(cur.shape[0], base.shape[0])
+    width = max(cur.shape[1], base.shape[1])
+    cur_p = _pad_to(cur, height, width)
+    base_p = _pad_to(base, height, width)
+
+    mask = np.abs(cur_p - base_p).max(axis=2) > int(tolerance)
+    changed = int(mask.sum())
+    total = int(height * width) or 1
+    boxes = _changed_boxes(mask, block=block, max_boxes=max_boxes) if changed else []
+
+    out: dict[str, Any] = {
+        "screenshot": str(current),
+        "baseline": str(baseline),
+        "size": [int(cur.shape[1]), int(cur.shape[0])],
+        "baseline_size": [int(base.shape[1]), int(base.shape[0])],
+        "changed_pixels": changed,
+        "diff_ratio": round(changed / total, 6),
+        "boxes": boxes,
+    }
+    if overlay_path is not None and changed:
+        _write_overlay(cur_p, mask, boxes, overlay_path)
+        out["overlay"] = str(overlay_path)
+    return out
+
+
+def page_screenshots(artifacts: dict[str, Any]) -> list[str]:
+    shots: list[str] = []
+    step_shots = artifacts.get("step_screenshots")
+    if isinstance(step_shots, list):
+        shots.extend([s for s in step_shots if isinstance(s, str) and s])
+    shot = artifacts.get("screenshot")
+    if isinstance(shot, str) and shot:
+        shots.append(shot)
+    return shots
+
+
+def compare_to_baseline(
+    pages: list[Any],
+    *,
+    baseline_dir: Path,
+    tolerance: int = 16,
+    threshold: float = 0.01,
+) -> None:
+    """
+    Compare every page/step screenshot against the same-named file in a baseline run dir.
+
+    Results are attached to each page as `artifacts["visual_diff"]`; entries whose
+    `diff_ratio` exceeds `threshold` are marked `changed` and become `visual` findings.
+    """
+    if not baseline_dir.is_dir():
+        raise FileNotFoundError(f"Baseline run dir not found: {baseline_dir}")
+    _require_image_deps()
+
+    for p in pages:
+        results: list[dict[str, Any]] = []
+        for shot in page_screenshots(p.artifacts):
+            cur = Path(shot)
+            base = baseline_dir / cur.name
+            if not base.exists() or not cur.exists():
+                results.append({"screenshot": shot, "baseline": None, "changed": False})
+                continue
+            overlay = cur.with_name(cur.stem + ".diff.png")
+            try:
+                res = diff_screenshots(cur, base, tolerance=tolerance, overlay_path=overlay)
+            except Exception as e:
+                results.append({"screenshot": shot, "baseline": str(base), "changed": False, "error": str(e)})
+                continue
+            res["changed"] = res["diff_ratio"] > threshold
+            res["threshold"] = threshold
+            results.append(res)
+        if results:
+            p.artifacts["visual_diff"] = results